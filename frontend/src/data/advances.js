@@ -1,5 +1,6 @@
 import { createResource } from "frappe-ui"
 import { employeeResource } from "./employee"
+import { onHomeData } from "./home"
 
 const transformAdvanceData = (data) => {
 	return data.map((claim) => {
@@ -13,9 +14,12 @@ export const advanceBalance = createResource({
 	params: {
 		employee: employeeResource.data.name,
 	},
-	auto: true,
 	cache: "hrms:employee_advance_balance",
 	transform(data) {
 		return transformAdvanceData(data)
 	},
 })
+
+onHomeData((data) => {
+	advanceBalance.setData(transformAdvanceData(data.advance_balance))
+})
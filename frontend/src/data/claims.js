@@ -1,5 +1,6 @@
 import { createResource } from "frappe-ui"
 import { employeeResource } from "./employee"
+import { onHomeData } from "./home"
 import { reactive } from "vue"
 
 export const expenseClaimSummary = createResource({
@@ -7,7 +8,6 @@ export const expenseClaimSummary = createResource({
 	params: {
 		employee: employeeResource.data.name,
 	},
-	auto: true,
 	cache: "hrms:expense_claim_summary",
 })
 
@@ -24,7 +24,6 @@ export const myClaims = createResource({
 		employee: employeeResource.data.name,
 		limit: 5,
 	},
-	auto: true,
 	cache: "hrms:my_claims",
 	transform(data) {
 		return transformClaimData(data)
@@ -42,13 +41,18 @@ export const teamClaims = createResource({
 		for_approval: 1,
 		limit: 5,
 	},
-	auto: true,
 	cache: "hrms:team_claims",
 	transform(data) {
 		return transformClaimData(data)
 	},
 })
 
+onHomeData((data) => {
+	expenseClaimSummary.setData(data.expense_claim_summary)
+	myClaims.setData(transformClaimData(data.my_claims))
+	teamClaims.setData(transformClaimData(data.team_claims))
+})
+
 export let claimTypesByID = reactive({})
 
 export const claimTypesResource = createResource({
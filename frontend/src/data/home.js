@@ -0,0 +1,20 @@
+import { createResource } from "frappe-ui"
+import { watch } from "vue"
+
+// all the data shown on the home screen, fetched in a single request and
+// passed on to the resources of each section, which still reload individually
+export const homeData = createResource({
+	url: "hrms.api.get_home_data",
+	auto: true,
+	cache: "hrms:home_data",
+})
+
+export const onHomeData = (callback) => {
+	watch(
+		() => homeData.data,
+		(data) => {
+			if (data?.employee) callback(data)
+		},
+		{ immediate: true }
+	)
+}
@@ -1,5 +1,6 @@
 import { createResource } from "frappe-ui"
 import { employeeResource } from "./employee"
+import { onHomeData } from "./home"
 
 import dayjs from "@/utils/dayjs"
 
@@ -26,7 +27,6 @@ export const myLeaves = createResource({
 		employee: employeeResource.data.name,
 		limit: 5,
 	},
-	auto: true,
 	cache: "hrms:my_leaves",
 	transform(data) {
 		return transformLeaveData(data)
@@ -44,7 +44,6 @@ export const teamLeaves = createResource({
 		for_approval: 1,
 		limit: 5,
 	},
-	auto: true,
 	cache: "hrms:team_leaves",
 	transform(data) {
 		return transformLeaveData(data)
@@ -56,16 +55,25 @@ export const leaveBalance = createResource({
 	params: {
 		employee: employeeResource.data.name,
 	},
-	auto: true,
 	cache: "hrms:leave_balance",
 	transform: (data) => {
-		// Calculate balance percentage for each leave type
-		return Object.fromEntries(
-			Object.entries(data).map(([leave_type, allocation]) => {
-				allocation.balance_percentage =
-					(allocation.balance_leaves / allocation.allocated_leaves) * 100
-				return [leave_type, allocation]
-			})
-		)
+		return transformLeaveBalance(data)
 	},
 })
+
+const transformLeaveBalance = (data) => {
+	// Calculate balance percentage for each leave type
+	return Object.fromEntries(
+		Object.entries(data).map(([leave_type, allocation]) => {
+			allocation.balance_percentage =
+				(allocation.balance_leaves / allocation.allocated_leaves) * 100
+			return [leave_type, allocation]
+		})
+	)
+}
+
+onHomeData((data) => {
+	myLeaves.setData(transformLeaveData(data.my_leaves))
+	teamLeaves.setData(transformLeaveData(data.team_leaves))
+	leaveBalance.setData(transformLeaveBalance(data.leave_balance))
+})
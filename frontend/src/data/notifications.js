@@ -1,11 +1,15 @@
 import { createResource, createListResource } from "frappe-ui"
 import { userResource } from "./user"
+import { onHomeData } from "./home"
 
 export const unreadNotificationsCount = createResource({
 	url: "hrms.api.get_unread_notifications_count",
 	cache: "hrms:unread_notifications_count",
 	initialData: 0,
-	auto: true,
+})
+
+onHomeData((data) => {
+	unreadNotificationsCount.setData(data.unread_notifications_count)
 })
 
 export const notifications = createListResource({
@@ -23,6 +23,11 @@ SUPPORTED_FIELD_TYPES = [
 	"Currency",
 ]
 
+HOME_DATA_CACHE_KEY = "hrms:home_data"
+# upper bound for staleness of values updated without doc events, like claim and advance statuses
+HOME_DATA_CACHE_EXPIRY = 10 * 60
+HOME_DATA_LIST_LENGTH = 5
+
 
 @frappe.whitelist()
 def get_current_user_info() -> dict:
@@ -56,6 +61,108 @@ def get_current_employee_info() -> dict:
 	return employee
 
 
+@frappe.whitelist()
+def get_home_data() -> dict:
+	"""
+	Returns all the data shown on the home screen in a single request, cached per user:
+	{
+	        "employee": {"name": "HR-EMP-00001", "first_name": "Jane", ...},
+	        "leave_balance": {"Casual Leave": {"allocated_leaves": 10.0, "balance_leaves": 5.0}},
+	        "my_leaves": [...], "team_leaves": [...], "my_claims": [...], "team_claims": [...],
+	        ...
+	}
+	"""
+	user = frappe.session.user
+	cache_key = get_home_data_cache_key(user)
+	date = getdate()
+
+	cached = frappe.cache().get_value(cache_key)
+	# leave balances and holidays are as of today, so the data is rebuilt on a new day
+	if cached and cached.date == date:
+		return cached.data
+
+	data = get_home_data_for_user(user)
+	frappe.cache().set_value(
+		cache_key, frappe._dict(date=date, data=data), expires_in_sec=HOME_DATA_CACHE_EXPIRY
+	)
+
+	return data
+
+
+def get_home_data_for_user(user: str) -> dict:
+	employee = get_current_employee_info()
+	if not employee:
+		return {"employee": None}
+
+	return {
+		"employee": employee,
+		"leave_balance": get_leave_balance_map(employee.name),
+		"holidays": get_holidays_for_employee(employee.name),
+		"my_leaves": get_leave_applications(employee.name, limit=HOME_DATA_LIST_LENGTH),
+		"team_leaves": get_leave_applications(
+			employee.name, user, for_approval=True, limit=HOME_DATA_LIST_LENGTH
+		),
+		"expense_claim_summary": get_expense_claim_summary(employee.name, employee.company),
+		"my_claims": get_expense_claims(employee.name, limit=HOME_DATA_LIST_LENGTH),
+		"team_claims": get_expense_claims(
+			employee.name, user, for_approval=True, limit=HOME_DATA_LIST_LENGTH
+		),
+		"advance_balance": get_employee_advance_balance(employee.name),
+		"unread_notifications_count": get_unread_notifications_count(),
+	}
+
+
+def get_home_data_cache_key(user: str) -> str:
+	return f"{HOME_DATA_CACHE_KEY}:{user}"
+
+
+def clear_home_data_cache(doc, method=None):
+	"""Clears the cached home screen data of every user the document shows up for"""
+	if doc.doctype == "Holiday List":
+		frappe.cache().delete_keys(HOME_DATA_CACHE_KEY)
+		return
+
+	users = set()
+	for d in (doc, doc.get_doc_before_save()):
+		if not d:
+			continue
+
+		users.update(
+			[d.get("to_user"), d.get("user_id"), d.get("leave_approver"), d.get("expense_approver")]
+		)
+		if d.get("employee"):
+			users.add(frappe.db.get_value("Employee", d.employee, "user_id"))
+
+	if doc.doctype in ("Leave Application", "Expense Claim") and get_workflow_name(doc.doctype):
+		users.update(get_workflow_approvers(doc))
+
+	clear_home_data_cache_for_users(users)
+
+
+def clear_home_data_cache_for_users(users) -> None:
+	if keys := [get_home_data_cache_key(user) for user in set(users) if user]:
+		frappe.cache().delete_value(keys)
+
+
+def get_workflow_approvers(doc) -> set[str]:
+	"""Returns the users whose requests for approval can list the document in its current or previous
+	workflow state, i.e. users with a role allowed to make a transition from either state"""
+	workflow = get_workflow(doc.doctype)
+	states = {d.get(workflow.workflow_state_field) for d in (doc, doc.get_doc_before_save()) if d}
+	roles = {transition.allowed for transition in workflow.transitions if transition.state in states}
+	if not roles:
+		return set()
+
+	# Administrator has every role
+	return {"Administrator"} | set(
+		frappe.get_all(
+			"Has Role",
+			filters={"parenttype": "User", "role": ("in", list(roles))},
+			pluck="parent",
+		)
+	)
+
+
 @frappe.whitelist()
 def get_all_employees() -> list[dict]:
 	return frappe.get_all(
@@ -92,6 +199,7 @@ def mark_all_notifications_as_read() -> None:
 		1,
 		update_modified=False,
 	)
+	frappe.cache().delete_value(get_home_data_cache_key(frappe.session.user))
 
 
 # Leaves and Holidays
@@ -342,7 +450,7 @@ def get_expense_claim_filters(
 
 
 @frappe.whitelist()
-def get_expense_claim_summary(employee: str) -> dict:
+def get_expense_claim_summary(employee: str, company: str | None = None) -> dict:
 	from frappe.query_builder.functions import Sum
 
 	Claim = frappe.qb.DocType("Expense Claim")
@@ -379,8 +487,8 @@ def get_expense_claim_summary(employee: str) -> dict:
 		.where((Claim.docstatus != 2) & (Claim.employee == employee))
 	).run(as_dict=True)[0]
 
-	currency = frappe.db.get_value("Company", summary.company, "default_currency")
-	summary["currency"] = currency
+	company = summary.company or company
+	summary["currency"] = frappe.get_cached_value("Company", company, "default_currency")
 
 	return summary
 
@@ -7,7 +7,9 @@ from frappe.utils import add_days, add_months, comma_sep, getdate, today
 
 from erpnext.setup.doctype.employee.employee import get_all_employee_emails, get_employee_email
 
-from hrms.hr.utils import get_holidays_for_employee
+from hrms.utils.holiday_list import get_holiday_calendar, get_holiday_lists_for_employees
+
+REMINDER_TEXT_PLACEHOLDER = "__holiday_reminder_text__"
 
 
 # -----------------
@@ -45,40 +47,70 @@ def send_advance_holiday_reminders(frequency):
 	else:
 		return
 
-	employees = frappe.db.get_all("Employee", filters={"status": "Active"}, pluck="name")
+	employees = frappe.db.get_all(
+		"Employee",
+		filters={"status": "Active"},
+		fields=["name", "first_name", "user_id", "personal_email", "company_email"],
+	)
+	holiday_lists = get_holiday_lists_for_employees(
+		[employee.name for employee in employees], raise_exception=False
+	)
+
+	employees_by_holiday_list = {}
 	for employee in employees:
-		holidays = get_holidays_for_employee(
-			employee, start_date, end_date, only_non_weekly=True, raise_exception=False
-		)
+		if holiday_list := holiday_lists.get(employee.name):
+			employees_by_holiday_list.setdefault(holiday_list, []).append(employee)
 
-		send_holidays_reminder_in_advance(employee, holidays)
+	sender_email = get_sender_email()
+	for holiday_list, employees in employees_by_holiday_list.items():
+		holidays = get_holiday_calendar(holiday_list).get_holidays(
+			start_date, end_date, skip_weekly_offs=True
+		)
+		send_holiday_reminders(employees, holidays, frequency, sender_email)
 
 
 def send_holidays_reminder_in_advance(employee, holidays):
+	employee = frappe.db.get_value(
+		"Employee",
+		employee,
+		["first_name", "user_id", "personal_email", "company_email"],
+		as_dict=True,
+	)
+	frequency = frappe.db.get_single_value("HR Settings", "frequency")
+	send_holiday_reminders([employee], holidays, frequency, get_sender_email())
+
+
+def send_holiday_reminders(employees, holidays, frequency, sender_email):
+	"""Sends the reminder for the same holidays to all employees, rendering the email once"""
 	if not holidays:
 		return
 
-	employee_doc = frappe.get_doc("Employee", employee)
-	employee_email = get_employee_email(employee_doc)
-	frequency = frappe.db.get_single_value("HR Settings", "frequency")
-	sender_email = get_sender_email()
-	email_header = _("Holidays this Month.") if frequency == "Monthly" else _("Holidays this Week.")
-	frappe.sendmail(
-		sender=sender_email,
-		recipients=[employee_email],
-		subject=_("Upcoming Holidays Reminder"),
-		template="holiday_reminder",
-		args=dict(
-			reminder_text=_("Hey {}! This email is to remind you about the upcoming holidays.").format(
-				employee_doc.get("first_name")
-			),
+	message = frappe.get_template("templates/emails/holiday_reminder.html").render(
+		dict(
+			reminder_text=REMINDER_TEXT_PLACEHOLDER,
 			message=_("Below is the list of upcoming holidays for you:"),
 			advance_holiday_reminder=True,
 			holidays=holidays,
 			frequency=frequency[:-2],
-		),
-		header=email_header,
+		)
 	)
+	reminder_text = _("Hey {}! This email is to remind you about the upcoming holidays.")
+	email_header = _("Holidays this Month.") if frequency == "Monthly" else _("Holidays this Week.")
+
+	for employee in employees:
+		employee_email = get_employee_email(employee)
+		if not employee_email:
+			continue
+
+		frappe.sendmail(
+			sender=sender_email,
+			recipients=[employee_email],
+			subject=_("Upcoming Holidays Reminder"),
+			message=message.replace(
+				REMINDER_TEXT_PLACEHOLDER, reminder_text.format(employee.get("first_name"))
+			),
+			header=email_header,
+		)
 
 
 # ------------------
@@ -244,6 +244,33 @@ class TestEmployeeReminders(FrappeTestCase):
 			{"status": "Active", "holiday_list": self.holiday_list_2.name},
 		)
 
+	def test_advance_holiday_reminders_for_shared_holiday_list(self):
+		from hrms.controllers.employee_reminders import send_advance_holiday_reminders
+
+		setup_hr_settings("Monthly")
+		frappe.db.set_value(
+			"Employee", self.test_employee_2.name, "holiday_list", self.test_employee.holiday_list
+		)
+
+		send_advance_holiday_reminders("Monthly")
+
+		# one email per employee, greeting each of them by name
+		for employee in (self.test_employee, self.test_employee_2):
+			email_queue = frappe.db.get_all(
+				"Email Queue Recipient",
+				filters={"recipient": employee.user_id},
+				pluck="parent",
+			)
+			self.assertEqual(len(email_queue), 1)
+
+			message = frappe.db.get_value("Email Queue", email_queue[0], "message")
+			self.assertIn(f"Hey {employee.first_name}!", message)
+			self.assertIn("test holiday1", message)
+
+		frappe.db.set_value(
+			"Employee", self.test_employee_2.name, "holiday_list", self.holiday_list_2.name
+		)
+
 	def test_reminder_not_sent_if_no_holdays(self):
 		setup_hr_settings("Monthly")
 
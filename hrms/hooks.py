@@ -160,8 +160,14 @@ doc_events = {
 		],
 	},
 	"Holiday List": {
-		"on_update": "hrms.utils.holiday_list.invalidate_cache",
-		"on_trash": "hrms.utils.holiday_list.invalidate_cache",
+		"on_update": [
+			"hrms.utils.holiday_list.invalidate_cache",
+			"hrms.api.clear_home_data_cache",
+		],
+		"on_trash": [
+			"hrms.utils.holiday_list.invalidate_cache",
+			"hrms.api.clear_home_data_cache",
+		],
 	},
 	"Timesheet": {"validate": "hrms.hr.utils.validate_active_employee"},
 	"Payment Entry": {
@@ -188,10 +194,45 @@ doc_events = {
 		"on_update": [
 			"hrms.overrides.employee_master.update_approver_role",
 			"hrms.overrides.employee_master.publish_update",
+			"hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+			"hrms.hr.page.organizational_chart.organizational_chart.invalidate_org_chart_cache",
+			"hrms.api.clear_home_data_cache",
 		],
 		"after_insert": "hrms.overrides.employee_master.update_job_applicant_and_offer",
 		"on_trash": "hrms.overrides.employee_master.update_employee_transfer",
-		"after_delete": "hrms.overrides.employee_master.publish_update",
+		"after_delete": [
+			"hrms.overrides.employee_master.publish_update",
+			"hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+			"hrms.hr.page.organizational_chart.organizational_chart.invalidate_org_chart_cache",
+			"hrms.api.clear_home_data_cache",
+		],
+	},
+	"Shift Assignment": {
+		"on_update": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+		"on_update_after_submit": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+		"on_cancel": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+		"after_delete": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+	},
+	"Shift Type": {
+		"on_update": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+		"after_delete": "hrms.hr.doctype.shift_assignment.shift_timeline.invalidate_shift_timeline",
+	},
+	"Leave Application": {
+		"on_change": "hrms.api.clear_home_data_cache",
+		"after_delete": "hrms.api.clear_home_data_cache",
+	},
+	"Leave Ledger Entry": {"on_change": "hrms.api.clear_home_data_cache"},
+	"Expense Claim": {
+		"on_change": "hrms.api.clear_home_data_cache",
+		"after_delete": "hrms.api.clear_home_data_cache",
+	},
+	"Employee Advance": {
+		"on_change": "hrms.api.clear_home_data_cache",
+		"after_delete": "hrms.api.clear_home_data_cache",
+	},
+	"PWA Notification": {
+		"on_change": "hrms.api.clear_home_data_cache",
+		"after_delete": "hrms.api.clear_home_data_cache",
 	},
 	"Project": {
 		"validate": "hrms.controllers.employee_boarding_controller.update_employee_boarding_status"
@@ -223,6 +264,7 @@ scheduler_events = {
 		"hrms.hr.doctype.leave_ledger_entry.leave_ledger_entry.process_expired_allocation",
 		"hrms.hr.utils.generate_leave_encashment",
 		"hrms.hr.utils.allocate_earned_leaves",
+		"hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot.rebuild_missing_leave_balance_snapshots",
 	],
 	"weekly": ["hrms.controllers.employee_reminders.send_reminders_in_advance_weekly"],
 	"monthly": ["hrms.controllers.employee_reminders.send_reminders_in_advance_monthly"],
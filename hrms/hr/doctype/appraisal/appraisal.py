@@ -210,23 +210,11 @@ class Appraisal(Document):
 		return feedback
 
 	def set_goal_score(self, update=False):
-		for kra in self.appraisal_kra:
-			# update progress for all goals as KRA linked could be removed or changed
-			Goal = frappe.qb.DocType("Goal")
-			avg_goal_completion = (
-				frappe.qb.from_(Goal)
-				.select(Avg(Goal.progress).as_("avg_goal_completion"))
-				.where(
-					(Goal.kra == kra.kra)
-					& (Goal.employee == self.employee)
-					# archived goals should not contribute to progress
-					& (Goal.status != "Archived")
-					& ((Goal.parent_goal == "") | (Goal.parent_goal.isnull()))
-					& (Goal.appraisal_cycle == self.appraisal_cycle)
-				)
-			).run()[0][0]
+		# update progress for all goals as KRA linked could be removed or changed
+		avg_goal_completion = self.get_avg_goal_completion_by_kra()
 
-			kra.goal_completion = flt(avg_goal_completion, kra.precision("goal_completion"))
+		for kra in self.appraisal_kra:
+			kra.goal_completion = flt(avg_goal_completion.get(kra.kra), kra.precision("goal_completion"))
 			kra.goal_score = flt(kra.goal_completion * kra.per_weightage / 100, kra.precision("goal_score"))
 
 			if update:
@@ -240,6 +228,28 @@ class Appraisal(Document):
 
 		return self
 
+	def get_avg_goal_completion_by_kra(self) -> dict[str, float]:
+		kras = [kra.kra for kra in self.appraisal_kra]
+		if not kras:
+			return {}
+
+		Goal = frappe.qb.DocType("Goal")
+		return dict(
+			(
+				frappe.qb.from_(Goal)
+				.select(Goal.kra, Avg(Goal.progress).as_("avg_goal_completion"))
+				.where(
+					(Goal.kra.isin(kras))
+					& (Goal.employee == self.employee)
+					# archived goals should not contribute to progress
+					& (Goal.status != "Archived")
+					& ((Goal.parent_goal == "") | (Goal.parent_goal.isnull()))
+					& (Goal.appraisal_cycle == self.appraisal_cycle)
+				)
+				.groupby(Goal.kra)
+			).run()
+		)
+
 
 @frappe.whitelist()
 def get_feedback_history(employee, appraisal):
@@ -7,17 +7,18 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import cint, get_datetime
 
-from hrms.hr.doctype.shift_assignment.shift_assignment import (
-	get_actual_start_end_datetime_of_shift,
-)
+from hrms.hr.doctype.employee_checkin.employee_checkin_bulk_insert import bulk_insert_checkins
+from hrms.hr.doctype.shift_assignment.shift_timeline import get_shift_timeline
 from hrms.hr.utils import validate_active_employee
 
 
 class EmployeeCheckin(Document):
 	def validate(self):
 		validate_active_employee(self.employee)
-		self.validate_duplicate_log()
-		self.fetch_shift()
+		# checked once for a whole batch by bulk ingestion
+		if not self.flags.duplicate_log_checked:
+			self.validate_duplicate_log()
+		self.fetch_shift(self.flags.shift_timeline)
 
 	def validate_duplicate_log(self):
 		doc = frappe.db.exists(
@@ -35,10 +36,9 @@ class EmployeeCheckin(Document):
 				_("This employee already has a log with the same timestamp.{0}").format("<Br>" + doc_link)
 			)
 
-	def fetch_shift(self):
-		shift_actual_timings = get_actual_start_end_datetime_of_shift(
-			self.employee, get_datetime(self.time), True
-		)
+	def fetch_shift(self, timeline=None):
+		timeline = timeline or get_shift_timeline(self.employee)
+		shift_actual_timings = timeline.get_actual_start_end_datetime_of_shift(get_datetime(self.time))
 		if shift_actual_timings:
 			if (
 				shift_actual_timings.shift_type.determine_check_in_and_check_out
@@ -111,6 +111,21 @@ def add_log_based_on_employee_field(
 	return doc
 
 
+@frappe.whitelist()
+def add_logs_based_on_employee_field(logs=None, employee_fieldname="attendance_device_id"):
+	"""Creates Employee Checkins for a batch of logs, e.g. when a device syncs its backlog.
+	Returns the result of every log (Created / Duplicate / Failed) in the same order.
+
+	:param logs: List of logs as JSON or CSV (with a header row). Can also be posted as the request body.
+	Each log has `employee_field_value`, `timestamp` and optionally `device_id`, `log_type` and `skip_auto_attendance`.
+	:param employee_fieldname: (Default: attendance_device_id)Name of the field in Employee DocType based on which employee lookup will happen.
+	"""
+	if logs is None and frappe.request:
+		logs = frappe.request.get_data(as_text=True)
+
+	return bulk_insert_checkins(logs, employee_fieldname)
+
+
 def mark_attendance_and_link_log(
 	logs,
 	attendance_status,
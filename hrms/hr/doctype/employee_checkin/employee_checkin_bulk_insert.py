@@ -0,0 +1,191 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Bulk ingestion of Employee Checkins pushed by attendance devices.
+
+Employees are looked up once for all logs, duplicates are detected in memory and with one query
+per batch, shifts are resolved from cached shift timelines and the logs of a batch are written
+with one multi-row INSERT.
+"""
+
+import csv
+import io
+
+import frappe
+from frappe import _
+from frappe.utils import cint, create_batch, cstr, get_datetime
+
+from hrms.api import clear_home_data_cache_for_users
+from hrms.hr.doctype.shift_assignment.shift_timeline import get_shift_timeline
+from hrms.utils.bulk_insert import prepare_document, run_post_insert_methods, write_documents
+
+BULK_CHECKIN_BATCH_SIZE = 1000
+LOG_FIELDS = ("employee_field_value", "timestamp", "device_id", "log_type", "skip_auto_attendance")
+
+
+def bulk_insert_checkins(logs, employee_fieldname: str = "attendance_device_id") -> list[dict]:
+	"""Creates Employee Checkins for the logs and returns the result of every log, in the same order.
+
+	:param logs: List of dicts (or JSON / CSV with a header row) with the keys `employee_field_value`,
+	`timestamp` and optionally `device_id`, `log_type` and `skip_auto_attendance`.
+	:param employee_fieldname: Name of the field in Employee DocType based on which employee lookup will happen.
+	"""
+	logs = parse_logs(logs)
+	if not logs:
+		return []
+
+	# permissions are the same for every log, check once instead of per document
+	frappe.new_doc("Employee Checkin").check_permission("create")
+
+	employees = get_employees(employee_fieldname, {log.employee_field_value for log in logs})
+	users = {employee.name: employee.user_id for employee in employees.values()}
+	timelines = {}
+	results = []
+	seen = set()
+
+	for batch in create_batch(list(enumerate(logs)), BULK_CHECKIN_BATCH_SIZE):
+		checkins = []
+		for index, log in batch:
+			try:
+				checkin = prepare_checkin(log, employees, employee_fieldname)
+			except frappe.ValidationError as e:
+				frappe.clear_last_message()
+				results.append(get_result(index, "Failed", message=str(e)))
+				continue
+
+			key = get_duplicate_key(checkin)
+			if key in seen:
+				results.append(get_result(index, "Duplicate"))
+				continue
+
+			seen.add(key)
+			checkins.append((index, checkin))
+
+		existing = get_existing_checkins([checkin for _index, checkin in checkins])
+		new_checkins = []
+		for index, checkin in checkins:
+			if duplicate := existing.get(get_duplicate_key(checkin)):
+				results.append(get_result(index, "Duplicate", name=duplicate))
+				continue
+
+			if checkin.employee not in timelines:
+				timelines[checkin.employee] = get_shift_timeline(checkin.employee)
+
+			if error := prepare_for_insert(checkin, timelines[checkin.employee]):
+				results.append(get_result(index, "Failed", message=error))
+				continue
+
+			new_checkins.append(checkin)
+			results.append(get_result(index, "Created", name=checkin.name))
+
+		write_documents(new_checkins)
+		for checkin in new_checkins:
+			run_post_insert_methods(checkin)
+
+		clear_home_data_cache_for_users(users.get(checkin.employee) for checkin in new_checkins)
+
+	return sorted(results, key=lambda result: result["index"])
+
+
+def parse_logs(logs) -> list[dict]:
+	if isinstance(logs, str):
+		if logs.lstrip().startswith("["):
+			logs = frappe.parse_json(logs)
+		else:
+			logs = list(csv.DictReader(io.StringIO(logs)))
+
+	return [frappe._dict({field: log.get(field) for field in LOG_FIELDS}) for log in logs or []]
+
+
+def get_employees(employee_fieldname: str, values: set) -> dict:
+	"""Returns employees mapped by the value of the employee field, fetched with a single query"""
+	values = [value for value in values if value]
+	if not values:
+		return {}
+
+	employees = {}
+	for employee in frappe.get_all(
+		"Employee",
+		filters={employee_fieldname: ("in", values)},
+		fields=["name", "employee_name", "status", "user_id", employee_fieldname],
+	):
+		employees.setdefault(cstr(employee[employee_fieldname]).strip(), employee)
+
+	return employees
+
+
+def prepare_checkin(log: dict, employees: dict, employee_fieldname: str):
+	"""Runs the validations of `add_log_based_on_employee_field` and `EmployeeCheckin.validate`
+	that do not need the database"""
+	if not log.employee_field_value or not log.timestamp:
+		frappe.throw(_("'employee_field_value' and 'timestamp' are required."))
+
+	employee = employees.get(cstr(log.employee_field_value).strip())
+	if not employee:
+		frappe.throw(
+			_("No Employee found for the given employee field value. '{}': {}").format(
+				employee_fieldname, log.employee_field_value
+			)
+		)
+
+	if employee.status == "Inactive":
+		frappe.throw(_("Transactions cannot be created for an Inactive Employee {0}.").format(employee.name))
+
+	try:
+		timestamp = get_datetime(log.timestamp)
+	except Exception:
+		frappe.throw(_("Invalid timestamp: {0}").format(log.timestamp))
+
+	checkin = frappe.get_doc(
+		{
+			"doctype": "Employee Checkin",
+			"employee": employee.name,
+			"employee_name": employee.employee_name,
+			"time": timestamp,
+			"device_id": log.device_id,
+			"log_type": log.log_type or None,
+		}
+	)
+	if cint(log.skip_auto_attendance) == 1:
+		checkin.skip_auto_attendance = "1"
+
+	return checkin
+
+
+def get_duplicate_key(checkin) -> tuple:
+	return (checkin.employee, get_datetime(checkin.time), checkin.log_type or "")
+
+
+def get_existing_checkins(checkins: list) -> dict:
+	"""Returns names of existing checkins by duplicate key, with one query for the batch"""
+	if not checkins:
+		return {}
+
+	existing = frappe.get_all(
+		"Employee Checkin",
+		filters={
+			"employee": ("in", list({checkin.employee for checkin in checkins})),
+			"time": ("in", list({checkin.time for checkin in checkins})),
+		},
+		fields=["name", "employee", "time", "log_type"],
+	)
+
+	return {get_duplicate_key(checkin): checkin.name for checkin in existing}
+
+
+def prepare_for_insert(checkin, timeline) -> str | None:
+	"""Runs everything `Document.insert` does before writing and returns the error message instead
+	of raising it. The shift is resolved from the timeline, duplicates are checked for the batch"""
+	checkin.flags.ignore_permissions = True
+	checkin.flags.shift_timeline = timeline
+	checkin.flags.duplicate_log_checked = True
+
+	try:
+		prepare_document(checkin)
+	except frappe.ValidationError as e:
+		frappe.clear_last_message()
+		return str(e)
+
+
+def get_result(index: int, status: str, name: str | None = None, message: str | None = None) -> dict:
+	return {"index": index, "status": status, "name": name, "message": message}
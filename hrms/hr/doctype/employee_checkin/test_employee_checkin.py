@@ -20,10 +20,19 @@ from erpnext.setup.doctype.holiday_list.test_holiday_list import set_holiday_lis
 
 from hrms.hr.doctype.employee_checkin.employee_checkin import (
 	add_log_based_on_employee_field,
+	add_logs_based_on_employee_field,
 	calculate_working_hours,
 	mark_attendance_and_link_log,
 )
 from hrms.hr.doctype.leave_application.test_leave_application import get_first_sunday
+from hrms.hr.doctype.shift_assignment.shift_assignment import (
+	get_actual_start_end_datetime_of_shift,
+)
+from hrms.hr.doctype.shift_assignment.shift_timeline import (
+	clear_shift_timeline_cache,
+	get_shift_timeline,
+	get_shift_timeline_cache_key,
+)
 from hrms.hr.doctype.shift_type.test_shift_type import make_shift_assignment, setup_shift_type
 from hrms.payroll.doctype.salary_slip.test_salary_slip import make_holiday_list
 
@@ -33,6 +42,7 @@ class TestEmployeeCheckin(FrappeTestCase):
 		frappe.db.delete("Shift Type")
 		frappe.db.delete("Shift Assignment")
 		frappe.db.delete("Employee Checkin")
+		clear_shift_timeline_cache()
 
 		from_date = get_year_start(getdate())
 		to_date = get_year_ending(getdate())
@@ -51,6 +61,50 @@ class TestEmployeeCheckin(FrappeTestCase):
 		self.assertEqual(employee_checkin.device_id, "mumbai_first_floor")
 		self.assertEqual(employee_checkin.log_type, "IN")
 
+	def test_add_logs_based_on_employee_field(self):
+		employee = make_employee("test_add_log_based_on_employee_field@example.com")
+		employee = frappe.get_doc("Employee", employee)
+		employee.attendance_device_id = "3344"
+		employee.save()
+
+		shift_type = setup_shift_type(shift_type="Test Bulk Checkin Shift")
+		date = getdate()
+		make_shift_assignment(shift_type.name, employee.name, date)
+
+		existing = add_log_based_on_employee_field("3344", f"{date} 07:55:00", "mumbai_first_floor", "IN")
+		logs = [
+			{"employee_field_value": "3344", "timestamp": f"{date} 08:00:00", "log_type": "IN"},
+			{"employee_field_value": "3344", "timestamp": f"{date} 12:00:00", "log_type": "OUT"},
+			# duplicate within the batch
+			{"employee_field_value": "3344", "timestamp": f"{date} 12:00:00", "log_type": "OUT"},
+			# duplicate of an existing log
+			{"employee_field_value": "3344", "timestamp": f"{date} 07:55:00", "log_type": "IN"},
+			{"employee_field_value": "unknown-device-id", "timestamp": f"{date} 08:00:00"},
+			{"employee_field_value": "3344"},
+		]
+
+		results = add_logs_based_on_employee_field(frappe.as_json(logs))
+		self.assertEqual(
+			[result["status"] for result in results],
+			["Created", "Created", "Duplicate", "Duplicate", "Failed", "Failed"],
+		)
+		self.assertEqual(results[3]["name"], existing.name)
+
+		checkin = frappe.get_doc("Employee Checkin", results[0]["name"])
+		self.assertEqual(checkin.employee, employee.name)
+		self.assertEqual(checkin.employee_name, employee.employee_name)
+		self.assertEqual(checkin.log_type, "IN")
+		self.assertEqual(checkin.shift, shift_type.name)
+		self.assertEqual(checkin.shift_start, datetime.combine(date, get_time("08:00:00")))
+
+		# CSV with a header row
+		csv_logs = f"employee_field_value,timestamp,device_id\n3344,{date} 13:00:00,mumbai_first_floor\n"
+		results = add_logs_based_on_employee_field(csv_logs)
+		self.assertEqual(results[0]["status"], "Created")
+		self.assertEqual(
+			frappe.db.get_value("Employee Checkin", results[0]["name"], "device_id"), "mumbai_first_floor"
+		)
+
 	def test_mark_attendance_and_link_log(self):
 		employee = make_employee("test_mark_attendance_and_link_log@example.com")
 		logs = make_n_checkins(employee, 3)
@@ -227,6 +281,50 @@ class TestEmployeeCheckin(FrappeTestCase):
 		# should consider default shift
 		self.assertEqual(log.shift, default_shift.name)
 
+	def test_fetch_shift_from_shift_timeline(self):
+		employee = make_employee("test_employee_checkin@example.com", company="_Test Company")
+		shift_type = setup_shift_type(shift_type="Test Shift Timeline")
+		date = getdate()
+		shift_assignment = make_shift_assignment(shift_type.name, employee, date)
+
+		log_in = make_checkin(employee, datetime.combine(date, get_time("08:00:00")))
+		self.assertEqual(log_in.shift, shift_type.name)
+
+		# resolved shift is kept in the timeline and reused for the next log in the same shift
+		timeline = get_shift_timeline(employee)
+		self.assertEqual(len(timeline.intervals), 1)
+		self.assertEqual(timeline.intervals[0].actual_start, log_in.shift_actual_start)
+
+		timestamp = datetime.combine(date, get_time("12:00:00"))
+		log_out = make_checkin(employee, timestamp)
+		self.assertEqual(log_out.shift_actual_end, log_in.shift_actual_end)
+		self.assertEqual(
+			get_shift_timeline(employee).get_actual_start_end_datetime_of_shift(timestamp),
+			get_actual_start_end_datetime_of_shift(employee, timestamp, True),
+		)
+
+		# cancelling the assignment invalidates the cached timeline
+		shift_assignment.cancel()
+		log = make_checkin(employee, datetime.combine(date, get_time("10:00:00")))
+		self.assertIsNone(log.shift)
+
+	def test_outdated_shift_timeline_not_cached(self):
+		employee = make_employee("test_employee_checkin@example.com", company="_Test Company")
+		timeline = get_shift_timeline(employee)
+		self.assertIsNotNone(frappe.cache().get_value(get_shift_timeline_cache_key(employee)))
+
+		# a change committed after the timeline was read clears the cache
+		clear_shift_timeline_cache(employee)
+		timestamp = now_datetime()
+		timeline.add_interval(
+			frappe._dict(actual_start=timestamp, actual_end=timestamp + timedelta(hours=8))
+		)
+		self.assertIsNone(frappe.cache().get_value(get_shift_timeline_cache_key(employee)))
+
+		# the next read rebuilds the timeline
+		self.assertEqual(get_shift_timeline(employee).intervals, [])
+		self.assertIsNotNone(frappe.cache().get_value(get_shift_timeline_cache_key(employee)))
+
 	def test_fetch_night_shift_for_assignment_without_end_date(self):
 		"""Tests if shift is correctly fetched in logs when assignment has no end date"""
 		employee = make_employee("test_employee_checkin@example.com", company="_Test Company")
@@ -5,7 +5,6 @@ from pypika import CustomFunction
 
 import frappe
 from frappe import _
-from frappe.query_builder.functions import Avg
 from frappe.utils import cint, flt
 from frappe.utils.nestedset import NestedSet
 
@@ -35,14 +34,15 @@ class Goal(NestedSet):
 
 		doc_before_save = self.get_doc_before_save()
 
+		old_parent = None
 		if doc_before_save:
 			self.update_kra_in_child_goals(doc_before_save)
 
 			if doc_before_save.parent_goal != self.parent_goal:
-				# parent goal changed, update progress of old parent
-				self.update_parent_progress(doc_before_save.parent_goal)
+				# parent goal changed, update progress of old parent too
+				old_parent = doc_before_save.parent_goal
 
-		self.update_parent_progress()
+		self.update_parent_progress(old_parent)
 		self.update_goal_progress_in_appraisal()
 
 	def on_trash(self):
@@ -81,14 +81,7 @@ class Goal(NestedSet):
 			frappe.throw(_("Goal progress percentage cannot be more than 100."))
 
 	def set_status(self, status=None):
-		if self.status in ["Archived", "Closed"]:
-			return
-		if flt(self.progress) == 0:
-			self.status = "Pending"
-		elif flt(self.progress) == 100:
-			self.status = "Completed"
-		elif flt(self.progress) < 100:
-			self.status = "In Progress"
+		self.status = get_status_for_progress(self.status, self.progress)
 
 	def update_kra_in_child_goals(self, doc_before_save):
 		"""Aligns children's KRA to parent goal's KRA if parent goal's KRA is changed"""
@@ -99,28 +92,10 @@ class Goal(NestedSet):
 			frappe.msgprint(_("KRA updated for all child goals."), alert=True, indicator="green")
 
 	def update_parent_progress(self, old_parent=None):
-		parent_goal = old_parent or self.parent_goal
-
-		if not parent_goal:
-			return
-
-		Goal = frappe.qb.DocType("Goal")
-		avg_goal_completion = (
-			frappe.qb.from_(Goal)
-			.select(Avg(Goal.progress).as_("avg_goal_completion"))
-			.where(
-				(Goal.parent_goal == parent_goal)
-				& (Goal.employee == self.employee)
-				# archived goals should not contribute to progress
-				& (Goal.status != "Archived")
-			)
-		).run()[0][0]
+		"""Updates progress of the parent goal (and the old parent, if passed) up to the root goals"""
+		from hrms.hr.doctype.goal.goal_progress import GoalProgressAggregation
 
-		parent_goal_doc = frappe.get_doc("Goal", parent_goal)
-		parent_goal_doc.progress = flt(avg_goal_completion, parent_goal_doc.precision("progress"))
-		parent_goal_doc.ignore_permissions = True
-		parent_goal_doc.ignore_mandatory = True
-		parent_goal_doc.save()
+		GoalProgressAggregation([self.parent_goal, old_parent], self.employee).update()
 
 	def update_goal_progress_in_appraisal(self):
 		if not self.appraisal_cycle:
@@ -184,18 +159,33 @@ def get_children(doctype: str, parent: str, is_root: bool = False, **filters) ->
 
 
 def _update_goal_completion_status(goals: list[dict]) -> list[dict]:
-	for goal in goals:
-		if goal.expandable:  # group node
-			total_goals = frappe.db.count("Goal", dict(parent_goal=goal.value))
+	from hrms.hr.doctype.goal.goal_progress import get_completion_counts
+
+	# child counts of all group nodes are fetched at once
+	completion_counts = get_completion_counts([goal.value for goal in goals if goal.expandable])
 
-			if total_goals:
-				completed = frappe.db.count("Goal", {"parent_goal": goal.value, "status": "Completed"}) or 0
-				# set completion status of group node
-				goal["completion_count"] = _("{0} of {1} Completed").format(completed, total_goals)
+	for goal in goals:
+		if goal.value in completion_counts:
+			total_goals, completed = completion_counts[goal.value]
+			# set completion status of group node
+			goal["completion_count"] = _("{0} of {1} Completed").format(completed, total_goals)
 
 	return goals
 
 
+def get_status_for_progress(status: str, progress: float) -> str:
+	if status in ["Archived", "Closed"]:
+		return status
+	if flt(progress) == 0:
+		return "Pending"
+	elif flt(progress) == 100:
+		return "Completed"
+	elif flt(progress) < 100:
+		return "In Progress"
+
+	return status
+
+
 @frappe.whitelist()
 def update_progress(progress: float, goal: str) -> None:
 	goal = frappe.get_doc("Goal", goal)
@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Progress aggregation for goal trees.
+
+A group goal's progress is the average progress of its non-archived child goals. When a goal
+changes, all of its ancestors are fetched with one nested set query and their children with
+another, the new progress is computed bottom-up in memory and the changed ancestors are written
+with a single update instead of saving every ancestor doc in turn.
+"""
+
+import frappe
+from frappe.query_builder.functions import Count, Sum
+from frappe.utils import flt, now
+
+from hrms.hr.doctype.goal.goal import get_status_for_progress
+
+
+class GoalProgressAggregation:
+	def __init__(self, parent_goals: list[str], employee: str):
+		self.parent_goals = list({goal for goal in parent_goals if goal})
+		self.employee = employee
+		self.precision = frappe.new_doc("Goal").precision("progress")
+
+	def update(self) -> list[str]:
+		"""Recomputes the progress of the parent goals and all their ancestors.
+		Returns the names of the goals that were updated"""
+		if not self.parent_goals:
+			return []
+
+		ancestors = self.get_ancestors()
+		if not ancestors:
+			return []
+
+		children = self.get_children([goal.name for goal in ancestors])
+		progress = {child.name: flt(child.progress) for child in children}
+
+		children_by_parent = {}
+		for child in children:
+			children_by_parent.setdefault(child.parent_goal, []).append(child.name)
+
+		updates = {}
+		# a descendant always has a greater lft than its ancestors, so children are computed first
+		for goal in sorted(ancestors, key=lambda d: d.lft, reverse=True):
+			child_progress = [progress[child] for child in children_by_parent.get(goal.name, [])]
+			goal_progress = flt(
+				sum(child_progress) / len(child_progress) if child_progress else 0, self.precision
+			)
+			status = get_status_for_progress(goal.status, goal_progress)
+			progress[goal.name] = goal_progress
+
+			if goal_progress != flt(goal.progress, self.precision) or status != goal.status:
+				updates[goal.name] = (goal_progress, status)
+
+		self.set_progress(updates)
+		return list(updates)
+
+	def get_ancestors(self) -> list[dict]:
+		Goal = frappe.qb.DocType("Goal")
+		Ancestor = frappe.qb.DocType("Goal").as_("ancestor")
+
+		return (
+			frappe.qb.from_(Goal)
+			.join(Ancestor)
+			.on((Ancestor.lft <= Goal.lft) & (Ancestor.rgt >= Goal.rgt))
+			.select(Ancestor.name, Ancestor.lft, Ancestor.progress, Ancestor.status)
+			.distinct()
+			.where(Goal.name.isin(self.parent_goals))
+		).run(as_dict=True)
+
+	def get_children(self, parent_goals: list[str]) -> list[dict]:
+		Goal = frappe.qb.DocType("Goal")
+		return (
+			frappe.qb.from_(Goal)
+			.select(Goal.name, Goal.parent_goal, Goal.progress)
+			.where(
+				(Goal.parent_goal.isin(parent_goals))
+				& (Goal.employee == self.employee)
+				# archived goals should not contribute to progress
+				& (Goal.status != "Archived")
+			)
+		).run(as_dict=True)
+
+	def set_progress(self, updates: dict[str, tuple[float, str]]) -> None:
+		if not updates:
+			return
+
+		Goal = frappe.qb.DocType("Goal")
+		progress = frappe.qb.terms.Case()
+		status = frappe.qb.terms.Case()
+
+		for name, (goal_progress, goal_status) in updates.items():
+			progress = progress.when(Goal.name == name, goal_progress)
+			status = status.when(Goal.name == name, goal_status)
+
+		(
+			frappe.qb.update(Goal)
+			.set(Goal.progress, progress)
+			.set(Goal.status, status)
+			.set(Goal.modified, now())
+			.set(Goal.modified_by, frappe.session.user)
+			.where(Goal.name.isin(list(updates)))
+		).run()
+
+
+def get_completion_counts(parent_goals: list[str]) -> dict[str, tuple[int, int]]:
+	"""Returns the total and completed child goal counts of each parent goal"""
+	if not parent_goals:
+		return {}
+
+	Goal = frappe.qb.DocType("Goal")
+	counts = (
+		frappe.qb.from_(Goal)
+		.select(
+			Goal.parent_goal,
+			Count(Goal.name),
+			Sum(frappe.qb.terms.Case().when(Goal.status == "Completed", 1).else_(0)),
+		)
+		.where(Goal.parent_goal.isin(parent_goals))
+		.groupby(Goal.parent_goal)
+	).run()
+
+	return {parent_goal: (total, int(completed or 0)) for parent_goal, total, completed in counts}
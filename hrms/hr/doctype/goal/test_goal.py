@@ -158,6 +158,28 @@ class TestGoal(FrappeTestCase):
 		self.assertEqual(child1.progress, 16.667)
 		self.assertEqual(parent1.progress, 16.667)
 
+	def test_progress_and_completion_status_of_goal_tree(self):
+		"""
+		parent (100%)
+		|_ child1 (100%)
+		        |_ child1_1 (100%)
+		"""
+		parent_goal = create_goal(self.employee1, "Development", 1)
+		child_goal1 = create_goal(self.employee1, "Development", 1, parent_goal.name)
+		child_goal1_1 = create_goal(self.employee1, parent_goal=child_goal1.name)
+
+		child_goal1_1.progress = 100
+		child_goal1_1.save()
+
+		for goal in (child_goal1, parent_goal):
+			goal.reload()
+			self.assertEqual(goal.progress, 100)
+			self.assertEqual(goal.status, "Completed")
+
+		children = get_children("Goal", parent_goal.name, employee=self.employee1)
+		self.assertEqual(len(children), 1)
+		self.assertEqual(children[0].completion_count, "1 of 1 Completed")
+
 	def test_update_kra_in_child_goals(self):
 		parent_goal = create_goal(self.employee1, "Development", 1)
 		child_goal1 = create_goal(self.employee1, parent_goal=parent_goal.name)
@@ -219,49 +219,80 @@ def send_interview_reminder():
 	reminder_settings = frappe.db.get_value(
 		"HR Settings",
 		"HR Settings",
-		["send_interview_reminder", "interview_reminder_template", "hiring_sender_email"],
+		[
+			"send_interview_reminder",
+			"interview_reminder_template",
+			"hiring_sender_email",
+			"remind_before",
+		],
 		as_dict=True,
 	)
 
 	if not cint(reminder_settings.send_interview_reminder):
 		return
 
-	remind_before = cstr(frappe.db.get_single_value("HR Settings", "remind_before")) or "01:00:00"
+	remind_before = cstr(reminder_settings.remind_before) or "01:00:00"
 	remind_before = datetime.datetime.strptime(remind_before, "%H:%M:%S")
 	reminder_date_time = datetime.datetime.now() + datetime.timedelta(
 		hours=remind_before.hour, minutes=remind_before.minute, seconds=remind_before.second
 	)
 
-	interviews = frappe.get_all(
-		"Interview",
-		filters={
-			"scheduled_on": ["between", (datetime.datetime.now(), reminder_date_time)],
-			"status": "Pending",
-			"reminded": 0,
-			"docstatus": ["!=", 2],
-		},
-	)
+	Interview = frappe.qb.DocType("Interview")
+	JobApplicant = frappe.qb.DocType("Job Applicant")
+	interviews = (
+		frappe.qb.from_(Interview)
+		.left_join(JobApplicant)
+		.on(Interview.job_applicant == JobApplicant.name)
+		.select(Interview.star, JobApplicant.email_id.as_("applicant_email"))
+		.where(
+			(Interview.scheduled_on.between(datetime.datetime.now(), reminder_date_time))
+			& (Interview.status == "Pending")
+			& (Interview.reminded == 0)
+			& (Interview.docstatus != 2)
+		)
+	).run(as_dict=True)
 
-	interview_template = frappe.get_doc(
+	if not interviews:
+		return
+
+	interview_template = frappe.get_cached_doc(
 		"Email Template", reminder_settings.interview_reminder_template
 	)
+	interview_details = get_interview_details_by_interview([d.name for d in interviews])
 
-	for d in interviews:
-		doc = frappe.get_doc("Interview", d.name)
-		context = doc.as_dict()
-		message = frappe.render_template(interview_template.response, context)
-		recipients = get_recipients(doc.name)
+	reminded = []
+	for interview in interviews:
+		applicant_email = interview.pop("applicant_email")
+		context = get_interview_reminder_context(interview, interview_details)
+		recipients = [d.interviewer for d in context.interview_details]
+		recipients.append(applicant_email)
 
-		frappe.sendmail(
-			sender=reminder_settings.hiring_sender_email,
-			recipients=recipients,
-			subject=interview_template.subject,
-			message=message,
-			reference_doctype=doc.doctype,
-			reference_name=doc.name,
-		)
+		try:
+			frappe.sendmail(
+				sender=reminder_settings.hiring_sender_email,
+				recipients=recipients,
+				subject=interview_template.subject,
+				message=frappe.render_template(interview_template.response, context),
+				reference_doctype="Interview",
+				reference_name=interview.name,
+			)
+		except Exception:
+			# retried in the next run, the others are still marked as reminded
+			frappe.log_error(f"Failed to send reminder for Interview {interview.name}")
+			continue
+
+		reminded.append(interview.name)
 
-		doc.db_set("reminded", 1)
+	if not reminded:
+		return
+
+	(
+		frappe.qb.update(Interview)
+		.set(Interview.reminded, 1)
+		.set(Interview.modified, get_datetime())
+		.set(Interview.modified_by, frappe.session.user)
+		.where(Interview.name.isin(reminded))
+	).run()
 
 
 def send_daily_feedback_reminder():
@@ -279,38 +310,91 @@ def send_daily_feedback_reminder():
 	if not cint(reminder_settings.send_interview_feedback_reminder):
 		return
 
-	interview_feedback_template = frappe.get_doc(
-		"Email Template", reminder_settings.feedback_reminder_notification_template
-	)
+	Interview = frappe.qb.DocType("Interview")
+	interviews = (
+		frappe.qb.from_(Interview)
+		.select(Interview.star)
+		.where(
+			(Interview.status == "Under Review")
+			& (Interview.docstatus != 2)
+			& (Interview.scheduled_on <= getdate())
+			& (Interview.to_time <= nowtime())
+		)
+	).run(as_dict=True)
 
-	interviews = frappe.get_all(
-		"Interview",
-		filters={
-			"status": "Under Review",
-			"docstatus": ["!=", 2],
-			"scheduled_on": ["<=", getdate()],
-			"to_time": ["<=", nowtime()],
-		},
-		pluck="name",
-	)
+	if not interviews:
+		return
+
+	interview_names = [d.name for d in interviews]
+	interview_details = get_interview_details_by_interview(interview_names)
+	feedback_given = get_submitted_feedback(interview_names)
+	interview_feedback_template = None
 
 	for interview in interviews:
-		recipients = get_recipients(interview, for_feedback=1)
+		context = get_interview_reminder_context(interview, interview_details)
+		recipients = [
+			d.interviewer
+			for d in context.interview_details
+			if (interview.name, d.interviewer) not in feedback_given
+		]
+
+		if not recipients:
+			continue
+
+		if not interview_feedback_template:
+			interview_feedback_template = frappe.get_cached_doc(
+				"Email Template", reminder_settings.feedback_reminder_notification_template
+			)
 
-		doc = frappe.get_doc("Interview", interview)
-		context = doc.as_dict()
+		frappe.sendmail(
+			sender=reminder_settings.hiring_sender_email,
+			recipients=recipients,
+			subject=interview_feedback_template.subject,
+			message=frappe.render_template(interview_feedback_template.response, context),
+			reference_doctype="Interview",
+			reference_name=interview.name,
+		)
 
-		message = frappe.render_template(interview_feedback_template.response, context)
 
-		if len(recipients):
-			frappe.sendmail(
-				sender=reminder_settings.hiring_sender_email,
-				recipients=recipients,
-				subject=interview_feedback_template.subject,
-				message=message,
-				reference_doctype="Interview",
-				reference_name=interview,
-			)
+def get_interview_details_by_interview(interviews: list[str]) -> dict[str, list[dict]]:
+	InterviewDetail = frappe.qb.DocType("Interview Detail")
+	details = (
+		frappe.qb.from_(InterviewDetail)
+		.select(InterviewDetail.star)
+		.where(
+			(InterviewDetail.parent.isin(interviews))
+			& (InterviewDetail.parenttype == "Interview")
+			& (InterviewDetail.parentfield == "interview_details")
+		)
+		.orderby(InterviewDetail.idx)
+	).run(as_dict=True)
+
+	details_by_interview = {}
+	for detail in details:
+		details_by_interview.setdefault(detail.parent, []).append(detail)
+
+	return details_by_interview
+
+
+def get_submitted_feedback(interviews: list[str]) -> set[tuple[str, str]]:
+	"""Returns (interview, interviewer) pairs that have submitted feedback"""
+	InterviewFeedback = frappe.qb.DocType("Interview Feedback")
+	feedback = (
+		frappe.qb.from_(InterviewFeedback)
+		.select(InterviewFeedback.interview, InterviewFeedback.interviewer)
+		.where((InterviewFeedback.interview.isin(interviews)) & (InterviewFeedback.docstatus == 1))
+	).run()
+
+	return set(feedback)
+
+
+def get_interview_reminder_context(interview: dict, interview_details: dict) -> frappe._dict:
+	"""Builds the template context from the interview row instead of loading the full document"""
+	return frappe._dict(
+		interview,
+		doctype="Interview",
+		interview_details=interview_details.get(interview.name, []),
+	)
 
 
 @frappe.whitelist()
@@ -3,6 +3,7 @@
 
 import datetime
 import os
+from unittest.mock import patch
 
 import frappe
 from frappe import _
@@ -77,6 +78,69 @@ class TestInterview(FrappeTestCase):
 		send_interview_reminder()
 		self.assertTrue(get_email_by_subject("Subject: Interview Reminder"))
 
+	def test_reminders_for_multiple_interviews(self):
+		from hrms.hr.doctype.interview.interview import send_interview_reminder
+
+		setup_reminder_settings()
+		frappe.db.set_single_value("HR Settings", "send_interview_reminder", 1)
+
+		scheduled_on = datetime.datetime.now() + datetime.timedelta(minutes=10)
+		interview = create_interview_and_dependencies(
+			create_job_applicant().name, scheduled_on=scheduled_on
+		)
+		interview_2 = frappe.copy_doc(interview)
+		interview_2.job_applicant = create_job_applicant(
+			applicant_name="_Test Applicant 2", email_id="test_applicant_2@example.com"
+		).name
+		interview_2.insert()
+
+		frappe.db.delete("Email Queue")
+		send_interview_reminder()
+
+		for name in (interview.name, interview_2.name):
+			self.assertEqual(frappe.db.get_value("Interview", name, "reminded"), 1)
+			self.assertTrue(
+				frappe.db.exists("Email Queue", {"reference_doctype": "Interview", "reference_name": name})
+			)
+
+		# reminded interviews are not picked up again
+		frappe.db.delete("Email Queue")
+		send_interview_reminder()
+		self.assertFalse(get_email_by_subject("Subject: Interview Reminder"))
+
+	def test_interview_reminder_failure_does_not_affect_other_interviews(self):
+		from hrms.hr.doctype.interview.interview import send_interview_reminder
+
+		setup_reminder_settings()
+		frappe.db.set_single_value("HR Settings", "send_interview_reminder", 1)
+
+		scheduled_on = datetime.datetime.now() + datetime.timedelta(minutes=10)
+		interview = create_interview_and_dependencies(
+			create_job_applicant().name, scheduled_on=scheduled_on
+		)
+		interview_2 = frappe.copy_doc(interview)
+		interview_2.job_applicant = create_job_applicant(
+			applicant_name="_Test Applicant 2", email_id="test_applicant_2@example.com"
+		).name
+		interview_2.insert()
+
+		sendmail = frappe.sendmail
+
+		def fail_for_interview_2(**kwargs):
+			if kwargs.get("reference_name") == interview_2.name:
+				raise frappe.OutgoingEmailError
+			return sendmail(**kwargs)
+
+		with patch("frappe.sendmail", side_effect=fail_for_interview_2):
+			send_interview_reminder()
+
+		self.assertEqual(frappe.db.get_value("Interview", interview.name, "reminded"), 1)
+		self.assertEqual(frappe.db.get_value("Interview", interview_2.name, "reminded"), 0)
+
+		# the failed reminder is sent in the next run
+		send_interview_reminder()
+		self.assertEqual(frappe.db.get_value("Interview", interview_2.name, "reminded"), 1)
+
 	def test_notification_for_feedback_submission(self):
 		from hrms.hr.doctype.interview.interview import send_daily_feedback_reminder
 
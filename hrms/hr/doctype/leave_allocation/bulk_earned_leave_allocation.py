@@ -0,0 +1,269 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Scheduled allocation of earned leaves for all active allocations.
+
+Leave policies, annual allocations, joining dates and existing leave counts are prefetched for a
+batch of allocations, the increments are computed in memory and the allocation updates, ledger
+entries and comments of the batch are written with one query each.
+
+Leave Balance Snapshots of the updated allocations are deleted instead of being updated per ledger
+entry. Reads do not rebuild them, balances are computed from the ledger until the daily
+`rebuild_missing_leave_balance_snapshots` job creates them again.
+"""
+
+import frappe
+from frappe import _
+from frappe.query_builder.functions import Sum
+from frappe.utils import create_batch, flt, formatdate, getdate
+
+from hrms.api import clear_home_data_cache_for_users
+from hrms.hr.utils import check_effective_date, get_earned_leaves, get_monthly_earned_leave
+from hrms.utils.bulk_insert import write_documents
+
+EARNED_LEAVE_BATCH_SIZE = 500
+
+
+class BulkEarnedLeaveAllocation:
+	def __init__(self):
+		self.today = frappe.flags.current_date or getdate()
+		self.precision = frappe.new_doc("Leave Allocation").precision("total_leaves_allocated")
+
+	def process(self):
+		for leave_type in get_earned_leaves():
+			for allocations in create_batch(self.get_allocations(leave_type.name), EARNED_LEAVE_BATCH_SIZE):
+				self.allocate(leave_type, allocations)
+
+				if not frappe.flags.in_test:
+					# commit after every batch to avoid losing progress
+					frappe.db.commit()  # nosemgrep
+
+	def get_allocations(self, leave_type: str) -> list[dict]:
+		"""Same allocations as `get_leave_allocations`, skipping the ones without a leave policy"""
+		Allocation = frappe.qb.DocType("Leave Allocation")
+		return (
+			frappe.qb.from_(Allocation)
+			.select(
+				Allocation.name,
+				Allocation.employee,
+				Allocation.company,
+				Allocation.leave_type,
+				Allocation.from_date,
+				Allocation.to_date,
+				Allocation.total_leaves_allocated,
+				Allocation.leave_policy_assignment,
+				Allocation.leave_policy,
+			)
+			.where(
+				(Allocation.docstatus == 1)
+				& (Allocation.leave_type == leave_type)
+				& (Allocation.from_date <= self.today)
+				& (Allocation.to_date >= self.today)
+				& (Allocation.leave_policy_assignment.isnotnull() | Allocation.leave_policy.isnotnull())
+			)
+		).run(as_dict=True)
+
+	def allocate(self, leave_type: dict, allocations: list[dict]):
+		"""Same as `update_previous_leave_allocation` for each allocation due on the day"""
+		employees = self.get_employees(allocations)
+		annual_allocations = self.get_annual_allocations(leave_type.name, allocations)
+		existing_leave_counts = self.get_existing_leave_counts(allocations)
+
+		updated_allocations = {}
+		documents = []
+
+		for allocation in allocations:
+			employee = employees.get(allocation.employee)
+			if not employee:
+				continue
+
+			from_date = allocation.from_date
+			if leave_type.allocate_on_day == "Date of Joining":
+				from_date = employee.date_of_joining
+
+			if not check_effective_date(
+				from_date, self.today, leave_type.earned_leave_frequency, leave_type.allocate_on_day
+			):
+				continue
+
+			annual_allocation = flt(annual_allocations.get(allocation.name), self.precision)
+			earned_leaves = get_monthly_earned_leave(
+				employee.date_of_joining,
+				annual_allocation,
+				leave_type.earned_leave_frequency,
+				leave_type.rounding,
+			)
+
+			new_allocation = flt(allocation.total_leaves_allocated) + flt(earned_leaves)
+			new_allocation_without_cf = flt(
+				flt(existing_leave_counts.get(allocation.name)) + flt(earned_leaves),
+				self.precision,
+			)
+
+			if new_allocation > leave_type.max_leaves_allowed and leave_type.max_leaves_allowed > 0:
+				new_allocation = leave_type.max_leaves_allowed
+
+			if (
+				new_allocation == allocation.total_leaves_allocated
+				# annual allocation as per policy should not be exceeded
+				or new_allocation_without_cf > annual_allocation
+			):
+				continue
+
+			updated_allocations[allocation.name] = new_allocation
+			documents.append(self.get_ledger_entry(allocation, employee, earned_leaves))
+			if leave_type.allocate_on_day:
+				documents.append(self.get_comment(allocation, earned_leaves, leave_type.allocate_on_day))
+
+		if not updated_allocations:
+			return
+
+		self.update_total_leaves_allocated(updated_allocations)
+		write_documents(documents)
+
+		# balances are read from the ledger until the daily job rebuilds these snapshots
+		frappe.db.delete("Leave Balance Snapshot", {"leave_allocation": ("in", list(updated_allocations))})
+		updated_employees = {a.employee for a in allocations if a.name in updated_allocations}
+		clear_home_data_cache_for_users(employees[employee].user_id for employee in updated_employees)
+
+	def get_employees(self, allocations: list[dict]) -> dict:
+		return {
+			employee.name: employee
+			for employee in frappe.get_all(
+				"Employee",
+				filters={"name": ("in", list({allocation.employee for allocation in allocations}))},
+				fields=["name", "employee_name", "company", "date_of_joining", "user_id"],
+			)
+		}
+
+	def get_annual_allocations(self, leave_type: str, allocations: list[dict]) -> dict:
+		"""Returns the annual allocation of the leave type in the leave policy of each allocation"""
+		assignments = [d.leave_policy_assignment for d in allocations if d.leave_policy_assignment]
+		assignment_policies = (
+			dict(
+				frappe.get_all(
+					"Leave Policy Assignment",
+					filters={"name": ("in", assignments)},
+					fields=["name", "leave_policy"],
+					as_list=True,
+				)
+			)
+			if assignments
+			else {}
+		)
+
+		allocation_policies = {
+			allocation.name: allocation.leave_policy
+			or assignment_policies.get(allocation.leave_policy_assignment)
+			for allocation in allocations
+		}
+
+		policy_allocations = {}
+		leave_policies = list(set(filter(None, allocation_policies.values())))
+		if leave_policies:
+			for leave_policy, annual_allocation in frappe.get_all(
+				"Leave Policy Detail",
+				filters={"parent": ("in", leave_policies), "leave_type": leave_type},
+				fields=["parent", "annual_allocation"],
+				as_list=True,
+			):
+				policy_allocations.setdefault(leave_policy, annual_allocation)
+
+		return {
+			allocation: policy_allocations.get(leave_policy)
+			for allocation, leave_policy in allocation_policies.items()
+		}
+
+	def get_existing_leave_counts(self, allocations: list[dict]) -> dict:
+		"""Same as `LeaveAllocation.get_existing_leave_count` for all allocations with one query"""
+		Ledger = frappe.qb.DocType("Leave Ledger Entry")
+		entries = (
+			frappe.qb.from_(Ledger)
+			.select(
+				Ledger.transaction_name,
+				Ledger.employee,
+				Ledger.company,
+				Ledger.leave_type,
+				Sum(Ledger.leaves).as_("total_leaves"),
+			)
+			.where(
+				(Ledger.transaction_type == "Leave Allocation")
+				& (Ledger.transaction_name.isin([allocation.name for allocation in allocations]))
+				& (Ledger.is_carry_forward == 0)
+				& (Ledger.docstatus == 1)
+			)
+			.groupby(Ledger.transaction_name, Ledger.employee, Ledger.company, Ledger.leave_type)
+		).run(as_dict=True)
+
+		allocations = {allocation.name: allocation for allocation in allocations}
+		counts = {}
+		for entry in entries:
+			allocation = allocations[entry.transaction_name]
+			if (entry.employee, entry.company, entry.leave_type) == (
+				allocation.employee,
+				allocation.company,
+				allocation.leave_type,
+			):
+				counts[entry.transaction_name] = entry.total_leaves
+
+		return counts
+
+	def get_ledger_entry(self, allocation: dict, employee: dict, earned_leaves: float):
+		"""Same ledger entry as `create_additional_leave_ledger_entry`, ready for bulk insert"""
+		ledger_entry = frappe.get_doc(
+			{
+				"doctype": "Leave Ledger Entry",
+				"employee": allocation.employee,
+				"employee_name": employee.employee_name,
+				"company": employee.company,
+				"leave_type": allocation.leave_type,
+				"transaction_type": "Leave Allocation",
+				"transaction_name": allocation.name,
+				"leaves": earned_leaves,
+				"from_date": self.today,
+				"to_date": allocation.to_date,
+				"is_carry_forward": 0,
+				"is_expired": 0,
+				"is_lwp": 0,
+				"docstatus": 1,
+			}
+		)
+		ledger_entry.flags.ignore_permissions = True
+		ledger_entry._set_defaults()
+		ledger_entry.set_user_and_timestamp()
+		ledger_entry.set_new_name()
+
+		return ledger_entry
+
+	def get_comment(self, allocation: dict, earned_leaves: float, allocate_on_day: str):
+		comment = frappe.get_doc(
+			{
+				"doctype": "Comment",
+				"comment_type": "Info",
+				"comment_email": frappe.session.user,
+				"reference_doctype": "Leave Allocation",
+				"reference_name": allocation.name,
+				"content": _(
+					"Allocated {0} leave(s) via scheduler on {1} based on the 'Allocate on Day' option set to {2}"
+				).format(frappe.bold(earned_leaves), frappe.bold(formatdate(self.today)), allocate_on_day),
+			}
+		)
+		comment.flags.ignore_permissions = True
+		comment._set_defaults()
+		comment.set_user_and_timestamp()
+		comment.set_new_name()
+
+		return comment
+
+	def update_total_leaves_allocated(self, updated_allocations: dict):
+		Allocation = frappe.qb.DocType("Leave Allocation")
+		total_leaves_allocated = frappe.qb.terms.Case()
+		for name, value in updated_allocations.items():
+			total_leaves_allocated = total_leaves_allocated.when(Allocation.name == name, value)
+
+		(
+			frappe.qb.update(Allocation)
+			.set(Allocation.total_leaves_allocated, total_leaves_allocated)
+			.where(Allocation.name.isin(list(updated_allocations)))
+		).run()
+
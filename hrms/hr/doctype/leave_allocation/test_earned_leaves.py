@@ -314,6 +314,51 @@ class TestLeaveAllocation(FrappeTestCase):
 		leaves_allocated = get_allocated_leaves(leave_policy_assignments[0])
 		self.assertEqual(leaves_allocated, 2)
 
+	def test_scheduler_allocation_creates_ledger_entry_and_comment(self):
+		"""Tests the scheduler updates the allocation and creates its ledger entry and comment"""
+		frappe.flags.current_date = get_year_start(getdate())
+		leave_policy_assignments = make_policy_assignment(
+			self.employee, allocate_on_day="First Day", start_date=frappe.flags.current_date
+		)
+		allocation = frappe.db.get_value(
+			"Leave Allocation", {"leave_policy_assignment": leave_policy_assignments[0]}, "name"
+		)
+		leaves_allocated = get_allocated_leaves(leave_policy_assignments[0])
+		balance = get_leave_balance_on(self.employee.name, self.leave_type, frappe.flags.current_date)
+
+		allocate_earned_leaves_for_months(2)
+		self.assertEqual(get_allocated_leaves(leave_policy_assignments[0]), leaves_allocated + 2)
+
+		ledger_entries = frappe.get_all(
+			"Leave Ledger Entry",
+			filters={
+				"transaction_name": allocation,
+				"docstatus": 1,
+				"from_date": (">", get_year_start(getdate())),
+			},
+			fields=["leaves", "from_date", "company", "employee_name"],
+			order_by="from_date",
+		)
+		self.assertEqual([entry.leaves for entry in ledger_entries], [1, 1])
+		self.assertEqual(getdate(ledger_entries[-1].from_date), frappe.flags.current_date)
+		self.assertEqual(ledger_entries[-1].company, self.employee.company)
+		self.assertEqual(ledger_entries[-1].employee_name, self.employee.employee_name)
+
+		comments = frappe.get_all(
+			"Comment",
+			filters={
+				"reference_doctype": "Leave Allocation",
+				"reference_name": allocation,
+				"comment_type": "Info",
+			},
+			pluck="content",
+		)
+		self.assertEqual(len(comments), 2)
+		self.assertEqual(
+			get_leave_balance_on(self.employee.name, self.leave_type, frappe.flags.current_date),
+			balance + 2,
+		)
+
 	def test_allocate_on_last_day(self):
 		"""Tests assignment with 'Allocate On=Last Day'"""
 		prev_month_last_day = get_last_day(add_months(getdate(), -1))
@@ -324,6 +324,36 @@ class TestLeaveAllocation(FrappeTestCase):
 
 		self.assertEqual(leave_allocation_1.unused_leaves, leave_allocation.new_leaves_allocated)
 
+	def test_expiry_of_allocations_in_bulk(self):
+		other_employee = make_employee("test_leave_allocation_expiry@salary.com", company="_Test Company")
+
+		allocations = []
+		for employee, from_date, to_date in [
+			(self.employee.name, add_months(nowdate(), -24), add_months(nowdate(), -12)),
+			(self.employee.name, add_days(add_months(nowdate(), -12), 1), add_days(nowdate(), -1)),
+			(other_employee, add_months(nowdate(), -12), add_days(nowdate(), -1)),
+		]:
+			leave_allocation = create_leave_allocation(
+				employee=employee, from_date=from_date, to_date=to_date, new_leaves_allocated=10
+			)
+			leave_allocation.submit()
+			allocations.append(leave_allocation.name)
+
+		process_expired_allocation()
+		# expired allocations are not picked again
+		process_expired_allocation()
+
+		for allocation in allocations:
+			self.assertEqual(frappe.db.get_value("Leave Allocation", allocation, "expired"), 1)
+
+			expiry_entries = frappe.get_all(
+				"Leave Ledger Entry",
+				filters={"transaction_name": allocation, "is_expired": 1, "docstatus": 1},
+				pluck="leaves",
+			)
+			# remaining leaves of the earlier allocation are already expired
+			self.assertEqual(expiry_entries, [-10])
+
 	def test_creation_of_leave_ledger_entry_on_submit(self):
 		leave_allocation = create_leave_allocation(
 			employee=self.employee.name, employee_name=self.employee.employee_name
@@ -24,6 +24,9 @@ from erpnext.buying.doctype.supplier_scorecard.supplier_scorecard import dateran
 from erpnext.setup.doctype.employee.employee import get_holiday_list_for_employee
 
 import hrms
+from hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot import (
+	get_leave_balance_snapshot,
+)
 from hrms.hr.doctype.leave_block_list.leave_block_list import get_applicable_block_dates
 from hrms.hr.doctype.leave_ledger_entry.leave_ledger_entry import create_leave_ledger_entry
 from hrms.hr.utils import (
@@ -35,6 +38,7 @@ from hrms.hr.utils import (
 )
 from hrms.mixins.pwa_notifications import PWANotificationsMixin
 from hrms.utils import get_employee_email
+from hrms.utils.holiday_list import get_holiday_calendar
 
 
 class LeaveDayBlockedError(frappe.ValidationError):
@@ -829,7 +833,7 @@ def get_number_of_leave_days(
 	else:
 		number_of_days = date_diff(to_date, from_date) + 1
 
-	if not frappe.db.get_value("Leave Type", leave_type, "include_holiday"):
+	if not frappe.get_cached_value("Leave Type", leave_type, "include_holiday"):
 		number_of_days = flt(number_of_days) - flt(
 			get_holidays(employee, from_date, to_date, holiday_list=holiday_list)
 		)
@@ -899,6 +903,30 @@ def get_leave_balance_on(
 	if not to_date:
 		to_date = nowdate()
 
+	snapshot = get_leave_balance_snapshot(employee, leave_type, date)
+	if snapshot and snapshot.can_compute_balance_on(
+		date, to_date, consider_all_leaves_in_the_allocation_period
+	):
+		remaining_leaves = snapshot.get_remaining_leaves(date, to_date)
+	else:
+		remaining_leaves = get_remaining_leaves_from_ledger(
+			employee, leave_type, date, to_date, consider_all_leaves_in_the_allocation_period
+		)
+
+	if for_consumption:
+		return remaining_leaves
+	else:
+		return remaining_leaves.get("leave_balance")
+
+
+def get_remaining_leaves_from_ledger(
+	employee: str,
+	leave_type: str,
+	date: datetime.date,
+	to_date: datetime.date,
+	consider_all_leaves_in_the_allocation_period: bool = False,
+) -> Dict[str, float]:
+	"""Computes leave_balance and leave_balance_for_consumption from the Leave Ledger Entries"""
 	allocation_records = get_leave_allocation_records(employee, date, leave_type)
 	allocation = allocation_records.get(leave_type, frappe._dict())
 
@@ -909,12 +937,7 @@ def get_leave_balance_on(
 
 	leaves_taken = get_leaves_for_period(employee, leave_type, allocation.from_date, end_date)
 
-	remaining_leaves = get_remaining_leaves(allocation, leaves_taken, date, cf_expiry)
-
-	if for_consumption:
-		return remaining_leaves
-	else:
-		return remaining_leaves.get("leave_balance")
+	return get_remaining_leaves(allocation, leaves_taken, date, cf_expiry)
 
 
 def get_leave_allocation_records(employee, date, leave_type=None):
@@ -1009,11 +1032,16 @@ def get_leaves_pending_approval_for_period(
 
 
 def get_remaining_leaves(
-	allocation: Dict, leaves_taken: float, date: str, cf_expiry: str
+	allocation: Dict,
+	leaves_taken: float,
+	date: str,
+	cf_expiry: str,
+	leaves_taken_around_cf_expiry: Optional[Tuple[float, float]] = None,
 ) -> Dict[str, float]:
 	"""Returns a dict of leave_balance and leave_balance_for_consumption
 	leave_balance returns the available leave balance
 	leave_balance_for_consumption returns the minimum leaves remaining after comparing with remaining days for allocation expiry
+	leaves_taken_around_cf_expiry (optional) leaves taken till and after cf expiry, if already known
 	"""
 
 	def _get_remaining_leaves(remaining_leaves, end_date):
@@ -1026,7 +1054,9 @@ def get_remaining_leaves(
 
 	if cf_expiry and allocation.unused_leaves:
 		# allocation contains both carry forwarded and new leaves
-		new_leaves_taken, cf_leaves_taken = get_new_and_cf_leaves_taken(allocation, cf_expiry)
+		new_leaves_taken, cf_leaves_taken = get_new_and_cf_leaves_taken(
+			allocation, cf_expiry, leaves_taken_around_cf_expiry
+		)
 
 		if getdate(date) > getdate(cf_expiry):
 			# carry forwarded leaves have expired
@@ -1051,14 +1081,21 @@ def get_remaining_leaves(
 	return frappe._dict(leave_balance=leave_balance, leave_balance_for_consumption=remaining_leaves)
 
 
-def get_new_and_cf_leaves_taken(allocation: Dict, cf_expiry: str) -> Tuple[float, float]:
+def get_new_and_cf_leaves_taken(
+	allocation: Dict,
+	cf_expiry: str,
+	leaves_taken_around_cf_expiry: Optional[Tuple[float, float]] = None,
+) -> Tuple[float, float]:
 	"""returns new leaves taken and carry forwarded leaves taken within an allocation period based on cf leave expiry"""
-	cf_leaves_taken = get_leaves_for_period(
-		allocation.employee, allocation.leave_type, allocation.from_date, cf_expiry
-	)
-	new_leaves_taken = get_leaves_for_period(
-		allocation.employee, allocation.leave_type, add_days(cf_expiry, 1), allocation.to_date
-	)
+	if leaves_taken_around_cf_expiry is not None:
+		cf_leaves_taken, new_leaves_taken = leaves_taken_around_cf_expiry
+	else:
+		cf_leaves_taken = get_leaves_for_period(
+			allocation.employee, allocation.leave_type, allocation.from_date, cf_expiry
+		)
+		new_leaves_taken = get_leaves_for_period(
+			allocation.employee, allocation.leave_type, add_days(cf_expiry, 1), allocation.to_date
+		)
 
 	# using abs because leaves taken is a -ve number in the ledger
 	if abs(cf_leaves_taken) > allocation.unused_leaves:
@@ -1153,14 +1190,7 @@ def get_holidays(employee, from_date, to_date, holiday_list=None):
 	if not holiday_list:
 		holiday_list = get_holiday_list_for_employee(employee)
 
-	holidays = frappe.db.sql(
-		"""select count(distinct holiday_date) from `tabHoliday` h1, `tabHoliday List` h2
-		where h1.parent = h2.name and h1.holiday_date between %s and %s
-		and h2.name = %s""",
-		(from_date, to_date, holiday_list),
-	)[0][0]
-
-	return holidays
+	return get_holiday_calendar(holiday_list).count_holidays(from_date, to_date)
 
 
 def is_lwp(leave_type):
@@ -26,6 +26,7 @@ from hrms.hr.doctype.leave_application.leave_application import (
 	LeaveDayBlockedError,
 	NotAnOptionalHoliday,
 	OverlapError,
+	get_holidays,
 	get_leave_allocation_records,
 	get_leave_balance_on,
 	get_leave_details,
@@ -39,7 +40,8 @@ from hrms.payroll.doctype.salary_slip.test_salary_slip import (
 	make_holiday_list,
 	make_leave_application,
 )
-from hrms.tests.test_utils import get_first_sunday
+from hrms.tests.test_utils import add_date_to_holiday_list, get_first_sunday
+from hrms.utils.holiday_list import get_holiday_counts
 
 test_dependencies = ["Leave Type", "Leave Allocation", "Leave Block List", "Employee"]
 
@@ -83,6 +85,8 @@ class TestLeaveApplication(FrappeTestCase):
 			"Leave Application",
 			"Leave Allocation",
 			"Salary Slip",
+			"Salary Slip Aggregate",
+			"Salary Slip Aggregate Component",
 			"Leave Ledger Entry",
 			"Leave Period",
 			"Leave Policy Assignment",
@@ -401,6 +405,23 @@ class TestLeaveApplication(FrappeTestCase):
 		# attendance on non-holiday updated
 		self.assertEqual(frappe.db.get_value("Attendance", attendance.name, "status"), "On Leave")
 
+	@set_holiday_list("Salary Slip Test Holiday List", "_Test Company")
+	def test_holidays_counted_from_holiday_calendar(self):
+		employee = get_employee()
+		first_sunday = get_first_sunday(self.holiday_list)
+		from_date, to_date = add_days(first_sunday, 1), add_days(first_sunday, 5)
+
+		self.assertEqual(get_holidays(employee.name, first_sunday, to_date), 1)
+		self.assertEqual(get_holidays(employee.name, from_date, to_date), 0)
+
+		# calendar is invalidated on holiday list update
+		add_date_to_holiday_list(add_days(first_sunday, 2), self.holiday_list)
+		self.assertEqual(get_holidays(employee.name, from_date, to_date), 1)
+		self.assertEqual(
+			get_holiday_counts([(employee.name, from_date, to_date), (employee.name, to_date, to_date)]),
+			[{"holidays": 1, "working_days": 4}, {"holidays": 0, "working_days": 1}],
+		)
+
 	def test_block_list(self):
 		self._clear_roles()
 
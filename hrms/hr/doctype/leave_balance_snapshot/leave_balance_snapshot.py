@@ -0,0 +1,290 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, flt, getdate, nowdate
+
+
+class LeaveBalanceSnapshot(Document):
+	"""Allocated and taken leaves of a leave allocation, computed from the Leave Ledger Entries.
+
+	`get_leave_balance_on` reads the balance from here instead of recomputing allocations and leaves
+	taken from the ledger, for the dates on which both computations are known to be the same.
+	"""
+
+	def can_compute_balance_on(
+		self, date, to_date, consider_all_leaves_in_the_allocation_period=False
+	) -> bool:
+		date = getdate(date)
+		if not getdate(self.valid_from) <= date <= getdate(self.valid_till):
+			return False
+
+		# carry forward expiry lookups beyond the allocation could find the next allocation's expiry
+		if getdate(to_date) > getdate(self.to_date):
+			return False
+
+		# leaves taken are totals of the whole allocation period
+		if (
+			not cint(consider_all_leaves_in_the_allocation_period)
+			and self.last_leave_date
+			and date < getdate(self.last_leave_date)
+		):
+			return False
+
+		return True
+
+	def get_allocation(self) -> frappe._dict:
+		"""Returns the allocation in the format of `get_leave_allocation_records`"""
+		return frappe._dict(
+			{
+				"from_date": getdate(self.from_date),
+				"to_date": getdate(self.to_date),
+				"total_leaves_allocated": flt(self.total_leaves_allocated),
+				"unused_leaves": flt(self.unused_leaves),
+				"new_leaves_allocated": flt(self.new_leaves_allocated),
+				"leave_type": self.leave_type,
+				"employee": self.employee,
+			}
+		)
+
+	def get_remaining_leaves(self, date, to_date) -> frappe._dict:
+		"""Returns leave_balance and leave_balance_for_consumption like `get_leave_balance_on`"""
+		from hrms.hr.doctype.leave_application.leave_application import get_remaining_leaves
+
+		cf_expiry = (
+			getdate(self.cf_expiry) if self.cf_expiry and getdate(self.cf_expiry) <= getdate(to_date) else ""
+		)
+
+		return get_remaining_leaves(
+			self.get_allocation(),
+			flt(self.leaves_taken),
+			date,
+			cf_expiry,
+			leaves_taken_around_cf_expiry=(
+				flt(self.cf_period_leaves_taken),
+				flt(self.new_period_leaves_taken),
+			)
+			if cf_expiry
+			else None,
+		)
+
+
+def get_leave_balance_snapshot(employee: str, leave_type: str, date) -> LeaveBalanceSnapshot | None:
+	"""Returns the snapshot of the allocation active on the date, None if it has not been built yet.
+	Snapshots are only written by the ledger hooks and the scheduled rebuild, never while reading"""
+	date = getdate(date)
+	values = frappe.db.get_value(
+		"Leave Balance Snapshot",
+		{
+			"employee": employee,
+			"leave_type": leave_type,
+			"from_date": ("<=", date),
+			"to_date": (">=", date),
+		},
+		"*",
+		as_dict=True,
+	)
+
+	return frappe.get_doc({"doctype": "Leave Balance Snapshot", **values}) if values else None
+
+
+def update_leave_balance_snapshots(ledger) -> None:
+	"""Rebuilds the snapshots of the allocations affected by a created, cancelled or deleted ledger entry"""
+	allocations = set(
+		frappe.get_all(
+			"Leave Allocation",
+			filters={
+				"employee": ledger.employee,
+				"leave_type": ledger.leave_type,
+				"from_date": ("<=", ledger.to_date),
+				"to_date": (">=", ledger.from_date),
+			},
+			pluck="name",
+		)
+	)
+
+	if ledger.transaction_type == "Leave Allocation":
+		allocations.add(ledger.transaction_name)
+
+	for allocation in allocations:
+		rebuild_leave_balance_snapshot(allocation)
+
+
+def rebuild_leave_balance_snapshot(leave_allocation: str) -> LeaveBalanceSnapshot | None:
+	"""Recomputes the snapshot of the allocation from the ledger,
+	returns None if the allocation is not submitted or has no ledger entries"""
+	from hrms.hr.doctype.leave_application.leave_application import (
+		get_allocation_expiry_for_cf_leaves,
+		get_leave_entries,
+		get_leaves_for_period,
+	)
+
+	frappe.db.delete("Leave Balance Snapshot", {"leave_allocation": leave_allocation})
+
+	allocation = frappe.db.get_value(
+		"Leave Allocation",
+		leave_allocation,
+		["employee", "leave_type", "from_date", "to_date", "docstatus"],
+		as_dict=True,
+	)
+	if not allocation or allocation.docstatus != 1:
+		return None
+
+	# entries considered by `get_leave_allocation_records`
+	entries = frappe.get_all(
+		"Leave Ledger Entry",
+		filters={
+			"transaction_type": "Leave Allocation",
+			"transaction_name": leave_allocation,
+			"docstatus": 1,
+			"is_expired": 0,
+			"is_lwp": 0,
+		},
+		fields=["from_date", "to_date", "leaves", "is_carry_forward"],
+	)
+	new_leaves = [entry for entry in entries if not entry.is_carry_forward]
+	cf_leaves = [
+		entry
+		for entry in entries
+		if entry.is_carry_forward and allocation.from_date <= entry.to_date <= allocation.to_date
+	]
+	entries = new_leaves + cf_leaves
+	if not entries:
+		return None
+
+	employee, leave_type = allocation.employee, allocation.leave_type
+	from_date = min(entry.from_date for entry in entries)
+	to_date = max(entry.to_date for entry in entries)
+
+	snapshot = frappe.new_doc("Leave Balance Snapshot")
+	snapshot.update(
+		{
+			"employee": employee,
+			"leave_type": leave_type,
+			"leave_allocation": leave_allocation,
+			"from_date": from_date,
+			"to_date": to_date,
+			# all entries are considered once they have started, new leaves till they end
+			"valid_from": max([allocation.from_date] + [entry.from_date for entry in entries]),
+			"valid_till": min([allocation.to_date] + [entry.to_date for entry in new_leaves]),
+			"new_leaves_allocated": sum(flt(entry.leaves) for entry in new_leaves),
+			"unused_leaves": sum(flt(entry.leaves) for entry in cf_leaves),
+			"cf_expiry": get_allocation_expiry_for_cf_leaves(employee, leave_type, to_date, from_date) or None,
+			"leaves_taken": get_leaves_for_period(employee, leave_type, from_date, to_date),
+			"last_leave_date": max(
+				(
+					entry.to_date
+					for entry in get_leave_entries(employee, leave_type, from_date, to_date)
+					if not entry.is_expired
+				),
+				default=None,
+			),
+		}
+	)
+	snapshot.total_leaves_allocated = flt(snapshot.new_leaves_allocated) + flt(snapshot.unused_leaves)
+
+	if snapshot.cf_expiry:
+		snapshot.cf_period_leaves_taken = get_leaves_for_period(
+			employee, leave_type, from_date, snapshot.cf_expiry
+		)
+		snapshot.new_period_leaves_taken = get_leaves_for_period(
+			employee, leave_type, add_days(snapshot.cf_expiry, 1), to_date
+		)
+
+	snapshot.insert(ignore_permissions=True)
+	return snapshot
+
+
+def rebuild_leave_balance_snapshots(employee: str | None = None, leave_type: str | None = None) -> int:
+	"""Rebuilds the snapshots of all submitted allocations, returns the number of snapshots built.
+
+	bench --site site_name execute hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot.rebuild_leave_balance_snapshots
+	"""
+	filters = {"docstatus": 1}
+	if employee:
+		filters["employee"] = employee
+	if leave_type:
+		filters["leave_type"] = leave_type
+
+	built = 0
+	for allocation in frappe.get_all("Leave Allocation", filters=filters, pluck="name"):
+		if rebuild_leave_balance_snapshot(allocation):
+			built += 1
+
+	return built
+
+
+def rebuild_missing_leave_balance_snapshots() -> None:
+	"""Builds the snapshots of the allocations active today that do not have one,
+	e.g. after bulk allocation or expiry removed them without going through the ledger hooks"""
+	today = getdate(nowdate())
+	LeaveAllocation = frappe.qb.DocType("Leave Allocation")
+	Snapshot = frappe.qb.DocType("Leave Balance Snapshot")
+
+	allocations = (
+		frappe.qb.from_(LeaveAllocation)
+		.left_join(Snapshot)
+		.on(Snapshot.leave_allocation == LeaveAllocation.name)
+		.select(LeaveAllocation.name)
+		.where(
+			(LeaveAllocation.docstatus == 1)
+			& (LeaveAllocation.from_date <= today)
+			& (LeaveAllocation.to_date >= today)
+			& (Snapshot.name.isnull())
+		)
+	).run(pluck=True)
+
+	for allocation in allocations:
+		rebuild_leave_balance_snapshot(allocation)
+
+
+def get_inconsistent_leave_balance_snapshots(
+	date=None, employee: str | None = None, leave_type: str | None = None
+) -> list[dict]:
+	"""Compares the balance read from snapshots with the balance computed from the ledger on the date,
+	returns the snapshots that differ.
+
+	bench --site site_name execute hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot.get_inconsistent_leave_balance_snapshots
+	"""
+	from hrms.hr.doctype.leave_application.leave_application import get_remaining_leaves_from_ledger
+
+	date = getdate(date or nowdate())
+	filters = {"from_date": ("<=", date), "to_date": (">=", date)}
+	if employee:
+		filters["employee"] = employee
+	if leave_type:
+		filters["leave_type"] = leave_type
+
+	inconsistent = []
+	for name in frappe.get_all("Leave Balance Snapshot", filters=filters, pluck="name"):
+		snapshot = frappe.get_doc("Leave Balance Snapshot", name)
+
+		for consider_all_leaves_in_the_allocation_period in (True, False):
+			if not snapshot.can_compute_balance_on(
+				date, snapshot.to_date, consider_all_leaves_in_the_allocation_period
+			):
+				continue
+
+			expected = get_remaining_leaves_from_ledger(
+				snapshot.employee,
+				snapshot.leave_type,
+				date,
+				snapshot.to_date,
+				consider_all_leaves_in_the_allocation_period,
+			)
+			actual = snapshot.get_remaining_leaves(date, snapshot.to_date)
+
+			if any(flt(actual[key], 6) != flt(expected[key], 6) for key in expected):
+				inconsistent.append(
+					{
+						"snapshot": snapshot.name,
+						"employee": snapshot.employee,
+						"leave_type": snapshot.leave_type,
+						"consider_all_leaves_in_the_allocation_period": consider_all_leaves_in_the_allocation_period,
+						"expected": expected,
+						"actual": actual,
+					}
+				)
+
+	return inconsistent
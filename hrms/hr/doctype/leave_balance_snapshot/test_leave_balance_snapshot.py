@@ -0,0 +1,113 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import (
+	add_days,
+	add_months,
+	get_first_day,
+	get_year_ending,
+	get_year_start,
+	getdate,
+)
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+
+from hrms.hr.doctype.leave_allocation.test_leave_allocation import create_leave_allocation
+from hrms.hr.doctype.leave_application.leave_application import (
+	get_leave_balance_on,
+	get_remaining_leaves_from_ledger,
+)
+from hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot import (
+	get_inconsistent_leave_balance_snapshots,
+	get_leave_balance_snapshot,
+	rebuild_missing_leave_balance_snapshots,
+)
+from hrms.hr.doctype.leave_type.test_leave_type import create_leave_type
+from hrms.payroll.doctype.salary_slip.test_salary_slip import make_leave_application
+
+
+class TestLeaveBalanceSnapshot(FrappeTestCase):
+	def setUp(self):
+		for doctype in ["Leave Application", "Leave Allocation", "Leave Ledger Entry", "Leave Balance Snapshot"]:
+			frappe.db.delete(doctype)
+
+		self.employee = make_employee("test_leave_balance_snapshot@example.com", company="_Test Company")
+		frappe.db.set_value("Employee", self.employee, "holiday_list", "")
+		self.leave_type = create_leave_type(leave_type_name="_Test Snapshot Leave Type", include_holidays=1).name
+
+		self.from_date = get_year_start(getdate())
+		self.to_date = get_year_ending(getdate())
+		self.allocation = create_leave_allocation(
+			employee=self.employee,
+			leave_type=self.leave_type,
+			from_date=self.from_date,
+			to_date=self.to_date,
+			new_leaves_allocated=15,
+		)
+		self.allocation.submit()
+
+	def test_snapshot_updated_from_ledger(self):
+		snapshot = frappe.get_doc("Leave Balance Snapshot", self.allocation.name)
+		self.assertEqual(snapshot.total_leaves_allocated, 15)
+		self.assertEqual(snapshot.leaves_taken, 0)
+
+		leave_from_date = get_first_day(add_months(self.from_date, 1))
+		application = make_leave_application(
+			self.employee, leave_from_date, add_days(leave_from_date, 2), self.leave_type
+		)
+
+		snapshot.reload()
+		self.assertEqual(snapshot.leaves_taken, -3)
+		self.assertEqual(getdate(snapshot.last_leave_date), add_days(leave_from_date, 2))
+		self.assertEqual(get_leave_balance_on(self.employee, self.leave_type, self.to_date), 12)
+		self.assertEqual(get_inconsistent_leave_balance_snapshots(self.to_date, self.employee), [])
+
+		application.cancel()
+		snapshot.reload()
+		self.assertEqual(snapshot.leaves_taken, 0)
+		self.assertEqual(get_leave_balance_on(self.employee, self.leave_type, self.to_date), 15)
+
+	def test_balance_before_last_leave_computed_from_ledger(self):
+		leave_from_date = get_first_day(add_months(self.from_date, 2))
+		make_leave_application(self.employee, leave_from_date, add_days(leave_from_date, 1), self.leave_type)
+
+		snapshot = get_leave_balance_snapshot(self.employee, self.leave_type, self.from_date)
+		self.assertFalse(snapshot.can_compute_balance_on(self.from_date, self.to_date))
+		self.assertTrue(snapshot.can_compute_balance_on(self.from_date, self.to_date, True))
+
+		self.assertEqual(
+			get_leave_balance_on(self.employee, self.leave_type, self.from_date),
+			get_remaining_leaves_from_ledger(self.employee, self.leave_type, self.from_date, self.to_date)[
+				"leave_balance"
+			],
+		)
+		self.assertEqual(
+			get_leave_balance_on(
+				self.employee,
+				self.leave_type,
+				self.from_date,
+				consider_all_leaves_in_the_allocation_period=True,
+			),
+			13,
+		)
+
+	def test_missing_snapshot_read_from_ledger_until_rebuilt(self):
+		leave_from_date = get_first_day(add_months(self.from_date, 1))
+		make_leave_application(
+			self.employee, leave_from_date, add_days(leave_from_date, 2), self.leave_type
+		)
+		frappe.db.delete("Leave Balance Snapshot", {"leave_allocation": self.allocation.name})
+
+		# reads never write
+		self.assertIsNone(get_leave_balance_snapshot(self.employee, self.leave_type, self.to_date))
+		self.assertEqual(get_leave_balance_on(self.employee, self.leave_type, self.to_date), 12)
+		self.assertFalse(
+			frappe.db.exists("Leave Balance Snapshot", {"leave_allocation": self.allocation.name})
+		)
+
+		rebuild_missing_leave_balance_snapshots()
+		snapshot = get_leave_balance_snapshot(self.employee, self.leave_type, self.to_date)
+		self.assertEqual(snapshot.leaves_taken, -3)
+		self.assertEqual(get_leave_balance_on(self.employee, self.leave_type, self.to_date), 12)
@@ -0,0 +1,215 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Set based expiry of leave allocations for `process_expired_allocation`.
+
+Expired allocation entries are read in batches ordered by expiry date. Remaining leaves of a batch
+are computed with one grouped query, the expiry ledger entries are written with one multi-row INSERT
+and the allocations are marked expired with one UPDATE. Every batch is committed, allocations with
+an expiry entry are not picked again, so a run that stops midway resumes where it left off.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, getdate, now, today
+
+from hrms.api import clear_home_data_cache_for_users
+from hrms.utils.bulk_insert import write_documents
+
+LEAVE_EXPIRY_BATCH_SIZE = 500
+
+
+class BulkLeaveExpiry:
+	def __init__(self):
+		self.today = getdate(today())
+		self.expired = 0
+		# expiry entries of the batch being processed, as (to_date, leaves) by (employee, leave_type)
+		self.expiry_entries = defaultdict(list)
+
+		# leave types with a separate expiry for carry forwarded leaves
+		self.cf_expiry_leave_types = frappe.get_all(
+			"Leave Type", filters={"expire_carry_forwarded_leaves_after_days": (">", 0)}, pluck="name"
+		) or [""]
+
+	def process(self):
+		last = None
+		while allocations := self.get_expired_allocations(last):
+			self.expire(allocations)
+			last = allocations[-1]
+
+			if not frappe.flags.in_test:
+				# commit after every batch to avoid losing progress
+				frappe.db.commit()  # nosemgrep
+
+			frappe.logger("leave_expiry").info(
+				f"Processed {self.expired} expired leave allocation entries, last expiry date {last.to_date}"
+			)
+
+	def get_expired_allocations(self, last: dict | None = None) -> list[dict]:
+		"""Same entries as `process_expired_allocation` picks, ordered by expiry date,
+		returns the next batch after `last`"""
+		condition = ""
+		if last:
+			condition = """AND (l.to_date > %(last_date)s
+				OR (l.to_date = %(last_date)s AND l.name > %(last_name)s))"""
+
+		return frappe.db.sql(
+			f"""
+			SELECT
+				l.name as ledger_entry, l.leaves, l.to_date, l.employee, l.leave_type,
+				l.is_carry_forward, l.transaction_name as name, l.transaction_type
+			FROM `tabLeave Ledger Entry` l
+			WHERE (NOT EXISTS
+				(SELECT name
+					FROM `tabLeave Ledger Entry`
+					WHERE
+						transaction_name = l.transaction_name
+						AND transaction_type = 'Leave Allocation'
+						AND name<>l.name
+						AND docstatus = 1
+						AND (
+							is_carry_forward=l.is_carry_forward
+							OR (is_carry_forward = 0 AND leave_type not in %(leave_types)s)
+				)))
+				AND l.transaction_type = 'Leave Allocation'
+				AND l.to_date < %(today)s
+				{condition}
+			ORDER BY l.to_date, l.name
+			LIMIT %(limit)s""",
+			{
+				"leave_types": self.cf_expiry_leave_types,
+				"today": self.today,
+				"last_date": last and last.to_date,
+				"last_name": last and last.ledger_entry,
+				"limit": LEAVE_EXPIRY_BATCH_SIZE,
+			},
+			as_dict=True,
+		)
+
+	def expire(self, allocations: list[dict]):
+		"""Same as `create_expiry_ledger_entry` for a batch of allocation entries"""
+		self.expiry_entries.clear()
+		employees = self.get_employees(allocations)
+		remaining_leaves = self.get_remaining_leaves(
+			[allocation for allocation in allocations if not allocation.is_carry_forward]
+		)
+
+		ledger_entries = []
+		expired_allocations = []
+
+		for allocation in allocations:
+			if allocation.is_carry_forward:
+				# leaves taken are looked up without a start date in `expire_carried_forward_allocation`,
+				# so the carry forwarded leaves expire as long as they are positive
+				leaves = flt(allocation.leaves) * -1 if flt(allocation.leaves) > 0 else 0
+			else:
+				leaves = flt(remaining_leaves.get(allocation.ledger_entry))
+				leaves = (leaves + self.get_leaves_expired_in_batch(allocation)) * -1
+				expired_allocations.append(allocation.name)
+
+			if leaves:
+				ledger_entries.append(
+					self.get_expiry_ledger_entry(allocation, employees.get(allocation.employee), leaves)
+				)
+				self.expiry_entries[(allocation.employee, allocation.leave_type)].append(
+					(allocation.to_date, leaves)
+				)
+
+		write_documents(ledger_entries)
+		self.set_allocations_expired(expired_allocations)
+
+		# balances are read from the ledger until the daily job rebuilds these snapshots
+		frappe.db.delete(
+			"Leave Balance Snapshot",
+			{"leave_allocation": ("in", list({allocation.name for allocation in allocations}))},
+		)
+		clear_home_data_cache_for_users(employee.user_id for employee in employees.values())
+
+		self.expired += len(allocations)
+
+	def get_remaining_leaves(self, allocations: list[dict]) -> dict:
+		"""Same as `get_remaining_leaves` of each allocation entry with one grouped query"""
+		if not allocations:
+			return {}
+
+		Allocation = frappe.qb.DocType("Leave Ledger Entry").as_("allocation")
+		Ledger = frappe.qb.DocType("Leave Ledger Entry").as_("ledger")
+
+		return dict(
+			(
+				frappe.qb.from_(Allocation)
+				.join(Ledger)
+				.on(
+					(Ledger.employee == Allocation.employee)
+					& (Ledger.leave_type == Allocation.leave_type)
+					& (Ledger.to_date <= Allocation.to_date)
+					& (Ledger.docstatus == 1)
+				)
+				.select(Allocation.name, Sum(Ledger.leaves))
+				.where(Allocation.name.isin([allocation.ledger_entry for allocation in allocations]))
+				.groupby(Allocation.name)
+			).run()
+		)
+
+	def get_leaves_expired_in_batch(self, allocation: dict) -> float:
+		"""Returns leaves of the batch's earlier expiry entries of the same employee and leave type,
+		which are not in the database yet when remaining leaves are computed"""
+		return sum(
+			leaves
+			for to_date, leaves in self.expiry_entries.get((allocation.employee, allocation.leave_type), [])
+			if to_date <= allocation.to_date
+		)
+
+	def get_employees(self, allocations: list[dict]) -> dict:
+		return {
+			employee.name: employee
+			for employee in frappe.get_all(
+				"Employee",
+				filters={"name": ("in", list({allocation.employee for allocation in allocations}))},
+				fields=["name", "employee_name", "company", "user_id"],
+			)
+		}
+
+	def get_expiry_ledger_entry(self, allocation: dict, employee: dict | None, leaves: float):
+		"""Same ledger entry as `expire_allocation` and `expire_carried_forward_allocation`,
+		ready for bulk insert"""
+		employee = employee or frappe._dict()
+		ledger_entry = frappe.get_doc(
+			{
+				"doctype": "Leave Ledger Entry",
+				"employee": allocation.employee,
+				"employee_name": employee.employee_name,
+				"company": employee.company,
+				"leave_type": allocation.leave_type,
+				"transaction_type": "Leave Allocation",
+				"transaction_name": allocation.name,
+				"leaves": leaves,
+				"from_date": allocation.to_date,
+				"to_date": allocation.to_date,
+				"is_carry_forward": allocation.is_carry_forward,
+				"is_expired": 1,
+				"is_lwp": 0,
+				"docstatus": 1,
+			}
+		)
+		ledger_entry.flags.ignore_permissions = True
+		ledger_entry._set_defaults()
+		ledger_entry.set_user_and_timestamp()
+		ledger_entry.set_new_name()
+
+		return ledger_entry
+
+	def set_allocations_expired(self, allocations: list[str]):
+		if not allocations:
+			return
+
+		Allocation = frappe.qb.DocType("Leave Allocation")
+		(
+			frappe.qb.update(Allocation)
+			.set(Allocation.expired, 1)
+			.set(Allocation.modified, now())
+			.set(Allocation.modified_by, frappe.session.user)
+			.where(Allocation.name.isin(allocations))
+		).run()
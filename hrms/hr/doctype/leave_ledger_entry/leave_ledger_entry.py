@@ -5,7 +5,11 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import DATE_FORMAT, flt, getdate, today
+from frappe.utils import DATE_FORMAT, flt, getdate
+
+from hrms.hr.doctype.leave_balance_snapshot.leave_balance_snapshot import (
+	update_leave_balance_snapshots,
+)
 
 
 class LeaveLedgerEntry(Document):
@@ -13,6 +17,9 @@ class LeaveLedgerEntry(Document):
 		if getdate(self.from_date) > getdate(self.to_date):
 			frappe.throw(_("To date needs to be before from date"))
 
+	def on_submit(self):
+		update_leave_balance_snapshots(self)
+
 	def on_cancel(self):
 		# allow cancellation of expiry leaves
 		if self.is_expired:
@@ -20,6 +27,8 @@ class LeaveLedgerEntry(Document):
 		else:
 			frappe.throw(_("Only expired allocation can be cancelled"))
 
+		update_leave_balance_snapshots(self)
+
 
 def validate_leave_allocation_against_leave_application(ledger):
 	"""Checks that leave allocation has no leave application against it"""
@@ -82,6 +91,8 @@ def delete_ledger_entry(ledger):
 		(ledger.transaction_name, expired_entry),
 	)
 
+	update_leave_balance_snapshots(ledger)
+
 
 def get_previous_expiry_ledger_entry(ledger):
 	"""Returns the expiry ledger entry having same creation date as the ledger entry to be cancelled"""
@@ -118,41 +129,9 @@ def process_expired_allocation():
 	Case 2: leave type has no specific expiry period for carry forwarded leaves
 	        and there is no carry forwarded leave allocation, create a single expiry against the remaining leaves.
 	"""
+	from hrms.hr.doctype.leave_ledger_entry.bulk_leave_expiry import BulkLeaveExpiry
 
-	# fetch leave type records that has carry forwarded leaves expiry
-	leave_type_records = frappe.db.get_values(
-		"Leave Type", filters={"expire_carry_forwarded_leaves_after_days": (">", 0)}, fieldname=["name"]
-	)
-
-	leave_type = [record[0] for record in leave_type_records] or [""]
-
-	# fetch non expired leave ledger entry of transaction_type allocation
-	expire_allocation = frappe.db.sql(
-		"""
-		SELECT
-			leaves, to_date, employee, leave_type,
-			is_carry_forward, transaction_name as name, transaction_type
-		FROM `tabLeave Ledger Entry` l
-		WHERE (NOT EXISTS
-			(SELECT name
-				FROM `tabLeave Ledger Entry`
-				WHERE
-					transaction_name = l.transaction_name
-					AND transaction_type = 'Leave Allocation'
-					AND name<>l.name
-					AND docstatus = 1
-					AND (
-						is_carry_forward=l.is_carry_forward
-						OR (is_carry_forward = 0 AND leave_type not in %s)
-			)))
-			AND transaction_type = 'Leave Allocation'
-			AND to_date < %s""",
-		(leave_type, today()),
-		as_dict=1,
-	)
-
-	if expire_allocation:
-		create_expiry_ledger_entry(expire_allocation)
+	BulkLeaveExpiry().process()
 
 
 def create_expiry_ledger_entry(allocations):
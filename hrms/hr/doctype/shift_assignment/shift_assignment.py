@@ -375,8 +375,12 @@ def get_shifts_for_date(employee: str, for_timestamp: datetime) -> List[Dict[str
 	).run(as_dict=True)
 
 
-def get_shift_for_timestamp(employee: str, for_timestamp: datetime) -> Dict:
-	shifts = get_shifts_for_date(employee, for_timestamp)
+def get_shift_for_timestamp(employee: str, for_timestamp: datetime, timeline=None) -> Dict:
+	shifts = (
+		timeline.get_shifts_for_date(for_timestamp)
+		if timeline
+		else get_shifts_for_date(employee, for_timestamp)
+	)
 	if shifts:
 		return get_shift_for_time(shifts, for_timestamp)
 	return {}
@@ -387,6 +391,7 @@ def get_employee_shift(
 	for_timestamp: datetime = None,
 	consider_default_shift: bool = False,
 	next_shift_direction: str = None,
+	timeline=None,
 ) -> Dict:
 	"""Returns a Shift Type for the given employee on the given date
 
@@ -394,21 +399,26 @@ def get_employee_shift(
 	:param for_timestamp: DateTime on which shift is required
 	:param consider_default_shift: If set to true, default shift is taken when no shift assignment is found.
 	:param next_shift_direction: One of: None, 'forward', 'reverse'. Direction to look for next shift if shift not found on given date.
+	:param timeline: (optional) `ShiftTimeline` of the employee to read shift assignments from instead of the database.
 	"""
 	if for_timestamp is None:
 		for_timestamp = now_datetime()
 
-	shift_details = get_shift_for_timestamp(employee, for_timestamp)
+	shift_details = get_shift_for_timestamp(employee, for_timestamp, timeline)
 
 	# if shift assignment is not found, consider default shift
-	default_shift = frappe.db.get_value("Employee", employee, "default_shift", cache=True)
+	default_shift = (
+		timeline.default_shift
+		if timeline
+		else frappe.db.get_value("Employee", employee, "default_shift", cache=True)
+	)
 	if not shift_details and consider_default_shift:
 		shift_details = get_shift_details(default_shift, for_timestamp)
 
 	# if no shift is found, find next or prev shift assignment based on direction
 	if not shift_details and next_shift_direction:
 		shift_details = get_prev_or_next_shift(
-			employee, for_timestamp, consider_default_shift, default_shift, next_shift_direction
+			employee, for_timestamp, consider_default_shift, default_shift, next_shift_direction, timeline
 		)
 
 	return shift_details or {}
@@ -420,6 +430,7 @@ def get_prev_or_next_shift(
 	consider_default_shift: bool,
 	default_shift: str,
 	next_shift_direction: str,
+	timeline=None,
 ) -> Dict:
 	"""Returns a dict of shift details for the next or prev shift based on the next_shift_direction"""
 	MAX_DAYS = 366
@@ -429,25 +440,30 @@ def get_prev_or_next_shift(
 		direction = -1 if next_shift_direction == "reverse" else 1
 		for i in range(MAX_DAYS):
 			date = for_timestamp + timedelta(days=direction * (i + 1))
-			shift_details = get_employee_shift(employee, date, consider_default_shift, None)
+			shift_details = get_employee_shift(employee, date, consider_default_shift, None, timeline)
 			if shift_details:
 				return shift_details
 	else:
-		direction = "<" if next_shift_direction == "reverse" else ">"
-		sort_order = "desc" if next_shift_direction == "reverse" else "asc"
-		shift_dates = frappe.get_all(
-			"Shift Assignment",
-			["start_date", "end_date"],
-			{
-				"employee": employee,
-				"start_date": (direction, for_timestamp.date()),
-				"docstatus": 1,
-				"status": "Active",
-			},
-			as_list=True,
-			limit=MAX_DAYS,
-			order_by="start_date " + sort_order,
-		)
+		if timeline:
+			shift_dates = timeline.get_assignment_dates(
+				for_timestamp.date(), next_shift_direction, MAX_DAYS
+			)
+		else:
+			direction = "<" if next_shift_direction == "reverse" else ">"
+			sort_order = "desc" if next_shift_direction == "reverse" else "asc"
+			shift_dates = frappe.get_all(
+				"Shift Assignment",
+				["start_date", "end_date"],
+				{
+					"employee": employee,
+					"start_date": (direction, for_timestamp.date()),
+					"docstatus": 1,
+					"status": "Active",
+				},
+				as_list=True,
+				limit=MAX_DAYS,
+				order_by="start_date " + sort_order,
+			)
 
 		for date_range in shift_dates:
 			# midnight shifts will span more than a day
@@ -456,7 +472,11 @@ def get_prev_or_next_shift(
 
 			for dt in generate_date_range(start_date, end_date, reverse=reverse):
 				shift_details = get_employee_shift(
-					employee, datetime.combine(dt, for_timestamp.time()), consider_default_shift, None
+					employee,
+					datetime.combine(dt, for_timestamp.time()),
+					consider_default_shift,
+					None,
+					timeline,
 				)
 				if shift_details:
 					return shift_details
@@ -465,7 +485,7 @@ def get_prev_or_next_shift(
 
 
 def get_employee_shift_timings(
-	employee: str, for_timestamp: datetime = None, consider_default_shift: bool = False
+	employee: str, for_timestamp: datetime = None, consider_default_shift: bool = False, timeline=None
 ) -> List[Dict]:
 	"""Returns previous shift, current/upcoming shift, next_shift for the given timestamp and employee"""
 	if for_timestamp is None:
@@ -473,19 +493,23 @@ def get_employee_shift_timings(
 
 	# write and verify a test case for midnight shift.
 	prev_shift = curr_shift = next_shift = None
-	curr_shift = get_employee_shift(employee, for_timestamp, consider_default_shift, "forward")
+	curr_shift = get_employee_shift(
+		employee, for_timestamp, consider_default_shift, "forward", timeline
+	)
 	if curr_shift:
 		next_shift = get_employee_shift(
 			employee,
 			curr_shift.start_datetime + timedelta(days=1),
 			consider_default_shift,
 			"forward",
+			timeline,
 		)
 	prev_shift = get_employee_shift(
 		employee,
 		(curr_shift.end_datetime if curr_shift else for_timestamp) + timedelta(days=-1),
 		consider_default_shift,
 		"reverse",
+		timeline,
 	)
 
 	if curr_shift:
@@ -517,7 +541,7 @@ def get_employee_shift_timings(
 
 
 def get_actual_start_end_datetime_of_shift(
-	employee: str, for_timestamp: datetime, consider_default_shift: bool = False
+	employee: str, for_timestamp: datetime, consider_default_shift: bool = False, timeline=None
 ) -> Dict:
 	"""Returns a Dict containing shift details with actual_start and actual_end datetime values
 	Here 'actual' means taking into account the "begin_check_in_before_shift_start_time" and "allow_check_out_after_shift_end_time".
@@ -527,9 +551,11 @@ def get_actual_start_end_datetime_of_shift(
 	:param for_timestamp (datetime, optional): Datetime value of checkin, if not provided considers current datetime
 	:param consider_default_shift (bool, optional): Flag (defaults to False) to specify whether to consider
 	default shift in employee master if no shift assignment is found
+	:param timeline (ShiftTimeline, optional): Shift timeline of the employee to read shift assignments from
+	instead of the database
 	"""
 	shift_timings_as_per_timestamp = get_employee_shift_timings(
-		employee, for_timestamp, consider_default_shift
+		employee, for_timestamp, consider_default_shift, timeline
 	)
 	return get_exact_shift(shift_timings_as_per_timestamp, for_timestamp)
 
@@ -0,0 +1,176 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+import frappe
+from frappe.utils import add_days
+
+from hrms.hr.doctype.shift_assignment.shift_assignment import (
+	get_actual_start_end_datetime_of_shift,
+)
+
+SHIFT_TIMELINE_CACHE_KEY = "shift_timeline"
+SHIFT_TIMELINE_VERSION_KEY = "shift_timeline_version"
+# bounds how long an outdated timeline cached despite the version check is served
+SHIFT_TIMELINE_CACHE_EXPIRY = 60 * 60
+MAX_CACHED_SHIFT_INTERVALS = 400
+
+
+class ShiftTimeline:
+	"""Active shift assignments and default shift of an employee, cached to resolve check-in shifts
+	without querying the database.
+
+	Shifts resolved for a timestamp are kept as intervals sorted by their actual start (with margins),
+	so later timestamps within the same shift are resolved with a bisect.
+
+	Timelines are cached along with the version of the cache they were read with, timelines without
+	a version (built outside `get_shift_timeline`) are not cached.
+	"""
+
+	def __init__(self, employee: str, data: dict):
+		self.employee = employee
+		self.default_shift = data["default_shift"]
+		self.assignments = data["assignments"]
+		self.intervals = data["intervals"]
+		self.version = data.get("version")
+
+		self.start_dates = [assignment.start_date for assignment in self.assignments]
+		self.interval_starts = [interval.actual_start for interval in self.intervals]
+
+	def as_dict(self) -> dict:
+		return {
+			"default_shift": self.default_shift,
+			"assignments": self.assignments,
+			"intervals": self.intervals,
+			"version": self.version,
+		}
+
+	def get_actual_start_end_datetime_of_shift(self, for_timestamp: datetime) -> dict:
+		"""Same as `get_actual_start_end_datetime_of_shift(employee, for_timestamp, True)`"""
+		index = bisect_right(self.interval_starts, for_timestamp) - 1
+		if index >= 0 and for_timestamp <= self.intervals[index].actual_end:
+			return frappe._dict(self.intervals[index])
+
+		shift = get_actual_start_end_datetime_of_shift(self.employee, for_timestamp, True, timeline=self)
+		if shift:
+			self.add_interval(shift)
+
+		return shift
+
+	def add_interval(self, shift: dict) -> None:
+		# drop intervals resolved before the shift configuration around this one changed
+		for index in reversed(range(len(self.intervals))):
+			interval = self.intervals[index]
+			if interval.actual_start <= shift.actual_end and shift.actual_start <= interval.actual_end:
+				del self.intervals[index]
+				del self.interval_starts[index]
+
+		index = bisect_right(self.interval_starts, shift.actual_start)
+		self.intervals.insert(index, frappe._dict(shift))
+		self.interval_starts.insert(index, shift.actual_start)
+
+		if len(self.intervals) > MAX_CACHED_SHIFT_INTERVALS:
+			# keep the latest shifts, punches mostly arrive for recent shifts
+			del self.intervals[0]
+			del self.interval_starts[0]
+
+		if self.version is not None:
+			cache_shift_timeline(self.employee, self.as_dict())
+
+	def get_shifts_for_date(self, for_timestamp: datetime) -> list[dict]:
+		"""Same as `get_shifts_for_date` in Shift Assignment, from the cached assignments"""
+		for_date = for_timestamp.date()
+		prev_day = add_days(for_date, -1)
+		next_day = add_days(for_date, 1)
+
+		return [
+			assignment
+			for assignment in self.assignments[: bisect_right(self.start_dates, next_day)]
+			if not assignment.end_date or prev_day <= assignment.end_date
+		]
+
+	def get_assignment_dates(self, for_date, direction: str, limit: int) -> list[tuple]:
+		"""Returns (start date, end date) of the assignments starting before or after the date,
+		closest first"""
+		if direction == "reverse":
+			assignments = self.assignments[: bisect_left(self.start_dates, for_date)][::-1]
+		else:
+			assignments = self.assignments[bisect_right(self.start_dates, for_date) :]
+
+		return [(assignment.start_date, assignment.end_date) for assignment in assignments[:limit]]
+
+
+def get_shift_timeline(employee: str) -> ShiftTimeline:
+	# read before the database, so that changes committed meanwhile are detected before caching
+	version = get_shift_timeline_version(employee)
+	default_shift = frappe.db.get_value("Employee", employee, "default_shift")
+	data = frappe.cache().get_value(get_shift_timeline_cache_key(employee))
+
+	# the default shift can also be changed without doc events, e.g. via `frappe.db.set_value`
+	if data is None or data["default_shift"] != default_shift or data["version"] != version:
+		data = {
+			"default_shift": default_shift,
+			"assignments": frappe.get_all(
+				"Shift Assignment",
+				filters={"employee": employee, "docstatus": 1, "status": "Active"},
+				fields=["name", "shift_type", "start_date", "end_date"],
+				order_by="start_date asc",
+			),
+			"intervals": [],
+			"version": version,
+		}
+		cache_shift_timeline(employee, data)
+
+	return ShiftTimeline(employee, data)
+
+
+def cache_shift_timeline(employee: str, data: dict) -> None:
+	# a timeline read before a change was committed is outdated once the change clears the cache,
+	# it is left for the next read to rebuild instead of overwriting the cleared cache
+	if get_shift_timeline_version(employee) != data["version"]:
+		return
+
+	frappe.cache().set_value(
+		get_shift_timeline_cache_key(employee), data, expires_in_sec=SHIFT_TIMELINE_CACHE_EXPIRY
+	)
+
+
+def get_shift_timeline_version(employee: str) -> tuple:
+	"""Returns the versions of all timelines and of the employee's timeline,
+	both are changed whenever the cache is cleared"""
+	return (
+		frappe.cache().get_value(SHIFT_TIMELINE_VERSION_KEY),
+		frappe.cache().get_value(f"{SHIFT_TIMELINE_VERSION_KEY}|{employee}"),
+	)
+
+
+def get_shift_timeline_cache_key(employee: str) -> str:
+	return f"{SHIFT_TIMELINE_CACHE_KEY}|{employee}"
+
+
+def clear_shift_timeline_cache(employee: str | None = None) -> None:
+	if employee:
+		frappe.cache().set_value(f"{SHIFT_TIMELINE_VERSION_KEY}|{employee}", frappe.generate_hash())
+		frappe.cache().delete_value(get_shift_timeline_cache_key(employee))
+	else:
+		frappe.cache().set_value(SHIFT_TIMELINE_VERSION_KEY, frappe.generate_hash())
+		frappe.cache().delete_keys(f"{SHIFT_TIMELINE_CACHE_KEY}|")
+
+
+def invalidate_shift_timeline(doc, method=None):
+	"""Clears cached shift timelines affected by changes in Shift Assignment, Shift Type or Employee"""
+	if doc.doctype == "Shift Type":
+		# shift timings of every resolved interval may have changed
+		employee = None
+	elif doc.doctype == "Employee":
+		employee = doc.name
+	else:
+		employee = doc.employee
+
+	clear_shift_timeline_cache(employee)
+
+	# timelines cached by other workers before this transaction ends, or with changes that get rolled back
+	frappe.db.after_commit.add(lambda: clear_shift_timeline_cache(employee))
+	frappe.db.after_rollback.add(lambda: clear_shift_timeline_cache(employee))
@@ -0,0 +1,498 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Set based auto attendance for Shift Types with `process_attendance_in_bulk` enabled.
+
+Attendance outcomes are computed in memory from prefetched employees, holidays, attendance,
+leaves and shift assignments. Outcomes that are known to pass `Attendance.validate` are written
+with one multi-row INSERT per batch and their check-ins are linked with one UPDATE. Everything
+else (existing attendance on the date, leaves, inactive employees, etc.) falls back to the per
+document path, so both paths produce the same records.
+"""
+
+import itertools
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, create_batch, get_datetime, get_time, getdate, today
+
+from hrms.api import clear_home_data_cache_for_users
+from hrms.hr.doctype.attendance.attendance import mark_attendance
+from hrms.hr.doctype.employee_checkin.employee_checkin import mark_attendance_and_link_log
+from hrms.hr.doctype.shift_assignment.shift_assignment import (
+	get_employee_shift,
+	get_shift_details,
+	get_shift_for_time,
+)
+from hrms.hr.doctype.shift_assignment.shift_timeline import ShiftTimeline
+from hrms.utils import get_date_range
+from hrms.utils.bulk_insert import prepare_document, run_post_insert_methods, write_documents
+from hrms.utils.holiday_list import get_holiday_dates_between
+
+BULK_EMPLOYEE_CHUNK_SIZE = 500
+BULK_INSERT_BATCH_SIZE = 200
+
+
+class BulkAutoAttendance:
+	def __init__(self, shift_type):
+		self.shift_type = shift_type
+		self.pending = []
+		self.holiday_dates = {}
+
+	def process(self):
+		self.mark_attendance_for_checkins()
+
+		# commit after processing checkin logs to avoid losing progress
+		frappe.db.commit()  # nosemgrep
+
+		assigned_employees = self.shift_type.get_assigned_employees(
+			self.shift_type.process_attendance_after, True
+		)
+
+		for batch in create_batch(assigned_employees, BULK_EMPLOYEE_CHUNK_SIZE):
+			self.mark_absent_for_dates_with_no_attendance(batch)
+			frappe.db.commit()  # nosemgrep
+
+	def mark_attendance_for_checkins(self):
+		groups = [
+			(key[0], key[1].date(), list(group))
+			for key, group in itertools.groupby(
+				self.shift_type.get_employee_checkins(), key=lambda x: (x["employee"], x["shift_start"])
+			)
+		]
+		if not groups:
+			return
+
+		employees = {group[0] for group in groups}
+		dates = [attendance_date for _employee, attendance_date, _logs in groups]
+		self.load_employees(list(employees))
+		self.load_context(employees, min(dates), max(dates))
+
+		for employee, attendance_date, logs in groups:
+			if not self.should_mark_attendance(employee, attendance_date):
+				continue
+
+			(
+				attendance_status,
+				working_hours,
+				late_entry,
+				early_exit,
+				in_time,
+				out_time,
+			) = self.shift_type.get_attendance(logs)
+
+			if self.can_insert_directly(employee, attendance_date):
+				self.add_pending_attendance(
+					employee,
+					attendance_date,
+					{
+						"status": attendance_status,
+						"working_hours": working_hours,
+						"late_entry": late_entry,
+						"early_exit": early_exit,
+						"in_time": in_time,
+						"out_time": out_time,
+					},
+					comment=_("Employee was marked Absent for not meeting the working hours threshold.")
+					if attendance_status == "Absent"
+					else None,
+					logs=logs,
+				)
+			else:
+				# flush first so that validations see the attendance marked so far
+				self.insert_pending_attendance()
+				mark_attendance_and_link_log(
+					logs,
+					attendance_status,
+					attendance_date,
+					working_hours,
+					late_entry,
+					early_exit,
+					in_time,
+					out_time,
+					self.shift_type.name,
+				)
+
+			self.record_attendance(employee, attendance_date)
+
+		self.insert_pending_attendance()
+
+	def mark_absent_for_dates_with_no_attendance(self, employees: list[str]):
+		"""Same as `ShiftType.mark_absent_for_dates_with_no_attendance` for a batch of employees"""
+		self.load_employees(employees)
+		periods = self.get_start_and_end_dates(employees)
+		if not periods:
+			return
+
+		from_date = min(period[0] for period in periods.values())
+		to_date = max(period[1] for period in periods.values())
+		self.load_context(set(periods), from_date, to_date, load_shift_assignments=True)
+
+		start_time = get_time(self.shift_type.start_time)
+		for employee, (start_date, end_date) in periods.items():
+			holiday_dates = self.get_holiday_dates(self.get_holiday_list(employee), from_date, to_date)
+
+			for date in get_date_range(start_date, end_date):
+				if date in holiday_dates or self.has_attendance_for_shift(employee, date):
+					continue
+
+				shift_details = self.get_employee_shift(employee, datetime.combine(date, start_time))
+				if not shift_details or shift_details.shift_type.name != self.shift_type.name:
+					continue
+
+				comment = _("Employee was marked Absent due to missing Employee Checkins.")
+				if self.can_insert_directly(employee, date):
+					self.add_pending_attendance(employee, date, {"status": "Absent"}, comment=comment)
+				else:
+					self.insert_pending_attendance()
+					attendance = mark_attendance(employee, date, "Absent", self.shift_type.name)
+					if attendance:
+						frappe.get_doc(
+							{
+								"doctype": "Comment",
+								"comment_type": "Comment",
+								"reference_doctype": "Attendance",
+								"reference_name": attendance,
+								"content": comment,
+							}
+						).insert(ignore_permissions=True)
+
+				self.record_attendance(employee, date)
+
+		self.insert_pending_attendance()
+
+	def load_employees(self, employees: list[str]):
+		self.employees = {
+			employee.name: employee
+			for employee in frappe.get_all(
+				"Employee",
+				filters={"name": ("in", employees)},
+				fields=[
+					"name",
+					"employee_name",
+					"company",
+					"department",
+					"status",
+					"date_of_joining",
+					"relieving_date",
+					"creation",
+					"default_shift",
+					"holiday_list",
+					"user_id",
+				],
+			)
+		}
+
+		companies = {details.company for details in self.employees.values()}
+		self.default_holiday_lists = dict(
+			frappe.get_all(
+				"Company",
+				filters={"name": ("in", list(companies))},
+				fields=["name", "default_holiday_list"],
+				as_list=True,
+			)
+		)
+
+	def load_context(self, employees: set, from_date, to_date, load_shift_assignments=False):
+		"""Fetches attendance, leaves and shift assignments of the employees, one query each"""
+		employees = list(employees)
+		Attendance = frappe.qb.DocType("Attendance")
+		self.marked_attendance = defaultdict(list)
+		self.attendance_for_shift = set()
+		for attendance in (
+			frappe.qb.from_(Attendance)
+			.select(
+				Attendance.employee,
+				Attendance.attendance_date,
+				Attendance.shift,
+				# same condition as `ShiftType.get_marked_attendance_dates_between`, evaluated by the database
+				frappe.qb.terms.Case()
+				.when(Attendance.shift.isnull() | (Attendance.shift == self.shift_type.name), 1)
+				.else_(0)
+				.as_("for_shift"),
+			)
+			.where(
+				(Attendance.employee.isin(employees))
+				& (Attendance.docstatus < 2)
+				& (Attendance.attendance_date.between(from_date, to_date))
+			)
+		).run(as_dict=True):
+			key = (attendance.employee, getdate(attendance.attendance_date))
+			self.marked_attendance[key].append(attendance.shift)
+			if attendance.for_shift:
+				self.attendance_for_shift.add(key)
+
+		self.leaves = defaultdict(list)
+		for leave in frappe.get_all(
+			"Leave Application",
+			filters={
+				"employee": ("in", employees),
+				"status": "Approved",
+				"docstatus": 1,
+				"from_date": ("<=", to_date),
+				"to_date": (">=", from_date),
+			},
+			fields=["employee", "from_date", "to_date"],
+		):
+			self.leaves[leave.employee].append((getdate(leave.from_date), getdate(leave.to_date)))
+
+		self.shift_assignments = defaultdict(list)
+		if load_shift_assignments:
+			# same window as `get_shifts_for_date`, which also considers the previous and next day
+			ShiftAssignment = frappe.qb.DocType("Shift Assignment")
+			for assignment in (
+				frappe.qb.from_(ShiftAssignment)
+				.select(
+					ShiftAssignment.name,
+					ShiftAssignment.employee,
+					ShiftAssignment.shift_type,
+					ShiftAssignment.start_date,
+					ShiftAssignment.end_date,
+				)
+				.where(
+					(ShiftAssignment.employee.isin(employees))
+					& (ShiftAssignment.docstatus == 1)
+					& (ShiftAssignment.status == "Active")
+					& (ShiftAssignment.start_date <= add_days(to_date, 1))
+					& (
+						(ShiftAssignment.end_date.isnull())
+						| (ShiftAssignment.end_date >= add_days(from_date, -1))
+					)
+				)
+			).run(as_dict=True):
+				self.shift_assignments[assignment.employee].append(assignment)
+
+	def get_start_and_end_dates(self, employees: list[str]) -> dict[str, tuple]:
+		"""Same as `ShiftType.get_start_and_end_dates` for a batch of employees, returns
+		{employee: (start date, end date)} for the employees with dates to check"""
+		last_sync = get_datetime(self.shift_type.last_sync_of_checkin)
+		shift_details = get_shift_details(self.shift_type.name, last_sync)
+		last_shift_time = shift_details.actual_end if shift_details else last_sync
+		timelines = self.get_shift_timelines(employees, last_shift_time.date())
+
+		periods = {}
+		for employee in employees:
+			details = self.employees.get(employee)
+			if not details:
+				continue
+
+			date_of_joining = details.date_of_joining or details.creation.date()
+			start_date = max(getdate(self.shift_type.process_attendance_after), date_of_joining)
+
+			prev_shift = get_employee_shift(
+				employee,
+				last_shift_time - timedelta(days=1),
+				True,
+				"reverse",
+				timeline=timelines[employee],
+			)
+			if not prev_shift or prev_shift.shift_type.name != self.shift_type.name:
+				continue
+
+			end_date = prev_shift.start_datetime.date()
+			if details.relieving_date:
+				end_date = min(end_date, details.relieving_date)
+
+			if start_date <= end_date:
+				periods[employee] = (start_date, end_date)
+
+		return periods
+
+	def get_shift_timelines(self, employees: list[str], to_date) -> dict[str, ShiftTimeline]:
+		"""Shift timelines of the employees built from one query, without going through the cache"""
+		assignments = defaultdict(list)
+		for assignment in frappe.get_all(
+			"Shift Assignment",
+			filters={
+				"employee": ("in", employees),
+				"docstatus": 1,
+				"status": "Active",
+				"start_date": ("<=", add_days(to_date, 1)),
+			},
+			fields=["name", "employee", "shift_type", "start_date", "end_date"],
+			order_by="start_date asc",
+		):
+			assignments[assignment.employee].append(assignment)
+
+		return {
+			employee: ShiftTimeline(
+				employee,
+				{
+					"default_shift": self.employees[employee].default_shift,
+					"assignments": assignments[employee],
+					"intervals": [],
+				},
+			)
+			for employee in employees
+			if employee in self.employees
+		}
+
+	def get_holiday_list(self, employee: str) -> str | None:
+		"""Same as `ShiftType.get_holiday_list` from the prefetched employee and company details"""
+		if self.shift_type.holiday_list:
+			return self.shift_type.holiday_list
+
+		details = self.employees.get(employee)
+		if not details:
+			return self.shift_type.get_holiday_list(employee)
+
+		return details.holiday_list or self.default_holiday_lists.get(details.company)
+
+	def get_holiday_dates(self, holiday_list: str, from_date, to_date) -> set:
+		key = (holiday_list, from_date, to_date)
+		if key not in self.holiday_dates:
+			self.holiday_dates[key] = (
+				{getdate(date) for date in get_holiday_dates_between(holiday_list, from_date, to_date)}
+				if holiday_list
+				else set()
+			)
+
+		return self.holiday_dates[key]
+
+	def should_mark_attendance(self, employee: str, attendance_date) -> bool:
+		"""Same as `ShiftType.should_mark_attendance`, with holidays fetched once per holiday list"""
+		if self.shift_type.mark_auto_attendance_on_holidays:
+			return True
+
+		holiday_list = self.get_holiday_list(employee)
+		return attendance_date not in self.get_holiday_dates(
+			holiday_list, attendance_date.replace(month=1, day=1), attendance_date.replace(month=12, day=31)
+		)
+
+	def can_insert_directly(self, employee: str, attendance_date) -> bool:
+		"""Returns True if the attendance would pass `Attendance.validate` without changes"""
+		details = self.employees.get(employee)
+		if not details or details.status == "Inactive":
+			return False
+
+		if attendance_date > getdate(today()):
+			return False
+
+		if details.date_of_joining and attendance_date < getdate(details.date_of_joining):
+			return False
+
+		# duplicate and overlapping shift checks depend on the other shift, leave those to validate
+		if self.marked_attendance.get((employee, attendance_date)):
+			return False
+
+		# leaves change the status of the attendance
+		return not any(
+			from_date <= attendance_date <= to_date for from_date, to_date in self.leaves.get(employee, [])
+		)
+
+	def has_attendance_for_shift(self, employee: str, attendance_date) -> bool:
+		return (employee, attendance_date) in self.attendance_for_shift
+
+	def record_attendance(self, employee: str, attendance_date) -> None:
+		self.marked_attendance[(employee, attendance_date)].append(self.shift_type.name)
+		self.attendance_for_shift.add((employee, attendance_date))
+
+	def get_employee_shift(self, employee: str, for_timestamp: datetime) -> dict:
+		"""Same as `get_employee_shift(employee, for_timestamp, True)` with prefetched shift assignments"""
+		for_date = for_timestamp.date()
+		prev_day = add_days(for_date, -1)
+		next_day = add_days(for_date, 1)
+
+		shifts = [
+			assignment
+			for assignment in self.shift_assignments.get(employee, [])
+			if assignment.start_date <= next_day and (not assignment.end_date or prev_day <= assignment.end_date)
+		]
+		shift_details = get_shift_for_time(shifts, for_timestamp) if shifts else {}
+
+		if not shift_details:
+			shift_details = get_shift_details(self.employees[employee].default_shift, for_timestamp)
+
+		return shift_details or {}
+
+	def add_pending_attendance(self, employee: str, attendance_date, values: dict, comment=None, logs=None):
+		details = self.employees[employee]
+		attendance = frappe.get_doc(
+			{
+				"doctype": "Attendance",
+				"employee": employee,
+				"employee_name": details.employee_name,
+				"company": details.company,
+				"department": details.department,
+				"attendance_date": attendance_date,
+				"shift": self.shift_type.name,
+				"docstatus": 1,
+				**values,
+			}
+		)
+		attendance.flags.ignore_permissions = True
+		prepare_document(attendance)
+
+		self.pending.append(frappe._dict(attendance=attendance, comment=comment, logs=logs or []))
+
+		if len(self.pending) >= BULK_INSERT_BATCH_SIZE:
+			self.insert_pending_attendance()
+
+	def insert_pending_attendance(self):
+		"""Writes pending attendance with their comments and links the check-ins"""
+		if not self.pending:
+			return
+
+		documents = [row.attendance for row in self.pending]
+		for row in self.pending:
+			if row.comment:
+				documents.append(get_attendance_comment(row.attendance, row.comment))
+
+		write_documents(documents)
+		link_attendance_in_checkins(
+			{row.attendance.name: [log.name for log in row.logs] for row in self.pending if row.logs}
+		)
+
+		for row in self.pending:
+			run_post_insert_methods(row.attendance)
+
+		clear_home_data_cache_for_users(
+			self.employees[row.attendance.employee].user_id for row in self.pending
+		)
+		self.pending = []
+
+
+def get_attendance_comment(attendance, text: str):
+	"""Returns a Comment ready for bulk insert and sets it in `_comments` of the attendance,
+	like `Comment.on_update` does for comments inserted one by one"""
+	comment = frappe.get_doc(
+		{
+			"doctype": "Comment",
+			"comment_type": "Comment",
+			"comment_email": frappe.session.user,
+			"reference_doctype": "Attendance",
+			"reference_name": attendance.name,
+			"content": text,
+		}
+	)
+	comment.flags.ignore_permissions = True
+	comment._set_defaults()
+	comment.set_user_and_timestamp()
+	comment.set_new_name()
+
+	attendance._comments = json.dumps([{"comment": text, "by": comment.comment_email, "name": comment.name}])
+
+	return comment
+
+
+def link_attendance_in_checkins(logs_by_attendance: dict[str, list[str]]):
+	if not logs_by_attendance:
+		return
+
+	EmployeeCheckin = frappe.qb.DocType("Employee Checkin")
+	attendance = frappe.qb.terms.Case()
+	for attendance_name, log_names in logs_by_attendance.items():
+		attendance = attendance.when(EmployeeCheckin.name.isin(log_names), attendance_name)
+
+	(
+		frappe.qb.update(EmployeeCheckin)
+		.set(EmployeeCheckin.attendance, attendance)
+		.where(EmployeeCheckin.name.isin(list(itertools.chain(*logs_by_attendance.values()))))
+	).run()
+
+
+def process_auto_attendance_in_bulk(shift_type):
+	BulkAutoAttendance(shift_type).process()
@@ -18,6 +18,7 @@ from hrms.hr.doctype.employee_checkin.employee_checkin import (
 	mark_attendance_and_link_log,
 )
 from hrms.hr.doctype.shift_assignment.shift_assignment import get_employee_shift, get_shift_details
+from hrms.hr.doctype.shift_type.bulk_auto_attendance import process_auto_attendance_in_bulk
 from hrms.utils import get_date_range
 from hrms.utils.holiday_list import get_holiday_dates_between
 
@@ -34,6 +35,10 @@ class ShiftType(Document):
 		):
 			return
 
+		if cint(self.process_attendance_in_bulk):
+			process_auto_attendance_in_bulk(self)
+			return
+
 		logs = self.get_employee_checkins()
 
 		for key, group in itertools.groupby(logs, key=lambda x: (x["employee"], x["shift_start"])):
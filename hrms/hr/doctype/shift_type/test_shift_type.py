@@ -10,6 +10,7 @@ from erpnext.setup.doctype.employee.test_employee import make_employee
 from erpnext.setup.doctype.holiday_list.test_holiday_list import set_holiday_list
 
 from hrms.hr.doctype.leave_application.test_leave_application import get_first_sunday
+from hrms.hr.doctype.shift_assignment.shift_timeline import clear_shift_timeline_cache
 from hrms.payroll.doctype.salary_slip.test_salary_slip import make_holiday_list
 from hrms.tests.test_utils import add_date_to_holiday_list
 
@@ -20,6 +21,7 @@ class TestShiftType(FrappeTestCase):
 		frappe.db.delete("Shift Assignment")
 		frappe.db.delete("Employee Checkin")
 		frappe.db.delete("Attendance")
+		clear_shift_timeline_cache()
 
 		from_date = get_year_start(getdate())
 		to_date = get_year_ending(getdate())
@@ -593,6 +595,63 @@ class TestShiftType(FrappeTestCase):
 		self.assertEqual(log_in.skip_auto_attendance, 1)
 		self.assertEqual(log_out.skip_auto_attendance, 1)
 
+	def test_process_attendance_in_bulk(self):
+		from hrms.hr.doctype.attendance.attendance import mark_attendance
+		from hrms.hr.doctype.employee_checkin.test_employee_checkin import make_checkin
+
+		employee = make_employee("test_employee_checkin@example.com", company="_Test Company")
+		today = getdate()
+		yesterday = add_days(today, -1)
+		shift_type = setup_shift_type(
+			shift_type="Test Bulk Attendance",
+			process_attendance_after=add_days(today, -4),
+			last_sync_of_checkin=f"{today} 15:00:00",
+			process_attendance_in_bulk=1,
+		)
+		make_shift_assignment(shift_type.name, employee, add_days(today, -3))
+
+		# manually marked attendance is not overwritten
+		manual_attendance = mark_attendance(employee, add_days(today, -2), "Present")
+
+		log_in = make_checkin(employee, datetime.combine(yesterday, get_time("08:00:00")))
+		log_out = make_checkin(employee, datetime.combine(yesterday, get_time("12:00:00")))
+
+		shift_type.process_auto_attendance()
+
+		attendance = frappe.db.get_value(
+			"Attendance",
+			{"employee": employee, "attendance_date": yesterday, "docstatus": 1},
+			["name", "status", "shift", "employee_name", "company"],
+			as_dict=True,
+		)
+		self.assertEqual(attendance.status, "Present")
+		self.assertEqual(attendance.shift, shift_type.name)
+		self.assertEqual(attendance.company, "_Test Company")
+		self.assertEqual(frappe.db.get_value("Employee Checkin", log_in.name, "attendance"), attendance.name)
+		self.assertEqual(frappe.db.get_value("Employee Checkin", log_out.name, "attendance"), attendance.name)
+
+		absent = frappe.db.get_value(
+			"Attendance",
+			{"employee": employee, "attendance_date": add_days(today, -3), "docstatus": 1},
+			["name", "status"],
+			as_dict=True,
+		)
+		self.assertEqual(absent.status, "Absent")
+		self.assertTrue(
+			frappe.db.exists("Comment", {"reference_doctype": "Attendance", "reference_name": absent.name})
+		)
+
+		self.assertEqual(
+			frappe.get_all(
+				"Attendance", {"employee": employee, "attendance_date": add_days(today, -2)}, pluck="name"
+			),
+			[manual_attendance],
+		)
+
+		# processing again does not create duplicates
+		shift_type.process_auto_attendance()
+		self.assertEqual(frappe.db.count("Attendance", {"employee": employee}), 3)
+
 
 def setup_shift_type(**args):
 	args = frappe._dict(args)
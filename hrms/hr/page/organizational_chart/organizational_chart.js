@@ -9,11 +9,12 @@ frappe.pages['organizational-chart'].on_page_load = function(wrapper) {
 		frappe.require('hierarchy-chart.bundle.js', () => {
 			let organizational_chart;
 			let method = 'hrms.hr.page.organizational_chart.organizational_chart.get_children';
+			let all_nodes_method = 'hrms.hr.page.organizational_chart.organizational_chart.get_all_nodes';
 
 			if (frappe.is_mobile()) {
 				organizational_chart = new hrms.HierarchyChartMobile('Employee', wrapper, method);
 			} else {
-				organizational_chart = new hrms.HierarchyChart('Employee', wrapper, method);
+				organizational_chart = new hrms.HierarchyChart('Employee', wrapper, method, all_nodes_method);
 			}
 
 			frappe.breadcrumbs.add('HR');
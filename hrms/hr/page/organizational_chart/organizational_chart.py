@@ -1,20 +1,129 @@
+from collections import deque
+
 import frappe
 from frappe.query_builder.functions import Count
+from frappe.utils import cint
+
+ORG_CHART_CACHE_KEY = "org_chart"
+ORG_CHART_VERSION_KEY = "org_chart_version"
+# bounds how long an outdated tree cached despite the version check is served
+ORG_CHART_CACHE_EXPIRY = 60 * 60
+ORG_CHART_PAGE_LENGTH = 100
+ROOT_NODES = "__roots"
+TREE_BUILT = "__built"
 
 
 @frappe.whitelist()
-def get_children(parent=None, company=None, exclude_node=None):
-	filters = [["status", "=", "Active"]]
-	if company and company != "All Companies":
-		filters.append(["company", "=", company])
+def get_children(parent=None, company=None, exclude_node=None, start=0, page_length=0):
+	if not (parent and company and parent != company):
+		parent = None
+
+	employees = [child for child in get_child_nodes(company, parent) if child["id"] != exclude_node]
+
+	if cint(page_length):
+		employees = employees[cint(start) : cint(start) + cint(page_length)]
+
+	return [frappe._dict(employee) for employee in employees]
+
+
+@frappe.whitelist()
+def get_subtree(company, parent=None, start=0, page_length=ORG_CHART_PAGE_LENGTH, depth=1):
+	"""Returns a page of the children of `parent` (or of the root nodes) along with their total count.
+	With `depth` > 1, every node also has the first page of its own children nested up to that level,
+	the rest can be fetched lazily by calling this again with the node as `parent`"""
+	children = get_child_nodes(company, parent)
+	start, page_length = cint(start), cint(page_length) or ORG_CHART_PAGE_LENGTH
+
+	return {
+		"data": get_nodes(company, children[start : start + page_length], page_length, cint(depth) - 1),
+		"total": len(children),
+	}
+
+
+def get_nodes(company: str, employees: list[dict], page_length: int, depth: int) -> list[dict]:
+	nodes = []
+	for employee in employees:
+		node = frappe._dict(employee)
+
+		if depth > 0 and node.child_count:
+			children = get_child_nodes(company, node.id)
+			node.children = get_nodes(company, children[:page_length], page_length, depth - 1)
+
+		nodes.append(node)
+
+	return nodes
+
+
+@frappe.whitelist()
+def get_all_nodes(company):
+	"""Returns the children of every expandable node in the chart, in the format of
+	`hrms.utils.hierarchy_chart.get_all_nodes`, from the cached org tree"""
+	org_tree = get_org_tree(company)
+	result = []
+	nodes_to_expand = deque(org_tree.get(ROOT_NODES, []))
+
+	while nodes_to_expand:
+		parent = nodes_to_expand.popleft()
+		data = org_tree.get(parent["id"], [])
+		result.append(dict(parent=parent["id"], parent_name=parent["name"], data=data))
+		nodes_to_expand.extend(d for d in data if d["expandable"])
+
+	return result
+
+
+def get_child_nodes(company: str | None, parent: str | None = None) -> list[dict]:
+	"""Returns the cached nodes reporting to `parent`, or the root nodes without a parent.
+	Each parent's children are cached separately so that a page of the chart
+	does not have to load the whole tree from the cache"""
+	cache_key = get_org_chart_cache_key(company)
+	children = frappe.cache().hget(cache_key, parent or ROOT_NODES)
+	if children is not None:
+		return children
+
+	# employees without reports are not cached
+	if frappe.cache().hget(cache_key, TREE_BUILT):
+		return []
 
-	if parent and company and parent != company:
-		filters.append(["reports_to", "=", parent])
-	else:
-		filters.append(["reports_to", "=", ""])
+	return cache_org_tree(company).get(parent or ROOT_NODES, [])
 
-	if exclude_node:
-		filters.append(["name", "!=", exclude_node])
+
+def get_org_tree(company: str | None = None) -> dict:
+	"""Returns active employees of the company (or all companies) grouped by their manager:
+	{
+	        "__roots": [{"id": "HR-EMP-00001", "name": "Jane", "connections": 2, ...}],
+	        "HR-EMP-00001": [{"id": "HR-EMP-00002", ...}, {"id": "HR-EMP-00003", ...}],
+	}
+	"""
+	org_tree = frappe.cache().hgetall(get_org_chart_cache_key(company)) or {}
+	if not org_tree.get(TREE_BUILT):
+		org_tree = cache_org_tree(company)
+
+	return org_tree
+
+
+def cache_org_tree(company: str | None) -> dict:
+	cache_key = get_org_chart_cache_key(company)
+	# read before the database, so that changes committed meanwhile are detected before caching
+	version = frappe.cache().get_value(ORG_CHART_VERSION_KEY)
+	org_tree = build_org_tree(get_company_key(company))
+
+	# a tree built before a change was committed is outdated once the change clears the cache,
+	# it is left for the next read to rebuild instead of overwriting the cleared cache
+	if frappe.cache().get_value(ORG_CHART_VERSION_KEY) != version:
+		return org_tree
+
+	for parent, children in org_tree.items():
+		frappe.cache().hset(cache_key, parent, children)
+	frappe.cache().hset(cache_key, TREE_BUILT, 1)
+	frappe.cache().expire(frappe.cache().make_key(cache_key), ORG_CHART_CACHE_EXPIRY)
+
+	return org_tree
+
+
+def build_org_tree(company: str) -> dict:
+	filters = [["status", "=", "Active"]]
+	if company != "All Companies":
+		filters.append(["company", "=", company])
 
 	employees = frappe.get_all(
 		"Employee",
@@ -31,19 +140,60 @@ def get_children(parent=None, company=None, exclude_node=None):
 		order_by="name",
 	)
 
+	connections = get_connections([d.id for d in employees if cint(d.rgt) - cint(d.lft) > 1])
+	org_tree = {ROOT_NODES: []}
+
 	for employee in employees:
-		employee.connections = get_connections(employee.id, employee.lft, employee.rgt)
+		employee.connections = connections.get(employee.id, 0)
 		employee.expandable = bool(employee.connections)
+		org_tree.setdefault(employee.reports_to or ROOT_NODES, []).append(employee)
 
-	return employees
+	for employee in employees:
+		employee.child_count = len(org_tree.get(employee.id, []))
 
+	return org_tree
+
+
+def get_connections(employees: list[str]) -> dict[str, int]:
+	"""Returns the number of employees below each of the given employees in the reporting hierarchy"""
+	if not employees:
+		return {}
 
-def get_connections(employee: str, lft: int, rgt: int) -> int:
 	Employee = frappe.qb.DocType("Employee")
-	query = (
+	Descendant = frappe.qb.DocType("Employee").as_("descendant")
+
+	connections = (
 		frappe.qb.from_(Employee)
-		.select(Count(Employee.name))
-		.where((Employee.lft > lft) & (Employee.rgt < rgt))
+		.join(Descendant)
+		.on((Descendant.lft > Employee.lft) & (Descendant.rgt < Employee.rgt))
+		.select(Employee.name, Count(Descendant.name))
+		.where(Employee.name.isin(employees))
+		.groupby(Employee.name)
 	).run()
 
-	return query[0][0]
+	return dict(connections)
+
+
+def get_company_key(company: str | None) -> str:
+	if not company or company == "All Companies":
+		return "All Companies"
+
+	return company
+
+
+def get_org_chart_cache_key(company: str | None) -> str:
+	return f"{ORG_CHART_CACHE_KEY}|{get_company_key(company)}"
+
+
+def clear_org_chart_cache() -> None:
+	"""Clears cached org trees of all companies, since a change in reporting lines
+	can move employees across companies and shift the nested set of the whole tree"""
+	frappe.cache().set_value(ORG_CHART_VERSION_KEY, frappe.generate_hash())
+	frappe.cache().delete_keys(f"{ORG_CHART_CACHE_KEY}|")
+
+
+def invalidate_org_chart_cache(doc, method=None):
+	clear_org_chart_cache()
+	# trees cached by other workers before this transaction ends, or with changes that get rolled back
+	frappe.db.after_commit.add(clear_org_chart_cache)
+	frappe.db.after_rollback.add(clear_org_chart_cache)
@@ -1,12 +1,21 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
 from erpnext.setup.doctype.employee.test_employee import make_employee
 
-from hrms.hr.page.organizational_chart.organizational_chart import get_children
+from hrms.hr.page.organizational_chart.organizational_chart import (
+	build_org_tree,
+	clear_org_chart_cache,
+	get_all_nodes,
+	get_children,
+	get_org_chart_cache_key,
+	get_subtree,
+)
 from hrms.tests.test_utils import create_company
 
 
@@ -14,6 +23,7 @@ class TestOrganizationalChart(FrappeTestCase):
 	def setUp(self):
 		self.company = create_company("Test Org Chart").name
 		frappe.db.delete("Employee", {"company": self.company})
+		clear_org_chart_cache()
 
 	def test_get_children(self):
 		company = create_company("Test Org Chart").name
@@ -31,7 +41,63 @@ class TestOrganizationalChart(FrappeTestCase):
 		# root's children
 		children = get_children(parent=emp1, company=self.company)
 		self.assertEqual(len(children), 2)
+		# children are cached per parent
+		cached_children = frappe.cache().hget(get_org_chart_cache_key(self.company), emp1)
+		self.assertEqual([d.id for d in cached_children], [emp2, emp3])
+		self.assertEqual(get_children(parent=emp3, company=self.company), [])
 		self.assertEqual(children[0].id, emp2)
 		self.assertEqual(children[0].connections, 1)
 		self.assertEqual(children[1].id, emp3)
 		self.assertEqual(children[1].connections, 0)
+
+	def test_get_subtree_and_all_nodes(self):
+		emp1 = make_employee("testemp1@mail.com", company=self.company)
+		emp2 = make_employee("testemp2@mail.com", company=self.company, reports_to=emp1)
+		emp3 = make_employee("testemp3@mail.com", company=self.company, reports_to=emp1)
+		emp4 = make_employee("testemp4@mail.com", company=self.company, reports_to=emp2)
+
+		# paged children of the root with the first level of their own children
+		subtree = get_subtree(self.company, parent=emp1, page_length=1, depth=2)
+		self.assertEqual(subtree["total"], 2)
+		self.assertEqual(len(subtree["data"]), 1)
+		self.assertEqual(subtree["data"][0].id, emp2)
+		self.assertEqual(subtree["data"][0].child_count, 1)
+		self.assertEqual(subtree["data"][0].children[0].id, emp4)
+
+		subtree = get_subtree(self.company, parent=emp1, start=1, page_length=1)
+		self.assertEqual(subtree["data"][0].id, emp3)
+		self.assertNotIn("children", subtree["data"][0])
+
+		nodes = {d["parent"]: [child.id for child in d["data"]] for d in get_all_nodes(self.company)}
+		self.assertEqual(nodes, {emp1: [emp2, emp3], emp2: [emp4]})
+
+		# cached tree is invalidated when reporting lines change
+		employee = frappe.get_doc("Employee", emp4)
+		employee.reports_to = emp3
+		employee.save()
+
+		children = get_children(parent=emp3, company=self.company)
+		self.assertEqual([d.id for d in children], [emp4])
+		self.assertEqual(get_children(company=self.company)[0].connections, 3)
+
+	def test_outdated_org_tree_not_cached(self):
+		emp1 = make_employee("testemp1@mail.com", company=self.company)
+		make_employee("testemp2@mail.com", company=self.company, reports_to=emp1)
+
+		def build_org_tree_during_change(company):
+			org_tree = build_org_tree(company)
+			# reporting lines changed and the cache was cleared while the tree was built
+			clear_org_chart_cache()
+			return org_tree
+
+		with patch(
+			"hrms.hr.page.organizational_chart.organizational_chart.build_org_tree",
+			side_effect=build_org_tree_during_change,
+		):
+			self.assertEqual(len(get_children(company=self.company)), 1)
+
+		self.assertFalse(frappe.cache().hgetall(get_org_chart_cache_key(self.company)))
+
+		# the next read caches the tree
+		get_children(company=self.company)
+		self.assertTrue(frappe.cache().hgetall(get_org_chart_cache_key(self.company)))
@@ -6,13 +6,9 @@ from itertools import groupby
 
 import frappe
 from frappe import _
-from frappe.utils import add_days, cint, flt, getdate
+from frappe.utils import cint, flt
 
-from hrms.hr.doctype.leave_allocation.leave_allocation import get_previous_allocation
-from hrms.hr.doctype.leave_application.leave_application import (
-	get_leave_balance_on,
-	get_leaves_for_period,
-)
+from hrms.hr.report.employee_leave_balance.leave_ledger import LeaveLedger
 
 Filters = frappe._dict
 
@@ -91,6 +87,11 @@ def get_data(filters: Filters) -> list:
 	consolidate_leave_types = len(active_employees) > 1 and filters.consolidate_leave_types
 	row = None
 
+	# ledger entries of all employees are loaded at once and balances are computed in memory
+	ledger = LeaveLedger(
+		[employee.name for employee in active_employees], filters.from_date, filters.to_date
+	)
+
 	data = []
 
 	for leave_type in leave_types:
@@ -109,13 +110,18 @@ def get_data(filters: Filters) -> list:
 			row.employee_name = employee.employee_name
 
 			leaves_taken = (
-				get_leaves_for_period(employee.name, leave_type, filters.from_date, filters.to_date) * -1
+				ledger.get_leaves_for_period(
+					employee.name, leave_type, filters.from_date, filters.to_date
+				)
+				* -1
 			)
 
-			new_allocation, expired_leaves, carry_forwarded_leaves = get_allocated_and_expired_leaves(
-				filters.from_date, filters.to_date, employee.name, leave_type
-			)
-			opening = get_opening_balance(employee.name, leave_type, filters, carry_forwarded_leaves)
+			(
+				new_allocation,
+				expired_leaves,
+				carry_forwarded_leaves,
+			) = ledger.get_allocated_and_expired_leaves(employee.name, leave_type)
+			opening = ledger.get_opening_balance(employee.name, leave_type, carry_forwarded_leaves)
 
 			row.leaves_allocated = flt(new_allocation, precision)
 			row.leaves_expired = flt(expired_leaves, precision)
@@ -158,91 +164,6 @@ def get_employees(filters: Filters) -> list[dict]:
 	return query.run(as_dict=True)
 
 
-def get_opening_balance(
-	employee: str, leave_type: str, filters: Filters, carry_forwarded_leaves: float
-) -> float:
-	# allocation boundary condition
-	# opening balance is the closing leave balance 1 day before the filter start date
-	opening_balance_date = add_days(filters.from_date, -1)
-	allocation = get_previous_allocation(filters.from_date, leave_type, employee)
-
-	if (
-		allocation
-		and allocation.get("to_date")
-		and opening_balance_date
-		and getdate(allocation.get("to_date")) == getdate(opening_balance_date)
-	):
-		# if opening balance date is same as the previous allocation's expiry
-		# then opening balance should only consider carry forwarded leaves
-		opening_balance = carry_forwarded_leaves
-	else:
-		# else directly get leave balance on the previous day
-		opening_balance = get_leave_balance_on(employee, leave_type, opening_balance_date)
-
-	return opening_balance
-
-
-def get_allocated_and_expired_leaves(
-	from_date: str, to_date: str, employee: str, leave_type: str
-) -> tuple[float, float, float]:
-	new_allocation = 0
-	expired_leaves = 0
-	carry_forwarded_leaves = 0
-
-	records = get_leave_ledger_entries(from_date, to_date, employee, leave_type)
-
-	for record in records:
-		# new allocation records with `is_expired=1` are created when leave expires
-		# these new records should not be considered, else it leads to negative leave balance
-		if record.is_expired:
-			continue
-
-		if record.to_date < getdate(to_date):
-			# leave allocations ending before to_date, reduce leaves taken within that period
-			# since they are already used, they won't expire
-			expired_leaves += record.leaves
-			expired_leaves += get_leaves_for_period(employee, leave_type, record.from_date, record.to_date)
-
-		if record.from_date >= getdate(from_date):
-			if record.is_carry_forward:
-				carry_forwarded_leaves += record.leaves
-			else:
-				new_allocation += record.leaves
-
-	return new_allocation, expired_leaves, carry_forwarded_leaves
-
-
-def get_leave_ledger_entries(
-	from_date: str, to_date: str, employee: str, leave_type: str
-) -> list[dict]:
-	ledger = frappe.qb.DocType("Leave Ledger Entry")
-	return (
-		frappe.qb.from_(ledger)
-		.select(
-			ledger.employee,
-			ledger.leave_type,
-			ledger.from_date,
-			ledger.to_date,
-			ledger.leaves,
-			ledger.transaction_name,
-			ledger.transaction_type,
-			ledger.is_carry_forward,
-			ledger.is_expired,
-		)
-		.where(
-			(ledger.docstatus == 1)
-			& (ledger.transaction_type == "Leave Allocation")
-			& (ledger.employee == employee)
-			& (ledger.leave_type == leave_type)
-			& (
-				(ledger.from_date[from_date:to_date])
-				| (ledger.to_date[from_date:to_date])
-				| ((ledger.from_date < from_date) & (ledger.to_date > to_date))
-			)
-		)
-	).run(as_dict=True)
-
-
 def get_chart_data(data: list, filters: Filters) -> dict:
 	labels = []
 	datasets = []
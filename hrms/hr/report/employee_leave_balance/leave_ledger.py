@@ -0,0 +1,302 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import add_days, date_diff, flt, getdate
+
+from erpnext.setup.doctype.employee.employee import get_holiday_list_for_employee
+
+from hrms.hr.doctype.leave_application.leave_application import get_remaining_leaves
+from hrms.utils.holiday_list import get_holiday_calendar, get_holiday_lists_for_employees
+
+
+class LeaveLedger:
+	"""Leave Ledger Entries of a set of employees around a report period, loaded with one query.
+	Holidays are counted from the cached holiday calendars.
+
+	Computes the same values as `get_leaves_for_period`, `get_leave_allocation_records`,
+	`get_allocation_expiry_for_cf_leaves` and `get_leave_balance_on` of Leave Application
+	for every employee and leave type in memory.
+	"""
+
+	def __init__(self, employees: list[str], from_date, to_date):
+		self.from_date = getdate(from_date)
+		self.to_date = getdate(to_date)
+		self.opening_balance_date = add_days(self.from_date, -1)
+
+		self.entries = defaultdict(list)
+		self.allocations_ending_before_period = set()
+		self.half_day_dates = {}
+		self.include_holiday = {}
+		self.employee_holiday_lists = {}
+		self.holiday_calendars = {}
+
+		if employees:
+			self.load(employees)
+
+	def load(self, employees: list[str]) -> None:
+		Allocation = frappe.qb.DocType("Leave Allocation")
+		allocations = (
+			frappe.qb.from_(Allocation)
+			.select(Allocation.employee, Allocation.leave_type, Allocation.from_date, Allocation.to_date)
+			.where(
+				(Allocation.employee.isin(employees))
+				& (Allocation.docstatus == 1)
+				& (Allocation.to_date >= self.opening_balance_date)
+				& (Allocation.from_date <= self.to_date)
+			)
+		).run(as_dict=True)
+
+		for allocation in allocations:
+			if allocation.to_date == self.opening_balance_date:
+				self.allocations_ending_before_period.add((allocation.employee, allocation.leave_type))
+
+		# leaves taken are counted from the start of the allocation active on the opening balance date,
+		# carry forward expiry is looked up till today and leaves taken till the end of the allocation
+		self.load_from = min([self.opening_balance_date] + [d.from_date for d in allocations])
+		self.load_till = max([self.to_date, getdate()] + [d.to_date for d in allocations])
+
+		self.load_entries(employees)
+		self.load_half_day_dates()
+		self.load_holidays(employees)
+
+	def load_entries(self, employees: list[str]) -> None:
+		Ledger = frappe.qb.DocType("Leave Ledger Entry")
+		Allocation = frappe.qb.DocType("Leave Allocation")
+		entries = (
+			frappe.qb.from_(Ledger)
+			.left_join(Allocation)
+			.on(
+				(Ledger.transaction_type == "Leave Allocation")
+				& (Ledger.transaction_name == Allocation.name)
+			)
+			.select(
+				Ledger.employee,
+				Ledger.leave_type,
+				Ledger.from_date,
+				Ledger.to_date,
+				Ledger.leaves,
+				Ledger.transaction_name,
+				Ledger.transaction_type,
+				Ledger.holiday_list,
+				Ledger.is_carry_forward,
+				Ledger.is_expired,
+				Ledger.is_lwp,
+				Allocation.from_date.as_("allocation_from_date"),
+				Allocation.to_date.as_("allocation_to_date"),
+			)
+			.where(
+				(Ledger.employee.isin(employees))
+				& (Ledger.docstatus == 1)
+				& (Ledger.to_date >= self.load_from)
+				& (Ledger.from_date <= self.load_till)
+			)
+			.orderby(Ledger.creation)
+		).run(as_dict=True)
+
+		for entry in entries:
+			self.entries[(entry.employee, entry.leave_type)].append(entry)
+
+	def load_half_day_dates(self) -> None:
+		applications = {
+			entry.transaction_name
+			for entries in self.entries.values()
+			for entry in entries
+			if entry.transaction_type == "Leave Application" and entry.leaves % 1
+		}
+		if applications:
+			self.half_day_dates = dict(
+				frappe.get_all(
+					"Leave Application",
+					filters={"name": ("in", list(applications))},
+					fields=["name", "half_day_date"],
+					as_list=True,
+				)
+			)
+
+	def load_holidays(self, employees: list[str]) -> None:
+		self.include_holiday = dict(
+			frappe.get_all("Leave Type", fields=["name", "include_holiday"], as_list=True)
+		)
+		self.employee_holiday_lists = get_holiday_lists_for_employees(employees, raise_exception=False)
+
+	def get_leaves_for_period(self, employee: str, leave_type: str, from_date, to_date) -> float:
+		"""Same as `get_leaves_for_period` in Leave Application"""
+		if not from_date or not to_date:
+			return 0
+
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		leave_days = 0
+
+		for entry in self.entries.get((employee, leave_type), []):
+			if not (entry.leaves < 0 or entry.is_expired):
+				continue
+			if entry.from_date > to_date or entry.to_date < from_date:
+				continue
+
+			inclusive_period = entry.from_date >= from_date and entry.to_date <= to_date
+
+			if inclusive_period and entry.transaction_type == "Leave Encashment":
+				leave_days += entry.leaves
+
+			elif entry.transaction_type == "Leave Application":
+				leave_days -= self.get_number_of_leave_days(
+					entry, max(entry.from_date, from_date), min(entry.to_date, to_date)
+				)
+
+		return leave_days
+
+	def get_number_of_leave_days(self, entry: dict, from_date, to_date) -> float:
+		"""Same as `get_number_of_leave_days` in Leave Application for a leave application's ledger entry"""
+		if entry.leaves % 1:
+			half_day_date = self.half_day_dates.get(entry.transaction_name)
+			if from_date == to_date:
+				number_of_days = 0.5
+			elif half_day_date and from_date <= getdate(half_day_date) <= to_date:
+				number_of_days = date_diff(to_date, from_date) + 0.5
+			else:
+				number_of_days = date_diff(to_date, from_date) + 1
+		else:
+			number_of_days = date_diff(to_date, from_date) + 1
+
+		if not self.include_holiday.get(entry.leave_type):
+			number_of_days = flt(number_of_days) - self.get_holidays(
+				entry.employee, from_date, to_date, entry.holiday_list
+			)
+
+		return number_of_days
+
+	def get_holidays(self, employee: str, from_date, to_date, holiday_list: str | None = None) -> int:
+		"""Same as `get_holidays` in Leave Application"""
+		if not holiday_list:
+			holiday_list = self.employee_holiday_lists.get(employee)
+		if not holiday_list:
+			# raises the missing holiday list error
+			holiday_list = get_holiday_list_for_employee(employee)
+
+		if holiday_list not in self.holiday_calendars:
+			self.holiday_calendars[holiday_list] = get_holiday_calendar(holiday_list)
+
+		return self.holiday_calendars[holiday_list].count_holidays(from_date, to_date)
+
+	def get_allocation_records(self, employee: str, leave_type: str, date) -> frappe._dict:
+		"""Same as `get_leave_allocation_records` in Leave Application for a leave type"""
+		date = getdate(date)
+		entries = [
+			entry
+			for entry in self.entries.get((employee, leave_type), [])
+			if entry.transaction_type == "Leave Allocation"
+			and entry.allocation_from_date
+			and not entry.is_expired
+			and not entry.is_lwp
+			and entry.from_date <= date
+			and (
+				(not entry.is_carry_forward and entry.to_date >= date)
+				or (
+					entry.is_carry_forward
+					and entry.allocation_from_date <= entry.to_date <= entry.allocation_to_date
+					and entry.allocation_from_date <= date <= entry.allocation_to_date
+				)
+			)
+		]
+		if not entries:
+			return frappe._dict()
+
+		cf_leaves = sum(flt(entry.leaves) for entry in entries if entry.is_carry_forward)
+		new_leaves = sum(flt(entry.leaves) for entry in entries if not entry.is_carry_forward)
+
+		return frappe._dict(
+			{
+				"from_date": min(entry.from_date for entry in entries),
+				"to_date": max(entry.to_date for entry in entries),
+				"total_leaves_allocated": cf_leaves + new_leaves,
+				"unused_leaves": cf_leaves,
+				"new_leaves_allocated": new_leaves,
+				"leave_type": leave_type,
+				"employee": employee,
+			}
+		)
+
+	def get_allocation_expiry_for_cf_leaves(self, employee: str, leave_type: str, to_date, from_date):
+		"""Same as `get_allocation_expiry_for_cf_leaves` in Leave Application"""
+		if not from_date:
+			return ""
+
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		for entry in self.entries.get((employee, leave_type), []):
+			if (
+				entry.transaction_type == "Leave Allocation"
+				and entry.is_carry_forward
+				and from_date <= entry.to_date <= to_date
+			):
+				return entry.to_date
+
+		return ""
+
+	def get_leave_balance_on(self, employee: str, leave_type: str, date) -> float:
+		"""Same as `get_leave_balance_on(employee, leave_type, date)` in Leave Application"""
+		allocation = self.get_allocation_records(employee, leave_type, date)
+		cf_expiry = self.get_allocation_expiry_for_cf_leaves(
+			employee, leave_type, getdate(), allocation.from_date
+		)
+		leaves_taken = self.get_leaves_for_period(employee, leave_type, allocation.from_date, date)
+
+		leaves_taken_around_cf_expiry = None
+		if cf_expiry and allocation.unused_leaves:
+			leaves_taken_around_cf_expiry = (
+				self.get_leaves_for_period(employee, leave_type, allocation.from_date, cf_expiry),
+				self.get_leaves_for_period(employee, leave_type, add_days(cf_expiry, 1), allocation.to_date),
+			)
+
+		return get_remaining_leaves(
+			allocation, leaves_taken, date, cf_expiry, leaves_taken_around_cf_expiry
+		).leave_balance
+
+	def get_allocated_and_expired_leaves(
+		self, employee: str, leave_type: str
+	) -> tuple[float, float, float]:
+		"""Returns new leaves allocated, expired leaves and carry forwarded leaves in the period"""
+		new_allocation = 0
+		expired_leaves = 0
+		carry_forwarded_leaves = 0
+
+		for record in self.entries.get((employee, leave_type), []):
+			if record.transaction_type != "Leave Allocation":
+				continue
+			if record.from_date > self.to_date or record.to_date < self.from_date:
+				continue
+
+			# new allocation records with `is_expired=1` are created when leave expires
+			# these new records should not be considered, else it leads to negative leave balance
+			if record.is_expired:
+				continue
+
+			if record.to_date < self.to_date:
+				# leave allocations ending before to_date, reduce leaves taken within that period
+				# since they are already used, they won't expire
+				expired_leaves += record.leaves
+				expired_leaves += self.get_leaves_for_period(
+					employee, leave_type, record.from_date, record.to_date
+				)
+
+			if record.from_date >= self.from_date:
+				if record.is_carry_forward:
+					carry_forwarded_leaves += record.leaves
+				else:
+					new_allocation += record.leaves
+
+		return new_allocation, expired_leaves, carry_forwarded_leaves
+
+	def get_opening_balance(
+		self, employee: str, leave_type: str, carry_forwarded_leaves: float
+	) -> float:
+		# allocation boundary condition
+		# opening balance is the closing leave balance 1 day before the filter start date
+		if (employee, leave_type) in self.allocations_ending_before_period:
+			# if opening balance date is same as the previous allocation's expiry
+			# then opening balance should only consider carry forwarded leaves
+			return carry_forwarded_leaves
+
+		return self.get_leave_balance_on(employee, leave_type, self.opening_balance_date)
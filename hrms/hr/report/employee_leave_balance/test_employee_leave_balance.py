@@ -9,6 +9,10 @@ from frappe.utils import add_days, add_months, flt, get_year_ending, get_year_st
 from erpnext.setup.doctype.employee.test_employee import make_employee
 from erpnext.setup.doctype.holiday_list.test_holiday_list import set_holiday_list
 
+from hrms.hr.doctype.leave_application.leave_application import (
+	get_leave_balance_on,
+	get_leaves_for_period,
+)
 from hrms.hr.doctype.leave_application.test_leave_application import make_allocation_record
 from hrms.hr.doctype.leave_ledger_entry.leave_ledger_entry import process_expired_allocation
 from hrms.hr.doctype.leave_type.test_leave_type import create_leave_type
@@ -28,6 +32,8 @@ class TestEmployeeLeaveBalance(FrappeTestCase):
 			"Leave Application",
 			"Leave Allocation",
 			"Salary Slip",
+			"Salary Slip Aggregate",
+			"Salary Slip Aggregate Component",
 			"Leave Ledger Entry",
 			"Leave Type",
 		]:
@@ -241,3 +247,57 @@ class TestEmployeeLeaveBalance(FrappeTestCase):
 		)
 		report = execute(filters)
 		self.assertEqual(len(report[1]), 1)
+
+	@set_holiday_list("_Test Emp Balance Holiday List", "_Test Company")
+	def test_balances_match_leave_application_for_multiple_employees(self):
+		leave_type = create_leave_type(leave_type_name="_Test Leave Type Excluding Holidays")
+		frappe.db.set_value("Leave Type", leave_type.name, "include_holiday", 0)
+		employees = [
+			self.employee_id,
+			make_employee("test_emp_leave_balance_2@example.com", company="_Test Company"),
+		]
+
+		first_sunday = get_first_sunday(self.holiday_list, for_date=add_months(self.year_start, 1))
+		for employee in employees:
+			make_allocation_record(
+				employee=employee, from_date=self.year_start, to_date=self.year_end, leave_type=leave_type.name
+			)
+
+		# leave spanning a sunday, counted partially in the report period
+		make_leave_application(
+			employees[0], add_days(first_sunday, -2), add_days(first_sunday, 2), leave_type.name
+		)
+		make_leave_application(
+			employees[1],
+			add_days(first_sunday, 8),
+			add_days(first_sunday, 9),
+			leave_type.name,
+			half_day=1,
+			half_day_date=add_days(first_sunday, 9),
+		)
+
+		from_date = first_sunday
+		filters = frappe._dict(
+			{
+				"from_date": from_date,
+				"to_date": self.year_end,
+				"company": "_Test Company",
+				"consolidate_leave_types": 1,
+			}
+		)
+		report = execute(filters)
+
+		# leave types are deleted in setUp, so employee rows only belong to this leave type
+		rows = {row.employee: row for row in report[1] if row.get("employee") in employees}
+		for employee in employees:
+			row = rows[employee]
+			self.assertEqual(
+				row.opening_balance, get_leave_balance_on(employee, leave_type.name, add_days(from_date, -1))
+			)
+			self.assertEqual(
+				row.leaves_taken,
+				get_leaves_for_period(employee, leave_type.name, from_date, self.year_end) * -1,
+			)
+			self.assertEqual(
+				row.closing_balance, get_leave_balance_on(employee, leave_type.name, self.year_end)
+			)
@@ -27,6 +27,8 @@ class TestEmployeeLeaveBalance(FrappeTestCase):
 			"Leave Application",
 			"Leave Allocation",
 			"Salary Slip",
+			"Salary Slip Aggregate",
+			"Salary Slip Aggregate Component",
 			"Leave Ledger Entry",
 			"Leave Type",
 		]:
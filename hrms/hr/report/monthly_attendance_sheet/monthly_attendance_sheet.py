@@ -178,6 +178,7 @@ def get_total_days_in_month(filters: Filters) -> int:
 def get_data(filters: Filters, attendance_map: Dict) -> List[Dict]:
 	employee_details, group_by_param_values = get_employee_related_details(filters)
 	holiday_map = get_holiday_map(filters)
+	summarized_attendance = get_summarized_attendance(filters) if filters.summarized_view else None
 	data = []
 
 	if filters.group_by:
@@ -187,13 +188,15 @@ def get_data(filters: Filters, attendance_map: Dict) -> List[Dict]:
 			if not value:
 				continue
 
-			records = get_rows(employee_details[value], filters, holiday_map, attendance_map)
+			records = get_rows(
+				employee_details[value], filters, holiday_map, attendance_map, summarized_attendance
+			)
 
 			if records:
 				data.append({group_by_column: frappe.bold(value)})
 				data.extend(records)
 	else:
-		data = get_rows(employee_details, filters, holiday_map, attendance_map)
+		data = get_rows(employee_details, filters, holiday_map, attendance_map, summarized_attendance)
 
 	return data
 
@@ -335,30 +338,37 @@ def get_holiday_map(filters: Filters) -> Dict[str, List[Dict]]:
 	default_holiday_list = frappe.get_cached_value("Company", filters.company, "default_holiday_list")
 	holiday_lists.append(default_holiday_list)
 
-	holiday_map = frappe._dict()
-	Holiday = frappe.qb.DocType("Holiday")
-
-	for d in holiday_lists:
-		if not d:
-			continue
+	holiday_map = frappe._dict({d: [] for d in holiday_lists if d})
+	if not holiday_map:
+		return holiday_map
 
-		holidays = (
-			frappe.qb.from_(Holiday)
-			.select(Extract("day", Holiday.holiday_date).as_("day_of_month"), Holiday.weekly_off)
-			.where(
-				(Holiday.parent == d)
-				& (Extract("month", Holiday.holiday_date) == filters.month)
-				& (Extract("year", Holiday.holiday_date) == filters.year)
-			)
-		).run(as_dict=True)
+	Holiday = frappe.qb.DocType("Holiday")
+	holidays = (
+		frappe.qb.from_(Holiday)
+		.select(
+			Holiday.parent,
+			Extract("day", Holiday.holiday_date).as_("day_of_month"),
+			Holiday.weekly_off,
+		)
+		.where(
+			(Holiday.parent.isin(list(holiday_map)))
+			& (Extract("month", Holiday.holiday_date) == filters.month)
+			& (Extract("year", Holiday.holiday_date) == filters.year)
+		)
+	).run(as_dict=True)
 
-		holiday_map.setdefault(d, holidays)
+	for d in holidays:
+		holiday_map[d.pop("parent")].append(d)
 
 	return holiday_map
 
 
 def get_rows(
-	employee_details: Dict, filters: Filters, holiday_map: Dict, attendance_map: Dict
+	employee_details: Dict,
+	filters: Filters,
+	holiday_map: Dict,
+	attendance_map: Dict,
+	summarized_attendance: Optional[Dict] = None,
 ) -> List[Dict]:
 	records = []
 	default_holiday_list = frappe.get_cached_value("Company", filters.company, "default_holiday_list")
@@ -368,18 +378,22 @@ def get_rows(
 		holidays = holiday_map.get(emp_holiday_list)
 
 		if filters.summarized_view:
-			attendance = get_attendance_status_for_summarized_view(employee, filters, holidays)
+			attendance = get_attendance_status_for_summarized_view(
+				employee,
+				filters,
+				summarized_attendance,
+				attendance_map.get(employee, {}),
+				emp_holiday_list,
+				holidays,
+			)
 			if not attendance:
 				continue
 
-			leave_summary = get_leave_summary(employee, filters)
-			entry_exits_summary = get_entry_exits_summary(employee, filters)
-
 			row = {"employee": employee, "employee_name": details.employee_name}
-			set_defaults_for_summarized_view(filters, row)
+			row.update(summarized_attendance.defaults)
 			row.update(attendance)
-			row.update(leave_summary)
-			row.update(entry_exits_summary)
+			row.update(summarized_attendance.leaves.get(employee, {}))
+			row.update(summarized_attendance.entry_exits.get(employee, {}))
 
 			records.append(row)
 		else:
@@ -400,45 +414,67 @@ def get_rows(
 	return records
 
 
-def set_defaults_for_summarized_view(filters, row):
+def get_summarized_attendance(filters: Filters) -> Dict:
+	"""Returns the attendance summary, leave summary and entry / exit summary of all employees
+	for the summarized view, computed with one grouped query each"""
+	defaults = {}
 	for entry in get_columns(filters):
 		if entry.get("fieldtype") == "Float":
-			row[entry.get("fieldname")] = 0.0
+			defaults[entry.get("fieldname")] = 0.0
+
+	return frappe._dict(
+		defaults=defaults,
+		summary=get_attendance_summary(filters),
+		leaves=get_leave_summary(filters),
+		entry_exits=get_entry_exits_summary(filters),
+		# days of the month that are holidays, by holiday list
+		holiday_days={},
+	)
 
 
 def get_attendance_status_for_summarized_view(
-	employee: str, filters: Filters, holidays: List
+	employee: str,
+	filters: Filters,
+	summarized_attendance: Dict,
+	employee_attendance: Dict,
+	holiday_list: Optional[str],
+	holidays: List,
 ) -> Dict:
 	"""Returns dict of attendance status for employee like
 	{'total_present': 1.5, 'total_leaves': 0.5, 'total_absent': 13.5, 'total_holidays': 8, 'unmarked_days': 5}
 	"""
-	summary, attendance_days = get_attendance_summary_and_days(employee, filters)
-	if not any(summary.values()):
+	summary = summarized_attendance.summary.get(employee)
+	if not summary or not any(summary.values()):
 		return {}
 
 	total_days = get_total_days_in_month(filters)
-	total_holidays = total_unmarked_days = 0
 
-	for day in range(1, total_days + 1):
-		if day in attendance_days:
-			continue
+	if holiday_list not in summarized_attendance.holiday_days:
+		summarized_attendance.holiday_days[holiday_list] = {
+			day
+			for day in range(1, total_days + 1)
+			if get_holiday_status(day, holidays) in ["Weekly Off", "Holiday"]
+		}
+	holiday_days = summarized_attendance.holiday_days[holiday_list]
 
-		status = get_holiday_status(day, holidays)
-		if status in ["Weekly Off", "Holiday"]:
-			total_holidays += 1
-		elif not status:
-			total_unmarked_days += 1
+	# leaves are set on every shift, so the days of all shifts are the days with attendance
+	attendance_days = set()
+	for status_dict in employee_attendance.values():
+		attendance_days.update(status_dict)
 
 	return {
 		"total_present": summary.total_present + summary.total_half_days,
 		"total_leaves": summary.total_leaves + summary.total_half_days,
 		"total_absent": summary.total_absent,
-		"total_holidays": total_holidays,
-		"unmarked_days": total_unmarked_days,
+		"total_holidays": len(holiday_days - attendance_days),
+		"unmarked_days": total_days - len(holiday_days | attendance_days),
 	}
 
 
-def get_attendance_summary_and_days(employee: str, filters: Filters) -> Tuple[Dict, List]:
+def get_attendance_summary(filters: Filters) -> Dict[str, Dict]:
+	"""Returns a dict of attendance status totals by employee like:
+	{'employee1': {'total_present': 10, 'total_absent': 2, 'total_leaves': 1, 'total_half_days': 0.5}}
+	"""
 	Attendance = frappe.qb.DocType("Attendance")
 
 	present_case = (
@@ -457,9 +493,10 @@ def get_attendance_summary_and_days(employee: str, filters: Filters) -> Tuple[Di
 	half_day_case = frappe.qb.terms.Case().when(Attendance.status == "Half Day", 0.5).else_(0)
 	sum_half_day = Sum(half_day_case).as_("total_half_days")
 
-	summary = (
+	query = (
 		frappe.qb.from_(Attendance)
 		.select(
+			Attendance.employee,
 			sum_present,
 			sum_absent,
 			sum_leave,
@@ -467,27 +504,17 @@ def get_attendance_summary_and_days(employee: str, filters: Filters) -> Tuple[Di
 		)
 		.where(
 			(Attendance.docstatus == 1)
-			& (Attendance.employee == employee)
 			& (Attendance.company == filters.company)
 			& (Extract("month", Attendance.attendance_date) == filters.month)
 			& (Extract("year", Attendance.attendance_date) == filters.year)
 		)
-	).run(as_dict=True)
+		.groupby(Attendance.employee)
+	)
 
-	days = (
-		frappe.qb.from_(Attendance)
-		.select(Extract("day", Attendance.attendance_date).as_("day_of_month"))
-		.distinct()
-		.where(
-			(Attendance.docstatus == 1)
-			& (Attendance.employee == employee)
-			& (Attendance.company == filters.company)
-			& (Extract("month", Attendance.attendance_date) == filters.month)
-			& (Extract("year", Attendance.attendance_date) == filters.year)
-		)
-	).run(pluck=True)
+	if filters.employee:
+		query = query.where(Attendance.employee == filters.employee)
 
-	return summary[0], days
+	return {d.pop("employee"): d for d in query.run(as_dict=True)}
 
 
 def get_attendance_status_for_detailed_view(
@@ -531,39 +558,41 @@ def get_holiday_status(day: int, holidays: List) -> str:
 	return status
 
 
-def get_leave_summary(employee: str, filters: Filters) -> Dict[str, float]:
+def get_leave_summary(filters: Filters) -> Dict[str, Dict[str, float]]:
 	"""Returns a dict of leave type and corresponding leaves taken by employee like:
-	{'leave_without_pay': 1.0, 'sick_leave': 2.0}
+	{'employee1': {'leave_without_pay': 1.0, 'sick_leave': 2.0}}
 	"""
 	Attendance = frappe.qb.DocType("Attendance")
 	day_case = frappe.qb.terms.Case().when(Attendance.status == "Half Day", 0.5).else_(1)
 	sum_leave_days = Sum(day_case).as_("leave_days")
 
-	leave_details = (
+	query = (
 		frappe.qb.from_(Attendance)
-		.select(Attendance.leave_type, sum_leave_days)
+		.select(Attendance.employee, Attendance.leave_type, sum_leave_days)
 		.where(
-			(Attendance.employee == employee)
-			& (Attendance.docstatus == 1)
+			(Attendance.docstatus == 1)
 			& (Attendance.company == filters.company)
 			& ((Attendance.leave_type.isnotnull()) | (Attendance.leave_type != ""))
 			& (Extract("month", Attendance.attendance_date) == filters.month)
 			& (Extract("year", Attendance.attendance_date) == filters.year)
 		)
-		.groupby(Attendance.leave_type)
-	).run(as_dict=True)
+		.groupby(Attendance.employee, Attendance.leave_type)
+	)
+
+	if filters.employee:
+		query = query.where(Attendance.employee == filters.employee)
 
 	leaves = {}
-	for d in leave_details:
+	for d in query.run(as_dict=True):
 		leave_type = frappe.scrub(d.leave_type)
-		leaves[leave_type] = d.leave_days
+		leaves.setdefault(d.employee, {})[leave_type] = d.leave_days
 
 	return leaves
 
 
-def get_entry_exits_summary(employee: str, filters: Filters) -> Dict[str, float]:
-	"""Returns total late entries and total early exits for employee like:
-	{'total_late_entries': 5, 'total_early_exits': 2}
+def get_entry_exits_summary(filters: Filters) -> Dict[str, Dict[str, float]]:
+	"""Returns total late entries and total early exits by employee like:
+	{'employee1': {'total_late_entries': 5, 'total_early_exits': 2}}
 	"""
 	Attendance = frappe.qb.DocType("Attendance")
 
@@ -573,19 +602,22 @@ def get_entry_exits_summary(employee: str, filters: Filters) -> Dict[str, float]
 	early_exit_case = frappe.qb.terms.Case().when(Attendance.early_exit == "1", "1")
 	count_early_exits = Count(early_exit_case).as_("total_early_exits")
 
-	entry_exits = (
+	query = (
 		frappe.qb.from_(Attendance)
-		.select(count_late_entries, count_early_exits)
+		.select(Attendance.employee, count_late_entries, count_early_exits)
 		.where(
 			(Attendance.docstatus == 1)
-			& (Attendance.employee == employee)
 			& (Attendance.company == filters.company)
 			& (Extract("month", Attendance.attendance_date) == filters.month)
 			& (Extract("year", Attendance.attendance_date) == filters.year)
 		)
-	).run(as_dict=True)
+		.groupby(Attendance.employee)
+	)
+
+	if filters.employee:
+		query = query.where(Attendance.employee == filters.employee)
 
-	return entry_exits[0]
+	return {d.pop("employee"): d for d in query.run(as_dict=True)}
 
 
 @frappe.whitelist()
@@ -2,7 +2,7 @@ from dateutil.relativedelta import relativedelta
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import get_year_ending, get_year_start, getdate
+from frappe.utils import get_last_day, get_year_ending, get_year_start, getdate
 
 from erpnext.setup.doctype.employee.test_employee import make_employee
 from erpnext.setup.doctype.holiday_list.test_holiday_list import set_holiday_list
@@ -201,6 +201,58 @@ class TestMonthlyAttendanceSheet(FrappeTestCase):
 		self.assertEqual(row["total_late_entries"], 1)
 		self.assertEqual(row["total_early_exits"], 1)
 
+	@set_holiday_list("Salary Slip Test Holiday List", "_Test Company")
+	def test_summarized_view_for_multiple_employees(self):
+		previous_month_first = get_first_day_for_prev_month()
+		previous_month_last = get_last_day(previous_month_first)
+		employee2 = make_employee("test_employee2@example.com", company=self.company)
+
+		holiday_list = "Salary Slip Test Holiday List"
+		for employee in [self.employee, employee2]:
+			frappe.db.set_value("Employee", employee, "holiday_list", holiday_list)
+
+		mark_attendance(self.employee, previous_month_first, "Present")
+		mark_attendance(self.employee, previous_month_first + relativedelta(days=1), "Absent")
+		mark_attendance(employee2, previous_month_first, "Half Day", late_entry=1)
+
+		filters = frappe._dict(
+			{
+				"month": previous_month_first.month,
+				"year": previous_month_first.year,
+				"company": self.company,
+				"summarized_view": 1,
+			}
+		)
+		rows = {row["employee"]: row for row in execute(filters=filters)[1]}
+
+		holiday_dates = set(
+			frappe.get_all(
+				"Holiday",
+				filters={
+					"parent": holiday_list,
+					"holiday_date": ("between", [previous_month_first, previous_month_last]),
+				},
+				pluck="holiday_date",
+			)
+		)
+		total_days = previous_month_last.day
+
+		attended = {previous_month_first, previous_month_first + relativedelta(days=1)}
+		row = rows[self.employee]
+		self.assertEqual(row["total_present"], 1)
+		self.assertEqual(row["total_absent"], 1)
+		self.assertEqual(row["total_late_entries"], 0)
+		self.assertEqual(row["total_holidays"], len(holiday_dates - attended))
+		self.assertEqual(row["unmarked_days"], total_days - len(holiday_dates | attended))
+
+		attended = {previous_month_first}
+		row = rows[employee2]
+		self.assertEqual(row["total_present"], 0.5)
+		self.assertEqual(row["total_leaves"], 0.5)
+		self.assertEqual(row["total_late_entries"], 1)
+		self.assertEqual(row["total_holidays"], len(holiday_dates - attended))
+		self.assertEqual(row["unmarked_days"], total_days - len(holiday_dates | attended))
+
 	@set_holiday_list("Salary Slip Test Holiday List", "_Test Company")
 	def test_attendance_with_group_by_filter(self):
 		previous_month_first = get_first_day_for_prev_month()
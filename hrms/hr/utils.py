@@ -29,6 +29,7 @@ from erpnext.setup.doctype.employee.employee import (
 from hrms.hr.doctype.leave_policy_assignment.leave_policy_assignment import (
 	calculate_pro_rated_leaves,
 )
+from hrms.utils.holiday_list import get_holiday_calendar
 
 
 class DuplicateDeclarationError(frappe.ValidationError):
@@ -335,40 +336,11 @@ def generate_leave_encashment():
 
 def allocate_earned_leaves():
 	"""Allocate earned leaves to Employees"""
-	e_leave_types = get_earned_leaves()
-	today = frappe.flags.current_date or getdate()
-
-	for e_leave_type in e_leave_types:
-		leave_allocations = get_leave_allocations(today, e_leave_type.name)
-
-		for allocation in leave_allocations:
-			if not allocation.leave_policy_assignment and not allocation.leave_policy:
-				continue
-
-			leave_policy = (
-				allocation.leave_policy
-				if allocation.leave_policy
-				else frappe.db.get_value(
-					"Leave Policy Assignment", allocation.leave_policy_assignment, ["leave_policy"]
-				)
-			)
-
-			annual_allocation = frappe.db.get_value(
-				"Leave Policy Detail",
-				filters={"parent": leave_policy, "leave_type": e_leave_type.name},
-				fieldname=["annual_allocation"],
-			)
-			date_of_joining = frappe.db.get_value("Employee", allocation.employee, "date_of_joining")
-
-			from_date = allocation.from_date
-
-			if e_leave_type.allocate_on_day == "Date of Joining":
-				from_date = date_of_joining
+	from hrms.hr.doctype.leave_allocation.bulk_earned_leave_allocation import (
+		BulkEarnedLeaveAllocation,
+	)
 
-			if check_effective_date(
-				from_date, today, e_leave_type.earned_leave_frequency, e_leave_type.allocate_on_day
-			):
-				update_previous_leave_allocation(allocation, annual_allocation, e_leave_type, date_of_joining)
+	BulkEarnedLeaveAllocation().process()
 
 
 def update_previous_leave_allocation(allocation, annual_allocation, e_leave_type, date_of_joining):
@@ -407,8 +379,7 @@ def update_previous_leave_allocation(allocation, annual_allocation, e_leave_type
 			).format(
 				frappe.bold(earned_leaves), frappe.bold(formatdate(today_date)), e_leave_type.allocate_on_day
 			)
-
-		allocation.add_comment(comment_type="Info", text=text)
+			allocation.add_comment(comment_type="Info", text=text)
 
 
 def get_monthly_earned_leave(
@@ -587,17 +558,10 @@ def get_holidays_for_employee(
 	if not holiday_list:
 		return []
 
-	filters = {"parent": holiday_list, "holiday_date": ("between", [start_date, end_date])}
-
-	if only_non_weekly:
-		filters["weekly_off"] = False
-
-	holidays = frappe.get_all(
-		"Holiday", fields=["description", "holiday_date"], filters=filters, order_by="holiday_date"
+	return get_holiday_calendar(holiday_list).get_holidays(
+		start_date, end_date, skip_weekly_offs=only_non_weekly
 	)
 
-	return holidays
-
 
 @erpnext.allow_regional
 def calculate_annual_eligible_hra_exemption(doc):
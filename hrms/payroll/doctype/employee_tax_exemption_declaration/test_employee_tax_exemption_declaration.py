@@ -20,6 +20,8 @@ class TestEmployeeTaxExemptionDeclaration(FrappeTestCase):
 		frappe.db.delete("Employee Tax Exemption Declaration")
 		frappe.db.delete("Salary Structure Assignment")
 		frappe.db.delete("Salary Slip")
+		frappe.db.delete("Salary Slip Aggregate")
+		frappe.db.delete("Salary Slip Aggregate Component")
 
 		make_employee("employee@taxexemption.com", company="_Test Company")
 		make_employee("employee1@taxexemption.com", company="_Test Company")
@@ -26,6 +26,8 @@ class TestGratuity(FrappeTestCase):
 	def setUp(self):
 		frappe.db.delete("Gratuity")
 		frappe.db.delete("Salary Slip")
+		frappe.db.delete("Salary Slip Aggregate")
+		frappe.db.delete("Salary Slip Aggregate Component")
 		frappe.db.delete("Additional Salary", {"ref_doctype": "Gratuity"})
 
 		make_earning_salary_component(
@@ -3,12 +3,23 @@
 
 
 from frappe.model.document import Document
+from frappe.utils import cstr
 
 # import frappe
 import erpnext
 
+from hrms.payroll.doctype.salary_slip.salary_slip import compile_tax_slab_condition
+
 
 class IncomeTaxSlab(Document):
 	def validate(self):
 		if self.company:
 			self.currency = erpnext.get_company_currency(self.company)
+
+		self.validate_slab_conditions()
+
+	def validate_slab_conditions(self):
+		for slab in self.slabs:
+			condition = cstr(slab.condition).strip()
+			if condition:
+				compile_tax_slab_condition(condition)
@@ -1,9 +1,59 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from hrms.payroll.doctype.salary_slip.salary_slip import (
+	calculate_tax_by_tax_slab,
+	calculate_tax_by_tax_slab_for_incomes,
+)
+
 
 class TestIncomeTaxSlab(FrappeTestCase):
-	pass
+	def test_tax_by_tax_slab(self):
+		tax_slab = make_tax_slab_doc()
+
+		self.assertEqual(calculate_tax_by_tax_slab(200000, tax_slab, eval_locals={}), 0)
+		# 5% of the first slab
+		self.assertAlmostEqual(calculate_tax_by_tax_slab(500000, tax_slab, eval_locals={}), 12500.05)
+		# full first slab + 20% of the amount above 500000, plus 4% cess
+		self.assertAlmostEqual(
+			calculate_tax_by_tax_slab(700000, tax_slab, eval_locals={}), (12500.05 + 40000) * 1.04
+		)
+
+	def test_tax_slab_conditions(self):
+		tax_slab = make_tax_slab_doc(condition="gender == 'Female'")
+
+		self.assertAlmostEqual(calculate_tax_by_tax_slab(500000, tax_slab, eval_locals={"gender": "Male"}), 0)
+		self.assertAlmostEqual(
+			calculate_tax_by_tax_slab(500000, tax_slab, eval_locals={"gender": "Female"}), 12500.05
+		)
+
+	def test_tax_for_incomes_matches_tax_per_income(self):
+		tax_slab = make_tax_slab_doc(condition="annual_taxable_earning > 300000")
+		incomes = [0, 250000, 250001, 499999.5, 500000, 650000, 1200000, 310000]
+
+		tax_amounts = calculate_tax_by_tax_slab_for_incomes(incomes, tax_slab, eval_locals={})
+		for income, tax_amount in zip(incomes, tax_amounts):
+			self.assertAlmostEqual(tax_amount, calculate_tax_by_tax_slab(income, tax_slab, eval_locals={}))
+
+	def test_invalid_slab_condition(self):
+		tax_slab = make_tax_slab_doc(condition="gender ==")
+		self.assertRaises(frappe.ValidationError, calculate_tax_by_tax_slab, 500000, tax_slab, None, {})
+
+
+def make_tax_slab_doc(condition=None):
+	return frappe.get_doc(
+		{
+			"doctype": "Income Tax Slab",
+			"currency": "INR",
+			"slabs": [
+				{"from_amount": 250000, "to_amount": 500000, "percent_deduction": 5, "condition": condition},
+				{"from_amount": 500001, "to_amount": 0, "percent_deduction": 20},
+			],
+			"other_taxes_and_charges": [
+				{"description": "cess", "percent": 4, "min_taxable_income": 600000},
+			],
+		}
+	)
@@ -136,7 +136,11 @@ frappe.ui.form.on('Payroll Entry', {
 	},
 
 	add_context_buttons: function (frm) {
-		if (frm.doc.salary_slips_submitted || (frm.doc.__onload && frm.doc.__onload.submitted_ss)) {
+		if (frm.doc.status === "Failed" && frm.events.has_failed_chunks(frm)) {
+			frm.add_custom_button(__("Retry Failed Chunks"), function() {
+				frm.call("retry_failed_chunks").then(() => frm.reload_doc());
+			}).addClass("btn-primary");
+		} else if (frm.events.can_make_bank_entry(frm)) {
 			frm.events.add_bank_entry_button(frm);
 		} else if (frm.doc.salary_slips_created && frm.doc.status !== "Queued") {
 			frm.add_custom_button(__("Submit Salary Slip"), function() {
@@ -149,6 +153,24 @@ frappe.ui.form.on('Payroll Entry', {
 		}
 	},
 
+	can_make_bank_entry: function (frm) {
+		const onload = frm.doc.__onload || {};
+		// salary slips without an accrual journal entry are posted first
+		if (onload.accrual_pending) return false;
+
+		return frm.doc.salary_slips_submitted || onload.submitted_ss;
+	},
+
+	has_failed_chunks: function (frm) {
+		const chunks = frm.doc.chunks || [];
+		let process = frm.doc.salary_slips_created ? "Submission" : "Creation";
+		if (chunks.some((chunk) => chunk.process === "Accrual")) process = "Accrual";
+
+		return chunks.some(
+			(chunk) => chunk.process === process && chunk.status === "Failed"
+		);
+	},
+
 	add_bank_entry_button: function (frm) {
 		frappe.call({
 			method: 'hrms.payroll.doctype.payroll_entry.payroll_entry.payroll_entry_has_bank_entries',
@@ -350,7 +372,7 @@ frappe.ui.form.on('Payroll Entry', {
 	validate_attendance: function (frm) {
 		if (frm.doc.validate_attendance && (frm.doc.employees?.length > 0)) {
 			frappe.call({
-				method: 'get_employees_with_unmarked_attendance',
+				method: 'get_unmarked_attendance',
 				args: {},
 				callback: function (r) {
 					render_employee_attendance(frm, r.message);
@@ -418,9 +440,27 @@ let make_bank_entry = function (frm) {
 };
 
 let render_employee_attendance = function (frm, data) {
-	frm.fields_dict.attendance_detail_html.html(
+	const wrapper = frm.fields_dict.attendance_detail_html;
+	wrapper.html(
 		frappe.render_template('employees_with_unmarked_attendance', {
-			data: data
+			data: data?.data || [],
+			total: data?.total || 0
 		})
 	);
+
+	// unmarked attendance is fetched page by page to keep large lists responsive
+	wrapper.$wrapper.find('.btn-load-more').on('click', function () {
+		frappe.call({
+			method: 'get_unmarked_attendance',
+			args: { start: data.data.length },
+			doc: frm.doc,
+			freeze: true,
+			freeze_message: __('Validating Employee Attendance...')
+		}).then(r => {
+			render_employee_attendance(frm, {
+				data: data.data.concat(r.message?.data || []),
+				total: r.message?.total || data.total
+			});
+		});
+	});
 };
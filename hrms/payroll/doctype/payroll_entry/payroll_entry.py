@@ -9,13 +9,14 @@ import frappe
 from frappe import _
 from frappe.desk.reportview import get_match_cond
 from frappe.model.document import Document
-from frappe.query_builder.functions import Coalesce, Count
+from frappe.query_builder.functions import Coalesce, Count, NullIf, Sum
 from frappe.utils import (
 	DATE_FORMAT,
 	add_days,
 	add_to_date,
 	cint,
 	comma_and,
+	create_batch,
 	date_diff,
 	flt,
 	get_link_to_form,
@@ -28,10 +29,20 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 )
 from erpnext.accounts.utils import get_fiscal_year
 
+UNMARKED_ATTENDANCE_PAGE_LENGTH = 100
+
 
 class PayrollEntry(Document):
 	def onload(self):
-		if not self.docstatus == 1 or self.salary_slips_submitted:
+		if not self.docstatus == 1:
+			return
+
+		if self.is_accrual_pending():
+			# salary slips are paid only after they are posted in an accrual journal entry
+			self.set_onload("accrual_pending", True)
+			return
+
+		if self.salary_slips_submitted:
 			return
 
 		# check if salary slips were manually submitted
@@ -191,7 +202,7 @@ class PayrollEntry(Document):
 		self.set("employees", employees)
 		self.number_of_employees = len(self.employees)
 
-		return self.get_employees_with_unmarked_attendance()
+		return self.get_unmarked_attendance()
 
 	@frappe.whitelist()
 	def create_salary_slips(self):
@@ -202,30 +213,10 @@ class PayrollEntry(Document):
 		employees = [emp.employee for emp in self.employees]
 
 		if employees:
-			args = frappe._dict(
-				{
-					"salary_slip_based_on_timesheet": self.salary_slip_based_on_timesheet,
-					"payroll_frequency": self.payroll_frequency,
-					"start_date": self.start_date,
-					"end_date": self.end_date,
-					"company": self.company,
-					"posting_date": self.posting_date,
-					"deduct_tax_for_unclaimed_employee_benefits": self.deduct_tax_for_unclaimed_employee_benefits,
-					"deduct_tax_for_unsubmitted_tax_exemption_proof": self.deduct_tax_for_unsubmitted_tax_exemption_proof,
-					"payroll_entry": self.name,
-					"exchange_rate": self.exchange_rate,
-					"currency": self.currency,
-				}
-			)
+			args = self.get_salary_slip_args()
 			if len(employees) > 30 or frappe.flags.enqueue_payroll_entry:
 				self.db_set("status", "Queued")
-				frappe.enqueue(
-					create_salary_slips_for_employees,
-					timeout=3000,
-					employees=employees,
-					args=args,
-					publish_progress=False,
-				)
+				self.enqueue_chunks("Creation", employees)
 				frappe.msgprint(
 					_("Salary Slip creation is queued. It may take a few minutes"),
 					alert=True,
@@ -236,6 +227,87 @@ class PayrollEntry(Document):
 				# since this method is called via frm.call this doc needs to be updated manually
 				self.reload()
 
+	def get_salary_slip_args(self) -> frappe._dict:
+		return frappe._dict(
+			{
+				"salary_slip_based_on_timesheet": self.salary_slip_based_on_timesheet,
+				"payroll_frequency": self.payroll_frequency,
+				"start_date": self.start_date,
+				"end_date": self.end_date,
+				"company": self.company,
+				"posting_date": self.posting_date,
+				"deduct_tax_for_unclaimed_employee_benefits": self.deduct_tax_for_unclaimed_employee_benefits,
+				"deduct_tax_for_unsubmitted_tax_exemption_proof": self.deduct_tax_for_unsubmitted_tax_exemption_proof,
+				"payroll_entry": self.name,
+				"exchange_rate": self.exchange_rate,
+				"currency": self.currency,
+			}
+		)
+
+	def enqueue_chunks(self, process: str, records: list[str], chunk_size: int | None = None) -> None:
+		"""Splits records (employees for creation, salary slips for submission and accrual) into chunks
+		and processes each chunk in a separate background job.
+		Chunks run in parallel on the available workers and are committed independently"""
+		frappe.db.delete(
+			"Payroll Entry Chunk",
+			{"parent": self.name, "parenttype": self.doctype, "process": process},
+		)
+		self.set("chunks", [row for row in self.chunks if row.process != process])
+
+		for batch in create_batch(records, chunk_size or get_salary_slip_chunk_size()):
+			chunk = self.append(
+				"chunks",
+				{
+					"process": process,
+					"status": "Queued",
+					"employee_count": len(batch),
+					"processed_count": 0,
+					"records": json.dumps(batch),
+				},
+			)
+			chunk.db_insert()
+			self.enqueue_chunk(chunk)
+
+	def enqueue_chunk(self, chunk) -> None:
+		frappe.enqueue(
+			{
+				"Creation": create_salary_slips_for_chunk,
+				"Submission": submit_salary_slips_for_chunk,
+				"Accrual": make_accrual_jv_entry_for_chunk,
+			}[chunk.process],
+			timeout=3000,
+			job_id=f"payroll_entry_chunk::{chunk.name}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			payroll_entry=self.name,
+			chunk=chunk.name,
+		)
+
+	@frappe.whitelist()
+	def retry_failed_chunks(self):
+		"""Re-enqueues only the chunks that failed, chunks that completed are not processed again"""
+		self.check_permission("write")
+		if any(chunk.process == "Accrual" for chunk in self.chunks):
+			process = "Accrual"
+		else:
+			process = "Submission" if self.salary_slips_created else "Creation"
+		chunks = [chunk for chunk in self.chunks if chunk.process == process]
+		failed_chunks = [chunk for chunk in chunks if chunk.status == "Failed"]
+
+		if not failed_chunks:
+			frappe.throw(_("There are no failed chunks to retry"))
+
+		self.db_set({"status": "Queued", "error_message": ""})
+		for chunk in failed_chunks:
+			chunk.db_set({"status": "Queued", "error_message": "", "error_log": None})
+			self.enqueue_chunk(chunk)
+
+		frappe.msgprint(
+			_("{0} failed chunk(s) queued for retry").format(len(failed_chunks)),
+			alert=True,
+			indicator="blue",
+		)
+
 	def get_sal_slip_list(self, ss_status, as_dict=False):
 		"""
 		Returns list of salary slips based on selected criteria
@@ -262,15 +334,9 @@ class PayrollEntry(Document):
 		self.check_permission("write")
 		salary_slips = self.get_sal_slip_list(ss_status=0)
 
-		if len(salary_slips) > 30 or frappe.flags.enqueue_payroll_entry:
+		if salary_slips and (len(salary_slips) > 30 or frappe.flags.enqueue_payroll_entry):
 			self.db_set("status", "Queued")
-			frappe.enqueue(
-				submit_salary_slips_for_employees,
-				timeout=3000,
-				payroll_entry=self,
-				salary_slips=salary_slips,
-				publish_progress=False,
-			)
+			self.enqueue_chunks("Submission", [entry[0] for entry in salary_slips])
 			frappe.msgprint(
 				_("Salary Slip submission is queued. It may take a few minutes"),
 				alert=True,
@@ -285,12 +351,14 @@ class PayrollEntry(Document):
 				ss.email_salary_slip()
 
 	def get_salary_component_account(self, salary_component):
-		account = frappe.db.get_value(
-			"Salary Component Account",
-			{"parent": salary_component, "company": self.company},
-			"account",
-			cache=True,
-		)
+		account = getattr(self, "_salary_component_accounts", {}).get(salary_component)
+		if not account:
+			account = frappe.db.get_value(
+				"Salary Component Account",
+				{"parent": salary_component, "company": self.company},
+				"account",
+				cache=True,
+			)
 
 		if not account:
 			frappe.throw(
@@ -301,8 +369,9 @@ class PayrollEntry(Document):
 
 		return account
 
-	def get_salary_components(self, component_type):
-		salary_slips = self.get_sal_slip_list(ss_status=1, as_dict=True)
+	def get_salary_components(self, component_type, salary_slips=None):
+		if salary_slips is None:
+			salary_slips = [d.name for d in self.get_sal_slip_list(ss_status=1, as_dict=True)]
 
 		if salary_slips:
 			ss = frappe.qb.DocType("Salary Slip")
@@ -313,13 +382,20 @@ class PayrollEntry(Document):
 				.on(ss.name == ssd.parent)
 				.select(
 					ssd.salary_component,
-					ssd.amount,
+					Sum(ssd.amount).as_("amount"),
 					ssd.parentfield,
 					ssd.additional_salary,
 					ss.salary_structure,
 					ss.employee,
 				)
-				.where((ssd.parentfield == component_type) & (ss.name.isin([d.name for d in salary_slips])))
+				.where((ssd.parentfield == component_type) & (ss.name.isin(salary_slips)))
+				.groupby(
+					ss.employee,
+					ss.salary_structure,
+					ssd.salary_component,
+					ssd.parentfield,
+					ssd.additional_salary,
+				)
 			).run(as_dict=True)
 
 			return salary_components
@@ -328,10 +404,14 @@ class PayrollEntry(Document):
 		self,
 		component_type=None,
 		employee_wise_accounting_enabled=False,
+		salary_slips=None,
 	):
-		salary_components = self.get_salary_components(component_type)
+		salary_components = self.get_salary_components(component_type, salary_slips)
 		if salary_components:
 			component_dict = {}
+			self.set_payroll_cost_centers(salary_components)
+			self.set_salary_component_accounts({d.salary_component for d in salary_components})
+			employee_advances = self.get_advance_deductions(component_type, salary_components)
 
 			for item in salary_components:
 				if not self.should_add_component_to_accrual_jv(component_type, item):
@@ -340,7 +420,7 @@ class PayrollEntry(Document):
 				employee_cost_centers = self.get_payroll_cost_centers_for_employee(
 					item.employee, item.salary_structure
 				)
-				employee_advance = self.get_advance_deduction(component_type, item)
+				employee_advance = employee_advances.get(item.additional_salary)
 
 				for cost_center, percentage in employee_cost_centers.items():
 					amount_against_cost_center = flt(item.amount) * percentage / 100
@@ -373,17 +453,38 @@ class PayrollEntry(Document):
 
 		return add_component_to_accrual_jv
 
-	def get_advance_deduction(self, component_type: str, item: dict) -> str | None:
-		if component_type == "deductions" and item.additional_salary:
-			ref_doctype, ref_docname = frappe.db.get_value(
+	def get_advance_deductions(self, component_type: str, salary_components: list[dict]) -> dict:
+		"""Returns the Employee Advance recovered by each Additional Salary in the deductions"""
+		additional_salaries = {d.additional_salary for d in salary_components if d.additional_salary}
+		if component_type != "deductions" or not additional_salaries:
+			return {}
+
+		return dict(
+			frappe.get_all(
 				"Additional Salary",
-				item.additional_salary,
-				["ref_doctype", "ref_docname"],
+				filters={"name": ("in", list(additional_salaries)), "ref_doctype": "Employee Advance"},
+				fields=["name", "ref_docname"],
+				as_list=True,
 			)
+		)
 
-			if ref_doctype == "Employee Advance":
-				return ref_docname
-		return
+	def set_salary_component_accounts(self, salary_components: set[str]) -> None:
+		"""Fetches the company accounts of all salary components at once"""
+		if not hasattr(self, "_salary_component_accounts"):
+			self._salary_component_accounts = {}
+
+		salary_components = [d for d in salary_components if d not in self._salary_component_accounts]
+		if not salary_components:
+			return
+
+		self._salary_component_accounts.update(
+			frappe.get_all(
+				"Salary Component Account",
+				filters={"parent": ("in", salary_components), "company": self.company},
+				fields=["parent", "account"],
+				as_list=True,
+			)
+		)
 
 	def add_advance_deduction_entry(
 		self,
@@ -443,6 +544,69 @@ class PayrollEntry(Document):
 		if salary_structure and "salary_structure" not in employee_details:
 			employee_details["salary_structure"] = salary_structure
 
+	def set_payroll_cost_centers(self, salary_details: list[dict]) -> None:
+		"""Fetches payroll cost centers for all employees at once instead of
+		querying them per employee in `get_payroll_cost_centers_for_employee`"""
+		if not hasattr(self, "employee_cost_centers"):
+			self.employee_cost_centers = {}
+
+		salary_structures = {}
+		for d in salary_details:
+			if d.employee not in self.employee_cost_centers:
+				salary_structures.setdefault(d.employee, d.salary_structure)
+
+		if not salary_structures:
+			return
+
+		SalaryStructureAssignment = frappe.qb.DocType("Salary Structure Assignment")
+		EmployeeCostCenter = frappe.qb.DocType("Employee Cost Center")
+
+		assigned_cost_centers = (
+			frappe.qb.from_(SalaryStructureAssignment)
+			.join(EmployeeCostCenter)
+			.on(SalaryStructureAssignment.name == EmployeeCostCenter.parent)
+			.select(
+				SalaryStructureAssignment.employee,
+				SalaryStructureAssignment.salary_structure,
+				EmployeeCostCenter.cost_center,
+				EmployeeCostCenter.percentage,
+			)
+			.where(
+				(SalaryStructureAssignment.employee.isin(list(salary_structures)))
+				& (SalaryStructureAssignment.docstatus == 1)
+				& (SalaryStructureAssignment.salary_structure.isin(list(set(salary_structures.values()))))
+			)
+		).run(as_dict=True)
+
+		cost_centers = {}
+		for d in assigned_cost_centers:
+			if salary_structures[d.employee] == d.salary_structure:
+				cost_centers.setdefault(d.employee, {})[d.cost_center] = d.percentage
+
+		employees_without_cost_centers = [e for e in salary_structures if e not in cost_centers]
+		if employees_without_cost_centers:
+			employee_details = frappe.get_all(
+				"Employee",
+				filters={"name": ("in", employees_without_cost_centers)},
+				fields=["name", "payroll_cost_center", "department"],
+			)
+			department_cost_centers = dict(
+				frappe.get_all(
+					"Department",
+					filters={"name": ("in", list({d.department for d in employee_details if d.department}))},
+					fields=["name", "payroll_cost_center"],
+					as_list=True,
+				)
+			)
+
+			for d in employee_details:
+				default_cost_center = (
+					d.payroll_cost_center or department_cost_centers.get(d.department) or self.cost_center
+				)
+				cost_centers[d.name] = {default_cost_center: 100}
+
+		self.employee_cost_centers.update(cost_centers)
+
 	def get_payroll_cost_centers_for_employee(self, employee, salary_structure):
 		if not hasattr(self, "employee_cost_centers"):
 			self.employee_cost_centers = {}
@@ -493,11 +657,10 @@ class PayrollEntry(Document):
 
 		return account_dict
 
-	def make_accrual_jv_entry(self, submitted_salary_slips):
-		self.check_permission("write")
-		employee_wise_accounting_enabled = frappe.db.get_single_value(
-			"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
-		)
+	def get_accrual_aggregates(self, employee_wise_accounting_enabled, salary_slips=None) -> dict:
+		"""Returns account and cost center wise totals for the accrual journal entry
+		along with advance deductions and employee wise payables.
+		If `salary_slips` is passed, only those salary slips are considered"""
 		self.employee_based_payroll_payable_entries = {}
 		self._advance_deduction_entries = []
 
@@ -505,6 +668,7 @@ class PayrollEntry(Document):
 			self.get_salary_component_total(
 				component_type="earnings",
 				employee_wise_accounting_enabled=employee_wise_accounting_enabled,
+				salary_slips=salary_slips,
 			)
 			or {}
 		)
@@ -513,10 +677,84 @@ class PayrollEntry(Document):
 			self.get_salary_component_total(
 				component_type="deductions",
 				employee_wise_accounting_enabled=employee_wise_accounting_enabled,
+				salary_slips=salary_slips,
 			)
 			or {}
 		)
 
+		return {
+			"earnings": earnings,
+			"deductions": deductions,
+			"advance_deductions": self._advance_deduction_entries,
+			"employee_payables": self.employee_based_payroll_payable_entries,
+		}
+
+	def make_accrual_jv_entry(self, submitted_salary_slips, accrual_aggregates=None) -> bool:
+		"""Posts the accrual journal entry for the submitted salary slips.
+		Returns False if it was split into parts that are posted in background jobs"""
+		self.check_permission("write")
+		employee_wise_accounting_enabled = frappe.db.get_single_value(
+			"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
+		)
+
+		if not accrual_aggregates:
+			accrual_aggregates = self.get_accrual_aggregates(employee_wise_accounting_enabled)
+
+		row_limit = get_journal_entry_row_limit()
+		if (
+			employee_wise_accounting_enabled
+			and row_limit
+			and get_accrual_row_count(accrual_aggregates) > row_limit
+		):
+			self.enqueue_accrual_jv_entries(submitted_salary_slips, accrual_aggregates, row_limit)
+			return False
+
+		self.make_accrual_jv_entry_from_aggregates(
+			submitted_salary_slips, accrual_aggregates, employee_wise_accounting_enabled
+		)
+		return True
+
+	def enqueue_accrual_jv_entries(
+		self, submitted_salary_slips: list, accrual_aggregates: dict, row_limit: int
+	) -> None:
+		"""Splits the accrual journal entry by salary slips so that each journal entry has roughly
+		`row_limit` rows, and posts the journal entries in parallel background jobs, one per chunk.
+		The Payroll Entry is marked as submitted once all chunks are completed"""
+		component_rows = len(accrual_aggregates["earnings"]) + len(accrual_aggregates["deductions"])
+
+		self.db_set({"status": "Queued", "error_message": ""})
+		self.enqueue_chunks(
+			"Accrual",
+			[d.name for d in submitted_salary_slips],
+			chunk_size=max(row_limit - component_rows, 1),
+		)
+
+	def is_accrual_pending(self) -> bool:
+		"""Returns True if submitted salary slips are not posted in an accrual journal entry yet"""
+		return self.has_pending_accrual_jv_entries() or bool(self.get_sal_slip_list(ss_status=1))
+
+	def has_pending_accrual_jv_entries(self) -> bool:
+		"""Returns True if parts of a split accrual journal entry are not posted yet"""
+		return bool(
+			frappe.db.exists(
+				"Payroll Entry Chunk",
+				{
+					"parent": self.name,
+					"parenttype": self.doctype,
+					"process": "Accrual",
+					"status": ("!=", "Completed"),
+				},
+			)
+		)
+
+	def make_accrual_jv_entry_from_aggregates(
+		self, submitted_salary_slips: list, accrual_aggregates: dict, employee_wise_accounting_enabled
+	) -> None:
+		earnings = accrual_aggregates["earnings"]
+		deductions = accrual_aggregates["deductions"]
+		self._advance_deduction_entries = accrual_aggregates["advance_deductions"]
+		self.employee_based_payroll_payable_entries = accrual_aggregates["employee_payables"]
+
 		precision = frappe.get_precision("Journal Entry Account", "debit_in_account_currency")
 
 		if earnings or deductions:
@@ -798,7 +1036,7 @@ class PayrollEntry(Document):
 	):
 		conversion_rate = 1
 		exchange_rate = self.exchange_rate
-		account_currency = frappe.db.get_value("Account", account, "account_currency")
+		account_currency = frappe.get_cached_value("Account", account, "account_currency")
 
 		if account_currency not in currencies:
 			currencies.append(account_currency)
@@ -814,6 +1052,12 @@ class PayrollEntry(Document):
 	@frappe.whitelist()
 	def make_bank_entry(self):
 		self.check_permission("write")
+		if self.is_accrual_pending():
+			frappe.throw(
+				_("Bank Entry can be made once all accrual Journal Entries are posted"),
+				title=_("Accrual Pending"),
+			)
+
 		self.employee_based_payroll_payable_entries = {}
 		employee_wise_accounting_enabled = frappe.db.get_single_value(
 			"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
@@ -824,25 +1068,8 @@ class PayrollEntry(Document):
 
 		for salary_detail in salary_slips:
 			if salary_detail.parentfield == "earnings":
-				(
-					is_flexible_benefit,
-					only_tax_impact,
-					create_separate_je,
-					statistical_component,
-				) = frappe.db.get_value(
-					"Salary Component",
-					salary_detail.salary_component,
-					(
-						"is_flexible_benefit",
-						"only_tax_impact",
-						"create_separate_payment_entry_against_benefit_claim",
-						"statistical_component",
-					),
-					cache=True,
-				)
-
-				if only_tax_impact != 1 and statistical_component != 1:
-					if is_flexible_benefit == 1 and create_separate_je == 1:
+				if salary_detail.only_tax_impact != 1 and salary_detail.statistical_component != 1:
+					if salary_detail.is_flexible_benefit == 1 and salary_detail.create_separate_je == 1:
 						self.set_accounting_entries_for_bank_entry(
 							salary_detail.amount, salary_detail.salary_component
 						)
@@ -857,11 +1084,7 @@ class PayrollEntry(Document):
 						salary_slip_total += salary_detail.amount
 
 			if salary_detail.parentfield == "deductions":
-				statistical_component = frappe.db.get_value(
-					"Salary Component", salary_detail.salary_component, "statistical_component", cache=True
-				)
-
-				if not statistical_component:
+				if not salary_detail.statistical_component:
 					if employee_wise_accounting_enabled:
 						self.set_employee_based_payroll_payable_entries(
 							"deductions",
@@ -876,20 +1099,35 @@ class PayrollEntry(Document):
 			self.set_accounting_entries_for_bank_entry(salary_slip_total, "salary")
 
 	def get_salary_slip_details(self):
+		"""Returns employee and component wise totals of the submitted salary slips
+		along with the salary component properties needed for the bank entry"""
 		SalarySlip = frappe.qb.DocType("Salary Slip")
 		SalaryDetail = frappe.qb.DocType("Salary Detail")
+		SalaryComponent = frappe.qb.DocType("Salary Component")
+
+		component_properties = (
+			SalaryComponent.is_flexible_benefit,
+			SalaryComponent.only_tax_impact,
+			SalaryComponent.create_separate_payment_entry_against_benefit_claim,
+			SalaryComponent.statistical_component,
+		)
 
 		return (
 			frappe.qb.from_(SalarySlip)
 			.join(SalaryDetail)
 			.on(SalarySlip.name == SalaryDetail.parent)
+			.join(SalaryComponent)
+			.on(SalaryDetail.salary_component == SalaryComponent.name)
 			.select(
-				SalarySlip.name,
 				SalarySlip.employee,
 				SalarySlip.salary_structure,
 				SalaryDetail.salary_component,
-				SalaryDetail.amount,
 				SalaryDetail.parentfield,
+				Sum(SalaryDetail.amount).as_("amount"),
+				SalaryComponent.is_flexible_benefit,
+				SalaryComponent.only_tax_impact,
+				SalaryComponent.create_separate_payment_entry_against_benefit_claim.as_("create_separate_je"),
+				SalaryComponent.statistical_component,
 			)
 			.where(
 				(SalarySlip.docstatus == 1)
@@ -897,9 +1135,38 @@ class PayrollEntry(Document):
 				& (SalarySlip.end_date <= self.end_date)
 				& (SalarySlip.payroll_entry == self.name)
 			)
+			.groupby(
+				SalarySlip.employee,
+				SalarySlip.salary_structure,
+				SalaryDetail.salary_component,
+				SalaryDetail.parentfield,
+				*component_properties,
+			)
 		).run(as_dict=True)
 
 	def set_accounting_entries_for_bank_entry(self, je_payment_amount, user_remark):
+		if not self.employee_based_payroll_payable_entries:
+			self.make_bank_journal_entry(je_payment_amount, user_remark)
+			return
+
+		employee_payables = self.employee_based_payroll_payable_entries
+		self.set_payroll_cost_centers(
+			[
+				frappe._dict(employee=employee, salary_structure=details.get("salary_structure"))
+				for employee, details in employee_payables.items()
+			]
+		)
+
+		# very large bank entries are split into multiple journal entries by employee
+		employees = list(employee_payables)
+		for batch in create_batch(employees, get_journal_entry_row_limit() or len(employees)):
+			payables = {employee: employee_payables[employee] for employee in batch}
+			payment_amount = sum(
+				details.get("earnings", 0) - details.get("deductions", 0) for details in payables.values()
+			)
+			self.make_bank_journal_entry(payment_amount, user_remark, payables)
+
+	def make_bank_journal_entry(self, je_payment_amount, user_remark, employee_payables=None):
 		payroll_payable_account = self.payroll_payable_account
 		precision = frappe.get_precision("Journal Entry Account", "debit_in_account_currency")
 
@@ -924,8 +1191,8 @@ class PayrollEntry(Document):
 			)
 		)
 
-		if self.employee_based_payroll_payable_entries:
-			for employee, employee_details in self.employee_based_payroll_payable_entries.items():
+		if employee_payables:
+			for employee, employee_details in employee_payables.items():
 				je_payment_amount = employee_details.get("earnings", 0) - (
 					employee_details.get("deductions", 0)
 				)
@@ -995,53 +1262,67 @@ class PayrollEntry(Document):
 		)
 
 	@frappe.whitelist()
-	def get_employees_with_unmarked_attendance(self) -> list[dict] | None:
+	def get_unmarked_attendance(
+		self, start: int = 0, page_length: int = UNMARKED_ATTENDANCE_PAGE_LENGTH
+	) -> dict | None:
+		"""Returns a page of employees with unmarked attendance along with the total count,
+		so that the form can render large lists page by page"""
 		if not self.validate_attendance:
 			return
 
-		unmarked_attendance = []
-		employee_details = self.get_employee_and_attendance_details()
-		default_holiday_list = frappe.db.get_value(
-			"Company", self.company, "default_holiday_list", cache=True
-		)
+		unmarked_attendance = self.get_unmarked_attendance_query()
+		total = (frappe.qb.from_(unmarked_attendance).select(Count("*"))).run()[0][0]
 
-		for emp in self.employees:
-			details = next((record for record in employee_details if record.name == emp.employee), None)
-			if not details:
-				continue
+		return {
+			"data": unmarked_attendance.limit(cint(page_length)).offset(cint(start)).run(as_dict=True),
+			"total": total,
+		}
 
-			start_date, end_date = self.get_payroll_dates_for_employee(details)
-			holidays = self.get_holidays_count(
-				details.holiday_list or default_holiday_list, start_date, end_date
-			)
-			payroll_days = date_diff(end_date, start_date) + 1
-			unmarked_days = payroll_days - (holidays + details.attendance_count)
+	@frappe.whitelist()
+	def get_employees_with_unmarked_attendance(self) -> list[dict] | None:
+		if not self.validate_attendance:
+			return
 
-			if unmarked_days > 0:
-				unmarked_attendance.append(
-					{"employee": emp.employee, "employee_name": emp.employee_name, "unmarked_days": unmarked_days}
-				)
+		return self.get_unmarked_attendance_query().run(as_dict=True)
 
-		return unmarked_attendance
-
-	def get_employee_and_attendance_details(self) -> list[dict]:
-		"""Returns a list of employee and attendance details like
-		[
-		        {
-		                "name": "HREMP00001",
-		                "date_of_joining": "2019-01-01",
-		                "relieving_date": "2022-01-01",
-		                "holiday_list": "Holiday List Company",
-		                "attendance_count": 22
-		        }
-		]
-		"""
-		employees = [emp.employee for emp in self.employees]
+	def get_unmarked_attendance_query(self):
+		"""Returns a query for employees with unmarked attendance like
+		[{"employee": "HREMP00001", "employee_name": "Jane", "unmarked_days": 3}]
 
+		Unmarked days are the days between the employee's payroll dates (the payroll period limited
+		by joining and relieving dates) that are neither holidays nor have submitted attendance"""
 		Employee = frappe.qb.DocType("Employee")
 		Attendance = frappe.qb.DocType("Attendance")
+		Holiday = frappe.qb.DocType("Holiday")
 
-		return (
+		default_holiday_list = frappe.db.get_value(
+			"Company", self.company, "default_holiday_list", cache=True
+		)
+		start_date = (
+			frappe.qb.terms.Case()
+			.when(Employee.date_of_joining > self.start_date, Employee.date_of_joining)
+			.else_(self.start_date)
+		)
+		end_date = (
+			frappe.qb.terms.Case()
+			.when(Employee.relieving_date < self.end_date, Employee.relieving_date)
+			.else_(self.end_date)
+		)
+		payroll_days = frappe.qb.terms.Case()
+		for days, employees in self.get_employees_by_payroll_days().items():
+			payroll_days = payroll_days.when(Employee.name.isin(employees), days)
+		payroll_days = payroll_days.else_(0)
+
+		holidays = (
+			frappe.qb.from_(Holiday)
+			.select(Count(Holiday.name))
+			.where(
+				(Holiday.parent == Coalesce(NullIf(Employee.holiday_list, ""), default_holiday_list))
+				& (Holiday.holiday_date.between(start_date, end_date))
+			)
+		)
+
+		employees = (
 			frappe.qb.from_(Employee)
 			.left_join(Attendance)
 			.on(
@@ -1050,46 +1331,42 @@ class PayrollEntry(Document):
 				& (Attendance.docstatus == 1)
 			)
 			.select(
-				Employee.name,
-				Employee.date_of_joining,
-				Employee.relieving_date,
-				Employee.holiday_list,
-				Count(Attendance.name).as_("attendance_count"),
+				Employee.name.as_("employee"),
+				Employee.employee_name,
+				(payroll_days - holidays - Count(Attendance.name)).as_("unmarked_days"),
 			)
-			.where(Employee.name.isin(employees))
+			.where(Employee.name.isin([emp.employee for emp in self.employees]))
 			.groupby(Employee.name)
-		).run(as_dict=True)
-
-	def get_payroll_dates_for_employee(self, employee_details: dict) -> tuple[str, str]:
-		start_date = self.start_date
-		if employee_details.date_of_joining > getdate(self.start_date):
-			start_date = employee_details.date_of_joining
-
-		end_date = self.end_date
-		if employee_details.relieving_date and employee_details.relieving_date < getdate(self.end_date):
-			end_date = employee_details.relieving_date
-
-		return start_date, end_date
-
-	def get_holidays_count(self, holiday_list: str, start_date: str, end_date: str) -> float:
-		"""Returns number of holidays between start and end dates in the holiday list"""
-		if not hasattr(self, "_holidays_between_dates"):
-			self._holidays_between_dates = {}
-
-		key = f"{start_date}-{end_date}-{holiday_list}"
-		if key in self._holidays_between_dates:
-			return self._holidays_between_dates[key]
+		)
 
-		holidays = frappe.db.get_all(
-			"Holiday",
-			filters={"parent": holiday_list, "holiday_date": ("between", [start_date, end_date])},
-			fields=["COUNT(*) as holidays_count"],
-		)[0]
+		return (
+			frappe.qb.from_(employees)
+			.select(employees.employee, employees.employee_name, employees.unmarked_days)
+			.where(employees.unmarked_days > 0)
+			.orderby(employees.employee)
+		)
 
-		if holidays:
-			self._holidays_between_dates[key] = holidays.holidays_count
+	def get_employees_by_payroll_days(self) -> dict[int, list[str]]:
+		"""Returns employees grouped by the number of days between their payroll dates.
+		Computed here since date differences in SQL are not portable across databases"""
+		start_date, end_date = getdate(self.start_date), getdate(self.end_date)
+		employees = {}
+
+		for employee in frappe.get_all(
+			"Employee",
+			filters={"name": ("in", [emp.employee for emp in self.employees])},
+			fields=["name", "date_of_joining", "relieving_date"],
+		):
+			days = (
+				date_diff(
+					min(end_date, employee.relieving_date or end_date),
+					max(start_date, employee.date_of_joining or start_date),
+				)
+				+ 1
+			)
+			employees.setdefault(days, []).append(employee.name)
 
-		return self._holidays_between_dates.get(key) or 0
+		return employees
 
 
 def get_salary_structure(
@@ -1342,6 +1619,11 @@ def log_payroll_failure(process, payroll_entry, error):
 	error_log = frappe.log_error(
 		title=_("Salary Slip {0} failed for Payroll Entry {1}").format(process, payroll_entry.name)
 	)
+	error_message = get_payroll_error_message(error, error_log)
+	payroll_entry.db_set({"error_message": error_message, "status": "Failed"})
+
+
+def get_payroll_error_message(error, error_log) -> str:
 	message_log = frappe.message_log.pop() if frappe.message_log else str(error)
 
 	try:
@@ -1356,7 +1638,7 @@ def log_payroll_failure(process, payroll_entry, error):
 		get_link_to_form("Error Log", error_log.name)
 	)
 
-	payroll_entry.db_set({"error_message": error_message, "status": "Failed"})
+	return error_message
 
 
 def create_salary_slips_for_employees(employees, args, publish_progress=True):
@@ -1364,19 +1646,9 @@ def create_salary_slips_for_employees(employees, args, publish_progress=True):
 
 	try:
 		salary_slips_exist_for = get_existing_salary_slips(employees, args)
-		count = 0
 
 		employees = list(set(employees) - set(salary_slips_exist_for))
-		for emp in employees:
-			args.update({"doctype": "Salary Slip", "employee": emp})
-			frappe.get_doc(args).insert()
-
-			count += 1
-			if publish_progress:
-				frappe.publish_progress(
-					count * 100 / len(employees),
-					title=_("Creating Salary Slips..."),
-				)
+		insert_salary_slips(employees, args, publish_progress=publish_progress)
 
 		payroll_entry.db_set({"status": "Submitted", "salary_slips_created": 1, "error_message": ""})
 
@@ -1398,6 +1670,423 @@ def create_salary_slips_for_employees(employees, args, publish_progress=True):
 		frappe.publish_realtime("completed_salary_slip_creation", user=frappe.session.user)
 
 
+def get_salary_slip_chunk_size() -> int:
+	return cint(frappe.db.get_single_value("Payroll Settings", "salary_slip_chunk_size")) or 500
+
+
+def get_journal_entry_row_limit() -> int:
+	return cint(frappe.db.get_single_value("Payroll Settings", "journal_entry_row_limit"))
+
+
+def get_accrual_row_count(accrual_aggregates: dict) -> int:
+	return (
+		len(accrual_aggregates["earnings"])
+		+ len(accrual_aggregates["deductions"])
+		+ len(accrual_aggregates["advance_deductions"])
+		+ len(accrual_aggregates["employee_payables"])
+	)
+
+
+def make_accrual_jv_entry_for_chunk(payroll_entry: str, chunk: str) -> None:
+	"""Posts one part of a split accrual journal entry, for the salary slips of a Payroll Entry Chunk.
+	The Payroll Entry is marked as submitted by the last chunk to complete"""
+	payroll_entry = frappe.get_doc("Payroll Entry", payroll_entry)
+	salary_slips = json.loads(frappe.db.get_value("Payroll Entry Chunk", chunk, "records") or "[]")
+
+	frappe.db.set_value("Payroll Entry Chunk", chunk, "status", "In Progress")
+	frappe.db.commit()  # nosemgrep
+
+	try:
+		# salary slips posted by an earlier run of this chunk are skipped
+		salary_slips = frappe.get_all(
+			"Salary Slip",
+			filters={"name": ("in", salary_slips), "docstatus": 1, "journal_entry": ("is", "not set")},
+			pluck="name",
+		)
+
+		if salary_slips:
+			employee_wise_accounting_enabled = frappe.db.get_single_value(
+				"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
+			)
+			accrual_aggregates = payroll_entry.get_accrual_aggregates(
+				employee_wise_accounting_enabled, salary_slips=salary_slips
+			)
+			payroll_entry.make_accrual_jv_entry_from_aggregates(
+				[frappe._dict(name=name) for name in salary_slips],
+				accrual_aggregates,
+				employee_wise_accounting_enabled,
+			)
+
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{
+				"status": "Completed",
+				"processed_count": len(salary_slips),
+				"error_message": "",
+				"error_log": None,
+			},
+		)
+
+	except Exception as e:
+		frappe.db.rollback()
+		error_log = frappe.log_error(
+			title=_("Accrual Journal Entry failed for Payroll Entry {0}").format(payroll_entry.name)
+		)
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{
+				"status": "Failed",
+				"processed_count": 0,
+				"error_message": get_payroll_error_message(e, error_log),
+				"error_log": error_log.name,
+			},
+		)
+
+	finally:
+		frappe.db.commit()  # nosemgrep
+
+	update_payroll_entry_status_from_chunks(payroll_entry, "Accrual")
+
+
+def create_salary_slips_for_chunk(payroll_entry: str, chunk: str) -> None:
+	"""Creates salary slips for the employees in a Payroll Entry Chunk.
+	Each chunk is committed on its own so a failure only rolls back the failed chunk"""
+	payroll_entry = frappe.get_doc("Payroll Entry", payroll_entry)
+	employees = json.loads(frappe.db.get_value("Payroll Entry Chunk", chunk, "records") or "[]")
+
+	frappe.db.set_value("Payroll Entry Chunk", chunk, "status", "In Progress")
+	frappe.db.commit()  # nosemgrep
+
+	try:
+		args = payroll_entry.get_salary_slip_args()
+		salary_slips_exist_for = get_existing_salary_slips(employees, args)
+		insert_salary_slips(
+			[emp for emp in employees if emp not in salary_slips_exist_for], args, publish_progress=False
+		)
+
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{"status": "Completed", "processed_count": len(employees), "error_message": "", "error_log": None},
+		)
+
+	except Exception as e:
+		frappe.db.rollback()
+		error_log = frappe.log_error(
+			title=_("Salary Slip {0} failed for Payroll Entry {1}").format("creation", payroll_entry.name)
+		)
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{
+				"status": "Failed",
+				"processed_count": 0,
+				"error_message": get_payroll_error_message(e, error_log),
+				"error_log": error_log.name,
+			},
+		)
+
+	finally:
+		frappe.db.commit()  # nosemgrep
+
+	update_payroll_entry_status_from_chunks(payroll_entry, "Creation")
+
+
+def submit_salary_slips_for_chunk(payroll_entry: str, chunk: str) -> None:
+	"""Submits the salary slips in a Payroll Entry Chunk and stores the chunk's totals for the accrual
+	journal entry, so the journal entry can be built without keeping every submitted salary slip in memory"""
+	payroll_entry = frappe.get_doc("Payroll Entry", payroll_entry)
+	salary_slips = json.loads(frappe.db.get_value("Payroll Entry Chunk", chunk, "records") or "[]")
+
+	frappe.db.set_value("Payroll Entry Chunk", chunk, "status", "In Progress")
+	frappe.db.commit()  # nosemgrep
+
+	submitted = []
+	unsubmitted = []
+	frappe.flags.via_payroll_entry = True
+
+	try:
+		for name in salary_slips:
+			salary_slip = frappe.get_doc("Salary Slip", name)
+			if salary_slip.docstatus != 0:
+				continue
+
+			if salary_slip.net_pay < 0:
+				unsubmitted.append(name)
+			else:
+				try:
+					salary_slip.submit()
+					submitted.append(salary_slip)
+				except frappe.ValidationError:
+					unsubmitted.append(name)
+
+		accrual_aggregates = payroll_entry.get_accrual_aggregates(
+			frappe.db.get_single_value(
+				"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
+			),
+			salary_slips=[salary_slip.name for salary_slip in submitted],
+		)
+		accrual_aggregates["submitted"] = [salary_slip.name for salary_slip in submitted]
+		accrual_aggregates["unsubmitted"] = unsubmitted
+
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{
+				"status": "Completed",
+				"processed_count": len(submitted),
+				"accrual_aggregates": serialize_accrual_aggregates(accrual_aggregates),
+				"error_message": "",
+				"error_log": None,
+			},
+		)
+
+	except Exception as e:
+		frappe.db.rollback()
+		submitted = []
+		error_log = frappe.log_error(
+			title=_("Salary Slip {0} failed for Payroll Entry {1}").format("submission", payroll_entry.name)
+		)
+		frappe.db.set_value(
+			"Payroll Entry Chunk",
+			chunk,
+			{
+				"status": "Failed",
+				"processed_count": 0,
+				"error_message": get_payroll_error_message(e, error_log),
+				"error_log": error_log.name,
+			},
+		)
+
+	finally:
+		frappe.db.commit()  # nosemgrep
+		frappe.flags.via_payroll_entry = False
+
+	payroll_entry.email_salary_slip(submitted)
+	update_payroll_entry_status_from_chunks(payroll_entry, "Submission")
+
+
+def make_accrual_jv_entry_for_chunks(payroll_entry: "PayrollEntry | str") -> None:
+	"""Makes the accrual journal entry from the totals aggregated by each submission chunk.
+	If it fails, it is recorded as a failed Accrual chunk that can be retried from the form"""
+	if isinstance(payroll_entry, str):
+		payroll_entry = frappe.get_doc("Payroll Entry", payroll_entry)
+
+	# lock the payroll entry so that chunks finishing together do not post the journal entry twice
+	salary_slips_submitted = frappe.db.get_value(
+		"Payroll Entry", payroll_entry.name, "salary_slips_submitted", for_update=True
+	)
+	# a split or failed accrual journal entry is posted by its Accrual chunks
+	if salary_slips_submitted or frappe.db.exists(
+		"Payroll Entry Chunk",
+		{"parent": payroll_entry.name, "parenttype": payroll_entry.doctype, "process": "Accrual"},
+	):
+		return
+
+	chunk_aggregates = [
+		json.loads(aggregates)
+		for aggregates in frappe.get_all(
+			"Payroll Entry Chunk",
+			filters={
+				"parent": payroll_entry.name,
+				"parenttype": payroll_entry.doctype,
+				"process": "Submission",
+			},
+			pluck="accrual_aggregates",
+		)
+		if aggregates
+	]
+	unsubmitted = merge_accrual_aggregates(chunk_aggregates)["unsubmitted"]
+	submitted = payroll_entry.get_sal_slip_list(ss_status=1, as_dict=True)
+
+	try:
+		if submitted:
+			if payroll_entry.make_accrual_jv_entry(
+				submitted,
+				accrual_aggregates=get_accrual_aggregates_for_chunks(
+					payroll_entry, chunk_aggregates, submitted
+				),
+			):
+				payroll_entry.db_set(
+					{"salary_slips_submitted": 1, "status": "Submitted", "error_message": ""}
+				)
+		else:
+			payroll_entry.db_set({"status": "Submitted", "error_message": ""})
+
+		show_payroll_submission_status(submitted, unsubmitted, payroll_entry)
+
+	except Exception as e:
+		frappe.db.rollback()
+		add_failed_accrual_chunk(payroll_entry, submitted, e)
+
+	finally:
+		frappe.db.commit()  # nosemgrep
+		frappe.publish_realtime("completed_salary_slip_submission", user=frappe.session.user)
+
+
+def get_accrual_aggregates_for_chunks(
+	payroll_entry: "PayrollEntry", chunk_aggregates: list[dict], salary_slips: list
+) -> dict | None:
+	"""Returns the totals of the submission chunks along with the totals of salary slips submitted
+	outside the chunks, e.g. manually, so that the accrual journal entry covers every salary slip
+	linked to it. Returns None to recompute all totals if salary slips submitted by the chunks
+	are not among `salary_slips` anymore"""
+	salary_slips = {d.name for d in salary_slips}
+	chunk_salary_slips = {name for aggregates in chunk_aggregates for name in aggregates["submitted"]}
+	if not chunk_salary_slips <= salary_slips:
+		return None
+
+	if other_salary_slips := salary_slips - chunk_salary_slips:
+		accrual_aggregates = payroll_entry.get_accrual_aggregates(
+			frappe.db.get_single_value(
+				"Payroll Settings", "process_payroll_accounting_entry_based_on_employee"
+			),
+			salary_slips=list(other_salary_slips),
+		)
+		chunk_aggregates = [
+			*chunk_aggregates,
+			json.loads(serialize_accrual_aggregates(accrual_aggregates)),
+		]
+
+	return merge_accrual_aggregates(chunk_aggregates)
+
+
+def add_failed_accrual_chunk(payroll_entry: "PayrollEntry", salary_slips: list, error) -> None:
+	"""Records a failed accrual journal entry as a failed Accrual chunk for its salary slips,
+	so that the form offers to retry it instead of a bank entry"""
+	error_log = frappe.log_error(
+		title=_("Accrual Journal Entry failed for Payroll Entry {0}").format(payroll_entry.name)
+	)
+	error_message = get_payroll_error_message(error, error_log)
+	payroll_entry.db_set({"error_message": error_message, "status": "Failed"})
+
+	payroll_entry.append(
+		"chunks",
+		{
+			"process": "Accrual",
+			"status": "Failed",
+			"employee_count": len(salary_slips),
+			"processed_count": 0,
+			"records": json.dumps([d.name for d in salary_slips]),
+			"error_message": error_message,
+			"error_log": error_log.name,
+		},
+	).db_insert()
+
+
+def serialize_accrual_aggregates(accrual_aggregates: dict) -> str:
+	"""Converts (account, cost center) keyed totals to lists so they can be stored as JSON"""
+	return json.dumps(
+		{
+			**accrual_aggregates,
+			"earnings": [[*key, amount] for key, amount in accrual_aggregates["earnings"].items()],
+			"deductions": [[*key, amount] for key, amount in accrual_aggregates["deductions"].items()],
+		}
+	)
+
+
+def merge_accrual_aggregates(chunk_aggregates: list[dict]) -> dict:
+	merged = {
+		"earnings": {},
+		"deductions": {},
+		"advance_deductions": [],
+		"employee_payables": {},
+		"submitted": [],
+		"unsubmitted": [],
+	}
+
+	for aggregates in chunk_aggregates:
+		for component_type in ("earnings", "deductions"):
+			for account, cost_center, amount in aggregates.get(component_type, []):
+				key = (account, cost_center)
+				merged[component_type][key] = merged[component_type].get(key, 0) + amount
+
+		merged["advance_deductions"].extend(aggregates.get("advance_deductions", []))
+		merged["submitted"].extend(aggregates.get("submitted", []))
+		merged["unsubmitted"].extend(aggregates.get("unsubmitted", []))
+
+		for employee, details in aggregates.get("employee_payables", {}).items():
+			employee_details = merged["employee_payables"].setdefault(employee, {})
+			for key, value in details.items():
+				if key == "salary_structure":
+					employee_details.setdefault(key, value)
+				else:
+					employee_details[key] = employee_details.get(key, 0) + value
+
+	return merged
+
+
+def update_payroll_entry_status_from_chunks(payroll_entry: "PayrollEntry", process: str) -> None:
+	"""Sets the Payroll Entry status once all chunks of a process have finished"""
+	# lock the payroll entry so that the last of the chunks finishing together sees all statuses
+	frappe.db.get_value("Payroll Entry", payroll_entry.name, "status", for_update=True)
+
+	statuses = frappe.get_all(
+		"Payroll Entry Chunk",
+		filters={"parent": payroll_entry.name, "parenttype": payroll_entry.doctype, "process": process},
+		pluck="status",
+	)
+
+	if not statuses or any(status in ("Queued", "In Progress") for status in statuses):
+		return
+
+	failed = statuses.count("Failed")
+	if failed:
+		payroll_entry.db_set(
+			{
+				"status": "Failed",
+				"error_message": _(
+					"{0} of {1} chunks failed. Check the Processing Status table for details and retry the failed chunks."
+				).format(failed, len(statuses)),
+			}
+		)
+	elif process == "Submission":
+		make_accrual_jv_entry_for_chunks(payroll_entry)
+		return
+	elif process == "Accrual":
+		payroll_entry.db_set({"salary_slips_submitted": 1, "status": "Submitted", "error_message": ""})
+	else:
+		payroll_entry.db_set({"status": "Submitted", "salary_slips_created": 1, "error_message": ""})
+
+	frappe.db.commit()  # nosemgrep
+	frappe.publish_realtime(
+		"completed_salary_slip_creation" if process == "Creation" else "completed_salary_slip_submission",
+		user=frappe.session.user,
+	)
+
+
+def insert_salary_slips(employees: list[str], args: frappe._dict, publish_progress=True) -> None:
+	"""Inserts salary slips for employees, with the data needed for computation
+	prefetched for all employees at once instead of queried per salary slip"""
+	from hrms.payroll.doctype.salary_slip.payroll_context import PayrollContext
+	from hrms.payroll.doctype.salary_slip.salary_slip_bulk_insert import bulk_insert_salary_slips
+
+	if not employees:
+		return
+
+	payroll_context = PayrollContext(employees, args.company, args.start_date, args.end_date)
+
+	if frappe.db.get_single_value("Payroll Settings", "bulk_insert_salary_slips"):
+		bulk_insert_salary_slips(
+			employees, args, payroll_context=payroll_context, publish_progress=publish_progress
+		)
+		return
+
+	for count, emp in enumerate(employees, start=1):
+		args.update({"doctype": "Salary Slip", "employee": emp})
+		salary_slip = frappe.get_doc(args)
+		salary_slip._payroll_context = payroll_context
+		salary_slip.insert()
+
+		if publish_progress:
+			frappe.publish_progress(
+				count * 100 / len(employees),
+				title=_("Creating Salary Slips..."),
+			)
+
+
 def show_payroll_submission_status(submitted, unsubmitted, payroll_entry):
 	if not submitted and not unsubmitted:
 		frappe.msgprint(
@@ -1459,10 +2148,14 @@ def submit_salary_slips_for_employees(payroll_entry, salary_slips, publish_progr
 			if publish_progress:
 				frappe.publish_progress(count * 100 / len(salary_slips), title=_("Submitting Salary Slips..."))
 
-		if submitted:
-			payroll_entry.make_accrual_jv_entry(submitted)
+		# includes salary slips submitted manually, the accrual totals are computed for the same list
+		if salary_slips_to_post := payroll_entry.get_sal_slip_list(ss_status=1, as_dict=True):
+			accrual_jv_entry_posted = payroll_entry.make_accrual_jv_entry(salary_slips_to_post)
 			payroll_entry.email_salary_slip(submitted)
-			payroll_entry.db_set({"salary_slips_submitted": 1, "status": "Submitted", "error_message": ""})
+			if accrual_jv_entry_posted:
+				payroll_entry.db_set(
+					{"salary_slips_submitted": 1, "status": "Submitted", "error_message": ""}
+				)
 
 		show_payroll_submission_status(submitted, unsubmitted, payroll_entry)
 
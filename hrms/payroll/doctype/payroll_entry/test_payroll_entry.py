@@ -1,6 +1,8 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from unittest.mock import patch
+
 from dateutil.relativedelta import relativedelta
 
 import frappe
@@ -21,7 +23,9 @@ from hrms.hr.doctype.employee_advance.test_employee_advance import (
 from hrms.payroll.doctype.payroll_entry.payroll_entry import (
 	PayrollEntry,
 	get_end_date,
+	get_payroll_entry_bank_entries,
 	get_start_end_dates,
+	make_accrual_jv_entry_for_chunk,
 )
 from hrms.payroll.doctype.salary_component.test_salary_component import create_salary_component
 from hrms.payroll.doctype.salary_slip.salary_slip_loan_utils import if_lending_app_installed
@@ -46,12 +50,15 @@ class TestPayrollEntry(FrappeTestCase):
 	def setUp(self):
 		for dt in [
 			"Salary Slip",
+			"Salary Slip Aggregate",
+			"Salary Slip Aggregate Component",
 			"Salary Component",
 			"Salary Component Account",
 			"Payroll Entry",
 			"Salary Structure",
 			"Salary Structure Assignment",
 			"Payroll Employee Detail",
+			"Payroll Entry Chunk",
 			"Additional Salary",
 		]:
 			frappe.db.delete(dt)
@@ -358,6 +365,214 @@ class TestPayrollEntry(FrappeTestCase):
 		self.assertEqual(payroll_entry.status, "Submitted")
 		self.assertEqual(payroll_entry.error_message, "")
 
+	@change_settings("Payroll Settings", {"salary_slip_chunk_size": 1})
+	def test_chunked_salary_slip_creation(self):
+		from hrms.payroll.doctype.payroll_entry.payroll_entry import create_salary_slips_for_chunk
+
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_chunk1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_chunk2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc)
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+
+		frappe.flags.enqueue_payroll_entry = True
+		payroll_entry.submit()
+		frappe.flags.enqueue_payroll_entry = False
+		payroll_entry.reload()
+
+		# one chunk per employee, queued
+		self.assertEqual(payroll_entry.status, "Queued")
+		self.assertEqual(len(payroll_entry.chunks), 2)
+		self.assertTrue(all(chunk.status == "Queued" for chunk in payroll_entry.chunks))
+
+		# failing chunk does not rollback the successful one
+		failed_employee = frappe.parse_json(payroll_entry.chunks[1].records)[0]
+		frappe.db.set_value("Employee", failed_employee, "status", "Inactive")
+		for chunk in payroll_entry.chunks:
+			create_salary_slips_for_chunk(payroll_entry.name, chunk.name)
+
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Failed")
+		self.assertEqual(payroll_entry.chunks[0].status, "Completed")
+		self.assertEqual(payroll_entry.chunks[0].processed_count, 1)
+		self.assertEqual(payroll_entry.chunks[1].status, "Failed")
+		self.assertIsNotNone(payroll_entry.chunks[1].error_log)
+		self.assertEqual(frappe.db.count("Salary Slip", {"payroll_entry": payroll_entry.name}), 1)
+
+		# retry only re-queues the failed chunk
+		frappe.db.set_value("Employee", failed_employee, "status", "Active")
+		payroll_entry.retry_failed_chunks()
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.chunks[0].status, "Completed")
+		self.assertEqual(payroll_entry.chunks[1].status, "Queued")
+
+		create_salary_slips_for_chunk(payroll_entry.name, payroll_entry.chunks[1].name)
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Submitted")
+		self.assertEqual(payroll_entry.salary_slips_created, 1)
+		self.assertEqual(frappe.db.count("Salary Slip", {"payroll_entry": payroll_entry.name}), 2)
+
+	@change_settings("Payroll Settings", {"salary_slip_chunk_size": 1})
+	def test_chunked_salary_slip_submission(self):
+		from hrms.payroll.doctype.payroll_entry.payroll_entry import submit_salary_slips_for_chunk
+
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_submit_chunk1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_submit_chunk2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc)
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+		payroll_entry.submit()
+
+		frappe.flags.enqueue_payroll_entry = True
+		payroll_entry.submit_salary_slips()
+		frappe.flags.enqueue_payroll_entry = False
+		payroll_entry.reload()
+
+		chunks = [chunk for chunk in payroll_entry.chunks if chunk.process == "Submission"]
+		self.assertEqual(payroll_entry.status, "Queued")
+		self.assertEqual(len(chunks), 2)
+
+		for chunk in chunks:
+			submit_salary_slips_for_chunk(payroll_entry.name, chunk.name)
+
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Submitted")
+		self.assertEqual(payroll_entry.salary_slips_submitted, 1)
+
+		# one accrual journal entry for all chunks, built from the chunk aggregates
+		salary_slips = frappe.get_all(
+			"Salary Slip",
+			filters={"payroll_entry": payroll_entry.name, "docstatus": 1},
+			fields=["journal_entry", "base_gross_pay"],
+		)
+		self.assertEqual(len(salary_slips), 2)
+		self.assertEqual(len({d.journal_entry for d in salary_slips}), 1)
+
+		journal_entry = frappe.get_doc("Journal Entry", salary_slips[0].journal_entry)
+		self.assertEqual(journal_entry.total_debit, sum(d.base_gross_pay for d in salary_slips))
+
+	@change_settings("Payroll Settings", {"salary_slip_chunk_size": 1})
+	def test_failed_accrual_after_chunked_salary_slip_submission(self):
+		from hrms.payroll.doctype.payroll_entry.payroll_entry import submit_salary_slips_for_chunk
+
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_accrual_chunk1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_accrual_chunk2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc)
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+		payroll_entry.submit()
+
+		frappe.flags.enqueue_payroll_entry = True
+		payroll_entry.submit_salary_slips()
+		frappe.flags.enqueue_payroll_entry = False
+		payroll_entry.reload()
+
+		# every submission chunk completes, but the accrual journal entry fails
+		with patch.object(
+			PayrollEntry,
+			"make_accrual_jv_entry_from_aggregates",
+			side_effect=frappe.ValidationError("Accrual failed"),
+		):
+			for chunk in payroll_entry.chunks:
+				submit_salary_slips_for_chunk(payroll_entry.name, chunk.name)
+
+		payroll_entry.reload()
+		accrual_chunks = [chunk for chunk in payroll_entry.chunks if chunk.process == "Accrual"]
+		self.assertEqual(payroll_entry.status, "Failed")
+		self.assertFalse(payroll_entry.salary_slips_submitted)
+		self.assertEqual(len(accrual_chunks), 1)
+		self.assertEqual(accrual_chunks[0].status, "Failed")
+		self.assertEqual(accrual_chunks[0].employee_count, 2)
+
+		# the bank entry is not offered for salary slips that are not accrued
+		payroll_entry.run_method("onload")
+		self.assertTrue(payroll_entry.get_onload().accrual_pending)
+		self.assertFalse(payroll_entry.get_onload().submitted_ss)
+		self.assertRaises(frappe.ValidationError, payroll_entry.make_bank_entry)
+
+		payroll_entry.retry_failed_chunks()
+		make_accrual_jv_entry_for_chunk(payroll_entry.name, accrual_chunks[0].name)
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Submitted")
+		self.assertTrue(payroll_entry.salary_slips_submitted)
+
+		salary_slips = frappe.get_all(
+			"Salary Slip",
+			filters={"payroll_entry": payroll_entry.name, "docstatus": 1},
+			fields=["journal_entry", "base_gross_pay"],
+		)
+		self.assertEqual(len({d.journal_entry for d in salary_slips}), 1)
+		self.assertIsNotNone(salary_slips[0].journal_entry)
+
+		journal_entry = frappe.get_doc("Journal Entry", salary_slips[0].journal_entry)
+		self.assertEqual(journal_entry.total_debit, sum(d.base_gross_pay for d in salary_slips))
+
+	@change_settings("Payroll Settings", {"bulk_insert_salary_slips": 1})
+	def test_bulk_insert_salary_slips(self):
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee = make_employee("test_bulk_insert@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee, company_doc)
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+		payroll_entry.submit()
+
+		bulk_slip = frappe.get_doc("Salary Slip", {"payroll_entry": payroll_entry.name})
+		self.assertTrue(bulk_slip.earnings)
+		self.assertTrue(all(row.parent == bulk_slip.name for row in bulk_slip.earnings))
+
+		# recreate the slip through the regular document path and compare
+		frappe.delete_doc("Salary Slip", bulk_slip.name, force=True)
+		frappe.db.set_single_value("Payroll Settings", "bulk_insert_salary_slips", 0)
+		payroll_entry.create_salary_slips()
+		regular_slip = frappe.get_doc("Salary Slip", {"payroll_entry": payroll_entry.name})
+
+		for field in ["gross_pay", "total_deduction", "net_pay", "payment_days", "total_working_days"]:
+			self.assertEqual(bulk_slip.get(field), regular_slip.get(field), field)
+
+		for table in ["earnings", "deductions"]:
+			self.assertEqual(
+				[(row.salary_component, row.amount) for row in bulk_slip.get(table)],
+				[(row.salary_component, row.amount) for row in regular_slip.get(table)],
+			)
+
 	def test_payroll_entry_cancellation(self):
 		company_doc = frappe.get_doc("Company", "_Test Company")
 		employee = make_employee("test_employee@payroll.com", company=company_doc.name)
@@ -639,10 +854,74 @@ class TestPayrollEntry(FrappeTestCase):
 
 		self.assertEqual(debit_entries, expected_entries)
 
+	@change_settings(
+		"Payroll Settings",
+		{"process_payroll_accounting_entry_based_on_employee": 1, "journal_entry_row_limit": 1},
+	)
+	def test_split_journal_entries_for_employee_wise_accounting(self):
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_split_je1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_split_je2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc)
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = make_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+
+		# one accrual chunk per salary slip, the bank entry waits for all of them
+		payroll_entry.reload()
+		chunks = [chunk for chunk in payroll_entry.chunks if chunk.process == "Accrual"]
+		self.assertEqual(len(chunks), 2)
+		self.assertEqual(payroll_entry.status, "Queued")
+		self.assertFalse(payroll_entry.salary_slips_submitted)
+		self.assertRaises(frappe.ValidationError, payroll_entry.make_bank_entry)
+
+		make_accrual_jv_entry_for_chunk(payroll_entry.name, chunks[0].name)
+		payroll_entry.reload()
+		self.assertFalse(payroll_entry.salary_slips_submitted)
+
+		make_accrual_jv_entry_for_chunk(payroll_entry.name, chunks[1].name)
+		payroll_entry.reload()
+		self.assertTrue(payroll_entry.salary_slips_submitted)
+		self.assertEqual(payroll_entry.status, "Submitted")
+
+		# one accrual journal entry per salary slip, each balanced on its own
+		salary_slips = frappe.get_all(
+			"Salary Slip",
+			filters={"payroll_entry": payroll_entry.name, "docstatus": 1},
+			fields=["employee", "journal_entry"],
+		)
+		self.assertEqual(len({d.journal_entry for d in salary_slips}), 2)
+
+		for salary_slip in salary_slips:
+			journal_entry = frappe.get_doc("Journal Entry", salary_slip.journal_entry)
+			self.assertEqual(journal_entry.docstatus, 1)
+			self.assertEqual(journal_entry.total_debit, journal_entry.total_credit)
+
+			payable_entries = [
+				d for d in journal_entry.accounts if d.account == company_doc.default_payroll_payable_account
+			]
+			self.assertEqual(len(payable_entries), 1)
+			self.assertEqual(payable_entries[0].party, salary_slip.employee)
+
+		# bank entries are split by employee too
+		payroll_entry.make_bank_entry()
+		bank_entries = get_payroll_entry_bank_entries(payroll_entry.name)
+		self.assertEqual(len({d.name for d in bank_entries}), 2)
+
 	def test_validate_attendance(self):
 		company = frappe.get_doc("Company", "_Test Company")
 		employee = frappe.db.get_value("Employee", {"company": "_Test Company"})
 		setup_salary_structure(employee, company)
+		other_employee = make_employee("test_unmarked_attendance@payroll.com", company=company.name)
+		setup_salary_structure(other_employee, company)
 
 		dates = get_start_end_dates("Monthly", nowdate())
 		payroll_entry = get_payroll_entry(
@@ -656,7 +935,20 @@ class TestPayrollEntry(FrappeTestCase):
 		# case 1: validate unmarked attendance
 		payroll_entry.validate_attendance = True
 		employees = payroll_entry.get_employees_with_unmarked_attendance()
-		self.assertEqual(employees[0]["employee"], employee)
+		self.assertIn(employee, [d["employee"] for d in employees])
+		self.assertIn(other_employee, [d["employee"] for d in employees])
+
+		# unmarked attendance is paginated for the form
+		self.assertGreaterEqual(len(employees), 2)
+		unmarked_attendance = payroll_entry.get_unmarked_attendance(start=0, page_length=1)
+		self.assertEqual(unmarked_attendance["data"], employees[:1])
+		self.assertEqual(unmarked_attendance["total"], len(employees))
+		self.assertEqual(
+			payroll_entry.get_unmarked_attendance(start=1, page_length=1)["data"], employees[1:2]
+		)
+
+		# the cases below check attendance of a single employee
+		payroll_entry.employees = [row for row in payroll_entry.employees if row.employee == employee]
 
 		# case 2: employee should not be flagged for remaining payroll days for a mid-month relieving date
 		relieving_date = add_days(payroll_entry.start_date, 15)
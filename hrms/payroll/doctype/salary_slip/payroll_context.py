@@ -0,0 +1,274 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.query_builder.functions import Sum
+from frappe.utils import getdate
+
+from hrms.payroll.doctype.additional_salary.additional_salary import (
+	get_additional_salaries_query,
+	validate_overwritten_components,
+)
+from hrms.payroll.doctype.payroll_period.payroll_period import get_payroll_period
+from hrms.payroll.doctype.salary_slip.salary_slip import get_leave_date_mapper
+
+
+class PayrollContext:
+	"""Prefetched data for computing the salary slips of a set of employees in one payroll run.
+
+	Everything a salary slip would otherwise fetch per employee (employee details, salary structure
+	assignments, holidays, attendance, leaves, additional salaries, tax exemptions) is loaded with one
+	set based query per data set. Salary Slip reads from the context only for the employees and dates it
+	covers and falls back to its own queries otherwise.
+	"""
+
+	def __init__(self, employees: list[str], company: str, start_date: str, end_date: str):
+		self.employees = list(set(employees))
+		self.company = company
+		self.start_date = getdate(start_date)
+		self.end_date = getdate(end_date)
+		self.payroll_period = get_payroll_period(self.start_date, self.end_date, company)
+
+		self.employee_details = self.fetch_employee_details()
+		self.salary_structure_assignments = self.fetch_salary_structure_assignments()
+		self.holidays = self.fetch_holidays()
+		self.attendance = self.fetch_attendance()
+		self.lwp_or_ppl_leaves = self.fetch_lwp_or_ppl_leaves()
+		self.additional_salaries = self.fetch_additional_salaries()
+		self.tax_exemption_declarations = self.fetch_tax_exemptions(
+			"Employee Tax Exemption Declaration", "total_exemption_amount"
+		)
+		self.tax_exemption_proofs = self.fetch_tax_exemptions(
+			"Employee Tax Exemption Proof Submission", "exemption_amount"
+		)
+		self.other_incomes = self.fetch_other_incomes()
+
+	def covers(self, employee: str, start_date=None, end_date=None) -> bool:
+		"""Returns True if the prefetched data is complete for the employee and the date range"""
+		if employee not in self.employee_details:
+			return False
+
+		if start_date and getdate(start_date) < self.start_date:
+			return False
+
+		if end_date and getdate(end_date) > self.end_date:
+			return False
+
+		return True
+
+	def get_salary_structure_assignment(self, employee: str, salary_structure: str, from_date):
+		from_date = getdate(from_date)
+		for assignment in self.salary_structure_assignments.get(employee, []):
+			if assignment.salary_structure == salary_structure and assignment.from_date <= from_date:
+				return assignment
+
+	def get_holidays(self, employee: str, start_date, end_date) -> list | None:
+		"""Returns holiday dates between start and end dates from the employee's holiday list,
+		None if the employee has no holiday list"""
+		holiday_list = self.employee_details[employee].holiday_list
+		if not holiday_list:
+			return None
+
+		start_date, end_date = getdate(start_date), getdate(end_date)
+		return [d for d in self.holidays.get(holiday_list, []) if start_date <= d <= end_date]
+
+	def get_attendance(
+		self, employee: str, start_date, end_date, statuses: tuple | None = None
+	) -> list[dict]:
+		start_date, end_date = getdate(start_date), getdate(end_date)
+		return [
+			d
+			for d in self.attendance.get(employee, [])
+			if start_date <= d.attendance_date <= end_date and (not statuses or d.status in statuses)
+		]
+
+	def get_lwp_or_ppl_leaves(self, employee: str) -> frappe._dict:
+		return get_leave_date_mapper(self.lwp_or_ppl_leaves.get(employee, []))
+
+	def get_additional_salaries(self, employee: str, component_type: str) -> list[dict]:
+		comp_type = "Earning" if component_type == "earnings" else "Deduction"
+		additional_salaries = [
+			d for d in self.additional_salaries.get(employee, []) if d.type == comp_type
+		]
+
+		return validate_overwritten_components(additional_salaries, self.start_date, self.end_date)
+
+	def get_tax_exemption_amount(self, employee: str, payroll_period: str, based_on_proof: bool):
+		if not self.payroll_period or payroll_period != self.payroll_period.name:
+			return None
+
+		exemptions = self.tax_exemption_proofs if based_on_proof else self.tax_exemption_declarations
+		return exemptions.get(employee, 0)
+
+	def get_other_income(self, employee: str, payroll_period: str, company: str):
+		if not self.payroll_period or payroll_period != self.payroll_period.name or company != self.company:
+			return None
+
+		return self.other_incomes.get(employee, 0.0)
+
+	def fetch_employee_details(self) -> dict:
+		Employee = frappe.qb.DocType("Employee")
+		Company = frappe.qb.DocType("Company")
+
+		employees = (
+			frappe.qb.from_(Employee)
+			.left_join(Company)
+			.on(Employee.company == Company.name)
+			.select(
+				Employee.name,
+				Employee.status,
+				Employee.date_of_joining,
+				Employee.relieving_date,
+				Employee.holiday_list,
+				Company.default_holiday_list,
+			)
+			.where(Employee.name.isin(self.employees))
+		).run(as_dict=True)
+
+		for employee in employees:
+			employee.holiday_list = employee.holiday_list or employee.default_holiday_list
+
+		return {employee.name: employee for employee in employees}
+
+	def fetch_salary_structure_assignments(self) -> dict:
+		assignments = frappe.get_all(
+			"Salary Structure Assignment",
+			filters={
+				"employee": ("in", self.employees),
+				"from_date": ("<=", self.end_date),
+				"docstatus": 1,
+			},
+			fields=["*"],
+			order_by="from_date desc",
+		)
+
+		return group_by_employee(assignments)
+
+	def fetch_holidays(self) -> dict:
+		holiday_lists = {d.holiday_list for d in self.employee_details.values() if d.holiday_list}
+		if not holiday_lists:
+			return {}
+
+		Holiday = frappe.qb.DocType("Holiday")
+		holidays = (
+			frappe.qb.from_(Holiday)
+			.select(Holiday.parent, Holiday.holiday_date)
+			.where(
+				(Holiday.parent.isin(list(holiday_lists)))
+				& (Holiday.holiday_date.between(self.start_date, self.end_date))
+			)
+			.orderby(Holiday.holiday_date)
+		).run(as_dict=True)
+
+		holidays_by_list = defaultdict(list)
+		for holiday in holidays:
+			holidays_by_list[holiday.parent].append(holiday.holiday_date)
+
+		return holidays_by_list
+
+	def fetch_attendance(self) -> dict:
+		Attendance = frappe.qb.DocType("Attendance")
+		attendance = (
+			frappe.qb.from_(Attendance)
+			.select(
+				Attendance.employee, Attendance.attendance_date, Attendance.status, Attendance.leave_type
+			)
+			.where(
+				(Attendance.employee.isin(self.employees))
+				& (Attendance.docstatus == 1)
+				& (Attendance.attendance_date.between(self.start_date, self.end_date))
+			)
+		).run(as_dict=True)
+
+		return group_by_employee(attendance)
+
+	def fetch_lwp_or_ppl_leaves(self) -> dict:
+		LeaveApplication = frappe.qb.DocType("Leave Application")
+		LeaveType = frappe.qb.DocType("Leave Type")
+
+		leaves = (
+			frappe.qb.from_(LeaveApplication)
+			.inner_join(LeaveType)
+			.on(LeaveType.name == LeaveApplication.leave_type)
+			.select(
+				LeaveApplication.employee,
+				LeaveApplication.name,
+				LeaveType.is_ppl,
+				LeaveType.fraction_of_daily_salary_per_leave,
+				LeaveType.include_holiday,
+				LeaveApplication.from_date,
+				LeaveApplication.to_date,
+				LeaveApplication.half_day,
+				LeaveApplication.half_day_date,
+			)
+			.where(
+				((LeaveType.is_lwp == 1) | (LeaveType.is_ppl == 1))
+				& (LeaveApplication.docstatus == 1)
+				& (LeaveApplication.status == "Approved")
+				& (LeaveApplication.employee.isin(self.employees))
+				& ((LeaveApplication.salary_slip.isnull()) | (LeaveApplication.salary_slip == ""))
+				& (LeaveApplication.from_date >= self.start_date)
+				& (LeaveApplication.to_date <= self.end_date)
+			)
+		).run(as_dict=True)
+
+		return group_by_employee(leaves)
+
+	def fetch_additional_salaries(self) -> dict:
+		AdditionalSalary = frappe.qb.DocType("Additional Salary")
+		additional_salaries = (
+			get_additional_salaries_query(self.start_date, self.end_date)
+			.select(AdditionalSalary.employee)
+			.where(AdditionalSalary.employee.isin(self.employees))
+		).run(as_dict=True)
+
+		return group_by_employee(additional_salaries)
+
+	def fetch_tax_exemptions(self, doctype: str, amount_field: str) -> dict:
+		if not self.payroll_period:
+			return {}
+
+		exemptions = frappe.get_all(
+			doctype,
+			filters={
+				"employee": ("in", self.employees),
+				"payroll_period": self.payroll_period.name,
+				"docstatus": 1,
+			},
+			fields=["employee", amount_field],
+		)
+
+		exemption_map = {}
+		for d in exemptions:
+			exemption_map.setdefault(d.employee, d.get(amount_field) or 0)
+
+		return exemption_map
+
+	def fetch_other_incomes(self) -> dict:
+		if not self.payroll_period:
+			return {}
+
+		OtherIncome = frappe.qb.DocType("Employee Other Income")
+		other_incomes = (
+			frappe.qb.from_(OtherIncome)
+			.select(OtherIncome.employee, Sum(OtherIncome.amount).as_("total_amount"))
+			.where(
+				(OtherIncome.employee.isin(self.employees))
+				& (OtherIncome.payroll_period == self.payroll_period.name)
+				& (OtherIncome.company == self.company)
+				& (OtherIncome.docstatus == 1)
+			)
+			.groupby(OtherIncome.employee)
+		).run(as_dict=True)
+
+		return {d.employee: d.total_amount or 0.0 for d in other_incomes}
+
+
+def group_by_employee(records: list[dict]) -> dict[str, list]:
+	grouped = defaultdict(list)
+	for record in records:
+		grouped[record.employee].append(record)
+
+	return grouped
@@ -3,7 +3,10 @@
 
 
 import unicodedata
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import date
+from types import CodeType
 
 import frappe
 from frappe import _, msgprint
@@ -51,6 +54,10 @@ from hrms.payroll.doctype.salary_slip.salary_slip_loan_utils import (
 	make_loan_repayment_entry,
 	set_loan_repayment,
 )
+from hrms.payroll.doctype.salary_slip_aggregate.salary_slip_aggregate import (
+	get_salary_slip_aggregate,
+	update_salary_slip_aggregate,
+)
 from hrms.payroll.utils import sanitize_expression
 from hrms.utils.holiday_list import get_holiday_dates_between
 
@@ -60,6 +67,14 @@ LEAVE_TYPE_MAP = "leave_type_map"
 SALARY_COMPONENT_VALUES = "salary_component_values"
 TAX_COMPONENTS_BY_COMPANY = "tax_components_by_company"
 
+# process level cache of compiled formulas and conditions, see `_get_compiled_code`
+MAX_COMPILED_CODE_CACHE_SIZE = 10000
+_compiled_code_cache: dict[str, CodeType] = {}
+
+# process level cache of compiled income tax slabs, see `get_compiled_tax_slab`
+MAX_COMPILED_TAX_SLAB_CACHE_SIZE = 500
+_compiled_tax_slab_cache: dict[tuple, "CompiledTaxSlab"] = {}
+
 
 class SalarySlip(TransactionBase):
 	def __init__(self, *args, **kwargs):
@@ -82,22 +97,28 @@ class SalarySlip(TransactionBase):
 	@property
 	def joining_date(self):
 		if not hasattr(self, "__joining_date"):
-			self.__joining_date = frappe.get_cached_value(
-				"Employee",
-				self.employee,
-				"date_of_joining",
-			)
+			if context := self.get_payroll_context():
+				self.__joining_date = context.employee_details[self.employee].date_of_joining
+			else:
+				self.__joining_date = frappe.get_cached_value(
+					"Employee",
+					self.employee,
+					"date_of_joining",
+				)
 
 		return self.__joining_date
 
 	@property
 	def relieving_date(self):
 		if not hasattr(self, "__relieving_date"):
-			self.__relieving_date = frappe.get_cached_value(
-				"Employee",
-				self.employee,
-				"relieving_date",
-			)
+			if context := self.get_payroll_context():
+				self.__relieving_date = context.employee_details[self.employee].relieving_date
+			else:
+				self.__relieving_date = frappe.get_cached_value(
+					"Employee",
+					self.employee,
+					"relieving_date",
+				)
 
 		return self.__relieving_date
 
@@ -130,6 +151,13 @@ class SalarySlip(TransactionBase):
 
 		return self.__actual_end_date
 
+	def get_payroll_context(self, start_date=None, end_date=None):
+		"""Returns the data prefetched by Payroll Entry for this run,
+		if it covers the employee and the given dates"""
+		context = getattr(self, "_payroll_context", None)
+		if context and context.covers(self.employee, start_date, end_date):
+			return context
+
 	def validate(self):
 		self.status = self.get_status()
 		validate_active_employee(self.employee)
@@ -184,6 +212,7 @@ class SalarySlip(TransactionBase):
 			self.update_status(self.name)
 
 			make_loan_repayment_entry(self)
+			update_salary_slip_aggregate(self, *self.get_year_to_date_period())
 
 			if not frappe.flags.via_payroll_entry and not frappe.flags.in_patch:
 				email_salary_slip = cint(
@@ -216,6 +245,7 @@ class SalarySlip(TransactionBase):
 		self.set_status()
 		self.update_status()
 		self.update_payment_status_for_gratuity()
+		update_salary_slip_aggregate(self, *self.get_year_to_date_period(), cancel=True)
 
 		cancel_loan_repayment_entry(self)
 		self.publish_update()
@@ -505,14 +535,19 @@ class SalarySlip(TransactionBase):
 			)
 
 		# exclude days for which attendance has been marked
-		marked_days = frappe.db.count(
-			"Attendance",
-			filters={
-				"attendance_date": ["between", [self.actual_start_date, self.actual_end_date]],
-				"employee": self.employee,
-				"docstatus": 1,
-			},
-		)
+		if context := self.get_payroll_context(self.actual_start_date, self.actual_end_date):
+			marked_days = len(
+				context.get_attendance(self.employee, self.actual_start_date, self.actual_end_date)
+			)
+		else:
+			marked_days = frappe.db.count(
+				"Attendance",
+				filters={
+					"attendance_date": ["between", [self.actual_start_date, self.actual_end_date]],
+					"employee": self.employee,
+					"docstatus": 1,
+				},
+			)
 		unmarked_days -= marked_days
 
 		return unmarked_days
@@ -529,10 +564,17 @@ class SalarySlip(TransactionBase):
 		if include_holidays_in_total_working_days:
 			unmarked_days -= date_diff(end_date, start_date) + 1
 		else:
+			holidays = None
+			if context := self.get_payroll_context(start_date, end_date):
+				holidays = context.get_holidays(self.employee, start_date, end_date)
+
 			# exclude only if not holidays
 			for days in range(date_diff(end_date, start_date) + 1):
 				date = add_days(end_date, -days)
-				if not is_holiday(self.employee, date):
+				if holidays is not None:
+					if getdate(date) not in holidays:
+						unmarked_days -= 1
+				elif not is_holiday(self.employee, date):
 					unmarked_days -= 1
 
 		return unmarked_days
@@ -543,7 +585,10 @@ class SalarySlip(TransactionBase):
 			return 0
 
 		if self.relieving_date:
-			employee_status = frappe.db.get_value("Employee", self.employee, "status")
+			if context := self.get_payroll_context():
+				employee_status = context.employee_details[self.employee].status
+			else:
+				employee_status = frappe.db.get_value("Employee", self.employee, "status")
 			if self.relieving_date < getdate(self.start_date) and employee_status != "Left":
 				frappe.throw(_("Employee relieved on {0} must be set as 'Left'").format(self.relieving_date))
 
@@ -556,6 +601,11 @@ class SalarySlip(TransactionBase):
 		return payment_days
 
 	def get_holidays_for_employee(self, start_date, end_date):
+		if context := self.get_payroll_context(start_date, end_date):
+			holiday_dates = context.get_holidays(self.employee, start_date, end_date)
+			if holiday_dates is not None:
+				return holiday_dates
+
 		holiday_list = get_holiday_list_for_employee(self.employee)
 		key = f"{holiday_list}:{start_date}:{end_date}"
 		holiday_dates = frappe.cache().hget(HOLIDAYS_BETWEEN_DATES, key)
@@ -570,11 +620,14 @@ class SalarySlip(TransactionBase):
 		self, holidays, working_days_list, daily_wages_fraction_for_half_day
 	):
 		lwp = 0
-		leaves = get_lwp_or_ppl_for_date_range(
-			self.employee,
-			self.start_date,
-			self.end_date,
-		)
+		if context := self.get_payroll_context(self.start_date, self.end_date):
+			leaves = context.get_lwp_or_ppl_leaves(self.employee)
+		else:
+			leaves = get_lwp_or_ppl_for_date_range(
+				self.employee,
+				self.start_date,
+				self.end_date,
+			)
 
 		for d in working_days_list:
 			if self.relieving_date and d > self.relieving_date:
@@ -620,6 +673,11 @@ class SalarySlip(TransactionBase):
 		return frappe.cache().get_value(LEAVE_TYPE_MAP, _get_leave_type_map)
 
 	def get_employee_attendance(self, start_date, end_date):
+		if context := self.get_payroll_context(start_date, end_date):
+			return context.get_attendance(
+				self.employee, start_date, end_date, statuses=("Absent", "Half Day", "On Leave")
+			)
+
 		attendance = frappe.qb.DocType("Attendance")
 
 		attendance_details = (
@@ -711,18 +769,23 @@ class SalarySlip(TransactionBase):
 			doc.append("earnings", wages_row)
 
 	def set_salary_structure_assignement(self):
-		self._salary_structure_assignment = frappe.db.get_value(
-			"Salary Structure Assignment",
-			{
-				"employee": self.employee,
-				"salary_structure": self.salary_structure,
-				"from_date": ("<=", self.actual_start_date),
-				"docstatus": 1,
-			},
-			"*",
-			order_by="from_date desc",
-			as_dict=True,
-		)
+		if context := self.get_payroll_context():
+			self._salary_structure_assignment = context.get_salary_structure_assignment(
+				self.employee, self.salary_structure, self.actual_start_date
+			)
+		else:
+			self._salary_structure_assignment = frappe.db.get_value(
+				"Salary Structure Assignment",
+				{
+					"employee": self.employee,
+					"salary_structure": self.salary_structure,
+					"from_date": ("<=", self.actual_start_date),
+					"docstatus": 1,
+				},
+				"*",
+				order_by="from_date desc",
+				as_dict=True,
+			)
 
 		if not self._salary_structure_assignment:
 			frappe.throw(
@@ -1221,9 +1284,12 @@ class SalarySlip(TransactionBase):
 						self.update_component_row(frappe._dict(last_benefit.struct_row), amount, "earnings")
 
 	def add_additional_salary_components(self, component_type):
-		additional_salaries = get_additional_salaries(
-			self.employee, self.start_date, self.end_date, component_type
-		)
+		if context := self.get_payroll_context(self.start_date, self.end_date):
+			additional_salaries = context.get_additional_salaries(self.employee, component_type)
+		else:
+			additional_salaries = get_additional_salaries(
+				self.employee, self.start_date, self.end_date, component_type
+			)
 
 		for additional_salary in additional_salaries:
 			self.update_component_row(
@@ -1518,6 +1584,23 @@ class SalarySlip(TransactionBase):
 		variable_based_on_taxable_salary=0,
 		field_to_select="amount",
 	):
+		aggregate = self.get_salary_slip_aggregate()
+		if (
+			aggregate
+			and getdate(start_date) == getdate(aggregate.period_start_date)
+			and getdate(end_date) <= getdate(aggregate.period_end_date)
+			and aggregate.includes_all_slips_till(end_date)
+		):
+			return aggregate.get_total(
+				component_type=parentfield,
+				salary_component=salary_component,
+				is_tax_applicable=is_tax_applicable,
+				is_flexible_benefit=is_flexible_benefit,
+				exempted_from_income_tax=exempted_from_income_tax,
+				variable_based_on_taxable_salary=variable_based_on_taxable_salary,
+				field_to_select=field_to_select,
+			)
+
 		ss = frappe.qb.DocType("Salary Slip")
 		sd = frappe.qb.DocType("Salary Detail")
 
@@ -1741,7 +1824,17 @@ class SalarySlip(TransactionBase):
 	def get_total_exemption_amount(self):
 		total_exemption_amount = 0
 		if self.tax_slab.allow_tax_exemption:
-			if self.deduct_tax_for_unsubmitted_tax_exemption_proof:
+			prefetched_exemption = None
+			if context := self.get_payroll_context():
+				prefetched_exemption = context.get_tax_exemption_amount(
+					self.employee,
+					self.payroll_period.name,
+					based_on_proof=self.deduct_tax_for_unsubmitted_tax_exemption_proof,
+				)
+
+			if prefetched_exemption is not None:
+				total_exemption_amount = flt(prefetched_exemption)
+			elif self.deduct_tax_for_unsubmitted_tax_exemption_proof:
 				exemption_proof = frappe.db.get_value(
 					"Employee Tax Exemption Proof Submission",
 					{"employee": self.employee, "payroll_period": self.payroll_period.name, "docstatus": 1},
@@ -1766,6 +1859,13 @@ class SalarySlip(TransactionBase):
 		return total_exemption_amount
 
 	def get_income_form_other_sources(self):
+		if context := self.get_payroll_context():
+			other_income = context.get_other_income(
+				self.employee, self.payroll_period.name, self.company
+			)
+			if other_income is not None:
+				return other_income
+
 		return (
 			frappe.get_all(
 				"Employee Other Income",
@@ -1908,21 +2008,26 @@ class SalarySlip(TransactionBase):
 	def compute_year_to_date(self):
 		year_to_date = 0
 		period_start_date, period_end_date = self.get_year_to_date_period()
+		aggregate = self.get_salary_slip_aggregate()
 
-		salary_slip_sum = frappe.get_list(
-			"Salary Slip",
-			fields=["sum(net_pay) as net_sum", "sum(gross_pay) as gross_sum"],
-			filters={
-				"employee": self.employee,
-				"start_date": [">=", period_start_date],
-				"end_date": ["<", period_end_date],
-				"name": ["!=", self.name],
-				"docstatus": 1,
-			},
-		)
+		if aggregate and aggregate.includes_all_slips_till(add_days(period_end_date, -1)):
+			year_to_date = flt(aggregate.net_pay)
+			gross_year_to_date = flt(aggregate.gross_pay)
+		else:
+			salary_slip_sum = frappe.get_list(
+				"Salary Slip",
+				fields=["sum(net_pay) as net_sum", "sum(gross_pay) as gross_sum"],
+				filters={
+					"employee": self.employee,
+					"start_date": [">=", period_start_date],
+					"end_date": ["<", period_end_date],
+					"name": ["!=", self.name],
+					"docstatus": 1,
+				},
+			)
 
-		year_to_date = flt(salary_slip_sum[0].net_sum) if salary_slip_sum else 0.0
-		gross_year_to_date = flt(salary_slip_sum[0].gross_sum) if salary_slip_sum else 0.0
+			year_to_date = flt(salary_slip_sum[0].net_sum) if salary_slip_sum else 0.0
+			gross_year_to_date = flt(salary_slip_sum[0].gross_sum) if salary_slip_sum else 0.0
 
 		year_to_date += self.net_pay
 		gross_year_to_date += self.gross_pay
@@ -1932,25 +2037,38 @@ class SalarySlip(TransactionBase):
 	def compute_month_to_date(self):
 		month_to_date = 0
 		first_day_of_the_month = get_first_day(self.start_date)
-		salary_slip_sum = frappe.get_list(
-			"Salary Slip",
-			fields=["sum(net_pay) as sum"],
-			filters={
-				"employee": self.employee,
-				"start_date": [">=", first_day_of_the_month],
-				"end_date": ["<", self.start_date],
-				"name": ["!=", self.name],
-				"docstatus": 1,
-			},
-		)
+		aggregate = self.get_salary_slip_aggregate()
 
-		month_to_date = flt(salary_slip_sum[0].sum) if salary_slip_sum else 0.0
+		if (
+			aggregate
+			and getdate(aggregate.period_start_date) <= first_day_of_the_month
+			and getdate(self.start_date) <= getdate(aggregate.period_end_date)
+			and aggregate.includes_all_slips_till(add_days(first_day_of_the_month, -1))
+		):
+			# no submitted salary slip of the employee starts in this month
+			month_to_date = 0.0
+		else:
+			salary_slip_sum = frappe.get_list(
+				"Salary Slip",
+				fields=["sum(net_pay) as sum"],
+				filters={
+					"employee": self.employee,
+					"start_date": [">=", first_day_of_the_month],
+					"end_date": ["<", self.start_date],
+					"name": ["!=", self.name],
+					"docstatus": 1,
+				},
+			)
+
+			month_to_date = flt(salary_slip_sum[0].sum) if salary_slip_sum else 0.0
 
 		month_to_date += self.net_pay
 		self.month_to_date = month_to_date
 
 	def compute_component_wise_year_to_date(self):
 		period_start_date, period_end_date = self.get_year_to_date_period()
+		aggregate = self.get_salary_slip_aggregate()
+		use_aggregate = aggregate and aggregate.includes_all_slips_till(add_days(period_end_date, -1))
 
 		ss = frappe.qb.DocType("Salary Slip")
 		sd = frappe.qb.DocType("Salary Detail")
@@ -1958,6 +2076,12 @@ class SalarySlip(TransactionBase):
 		for key in ("earnings", "deductions"):
 			for component in self.get(key):
 				year_to_date = 0
+				if use_aggregate:
+					component.year_to_date = aggregate.get_total(
+						salary_component=component.salary_component
+					) + flt(component.amount)
+					continue
+
 				component_sum = (
 					frappe.qb.from_(sd)
 					.inner_join(ss)
@@ -1989,6 +2113,15 @@ class SalarySlip(TransactionBase):
 
 		return period_start_date, period_end_date
 
+	def get_salary_slip_aggregate(self):
+		"""Returns running totals of the employee's other submitted salary slips in the year to date period,
+		if they have been aggregated yet. Only reads, aggregates are written on submission and cancellation"""
+		period = self.get_year_to_date_period()
+		if getattr(self, "_salary_slip_aggregate", (None, None))[0] != period:
+			self._salary_slip_aggregate = (period, get_salary_slip_aggregate(self.employee, *period))
+
+		return self._salary_slip_aggregate[1]
+
 	def add_leave_balances(self):
 		self.set("leave_details", [])
 
@@ -2064,31 +2197,171 @@ def calculate_tax_by_tax_slab(
 	annual_taxable_earning, tax_slab, eval_globals=None, eval_locals=None
 ):
 	eval_locals.update({"annual_taxable_earning": annual_taxable_earning})
-	tax_amount = 0
-	for slab in tax_slab.slabs:
-		cond = cstr(slab.condition).strip()
-		if cond and not eval_tax_slab_condition(cond, eval_globals, eval_locals):
-			continue
-		if not slab.to_amount and annual_taxable_earning >= slab.from_amount:
-			tax_amount += (annual_taxable_earning - slab.from_amount + 1) * slab.percent_deduction * 0.01
-			continue
+	return get_compiled_tax_slab(tax_slab).calculate_tax(
+		annual_taxable_earning, eval_globals, eval_locals
+	)
+
+
+def calculate_tax_by_tax_slab_for_incomes(
+	annual_taxable_earnings: list[float], tax_slab, eval_globals=None, eval_locals=None
+) -> list[float]:
+	"""Returns the annual tax for each of the taxable earnings in one pass over the slab breakpoints.
+	`eval_locals` can be a single dict for all earnings or a list with one dict per earning"""
+	return get_compiled_tax_slab(tax_slab).calculate_tax_for_incomes(
+		annual_taxable_earnings, eval_globals, eval_locals
+	)
+
+
+def get_compiled_tax_slab(tax_slab) -> "CompiledTaxSlab":
+	"""Returns the compiled form of the Income Tax Slab, cached per process for saved slabs.
+	The key includes `modified`, so an edited slab is compiled again"""
+	if not tax_slab.name or not tax_slab.modified:
+		return CompiledTaxSlab(tax_slab)
 
-		if annual_taxable_earning >= slab.from_amount and annual_taxable_earning < slab.to_amount:
-			tax_amount += (annual_taxable_earning - slab.from_amount + 1) * slab.percent_deduction * 0.01
-		elif annual_taxable_earning >= slab.from_amount and annual_taxable_earning >= slab.to_amount:
-			tax_amount += (slab.to_amount - slab.from_amount + 1) * slab.percent_deduction * 0.01
+	key = (tax_slab.name, str(tax_slab.modified))
+	compiled_tax_slab = _compiled_tax_slab_cache.get(key)
+	if compiled_tax_slab is None:
+		compiled_tax_slab = CompiledTaxSlab(tax_slab)
 
-	# other taxes and charges on income tax
-	for d in tax_slab.other_taxes_and_charges:
-		if flt(d.min_taxable_income) and flt(d.min_taxable_income) > annual_taxable_earning:
-			continue
+		if len(_compiled_tax_slab_cache) >= MAX_COMPILED_TAX_SLAB_CACHE_SIZE:
+			_compiled_tax_slab_cache.clear()
+		_compiled_tax_slab_cache[key] = compiled_tax_slab
 
-		if flt(d.max_taxable_income) and flt(d.max_taxable_income) < annual_taxable_earning:
-			continue
+	return compiled_tax_slab
 
-		tax_amount += tax_amount * flt(d.percent) / 100
 
-	return tax_amount
+class CompiledTaxSlab:
+	"""Income Tax Slab in a form that is cheap to evaluate repeatedly.
+
+	Slab conditions are validated and compiled once. The slabs that apply to an income are turned into
+	sorted breakpoints with the slope and intercept of the tax up to the next breakpoint, so the tax for an
+	income is a binary search instead of a loop over all slabs. Breakpoints are built once per set of
+	applicable slabs, which can only vary between incomes if slabs have conditions.
+	"""
+
+	def __init__(self, tax_slab):
+		self.slabs = [
+			frappe._dict(
+				from_amount=flt(slab.from_amount),
+				to_amount=flt(slab.to_amount),
+				rate=flt(slab.percent_deduction) * 0.01,
+				condition=cstr(slab.condition).strip(),
+			)
+			for slab in tax_slab.slabs
+		]
+		for slab in self.slabs:
+			if slab.condition:
+				compile_tax_slab_condition(slab.condition)
+
+		self.has_conditions = any(slab.condition for slab in self.slabs)
+		self.other_taxes_and_charges = [
+			(flt(d.min_taxable_income), flt(d.max_taxable_income), flt(d.percent))
+			for d in tax_slab.other_taxes_and_charges
+		]
+		self._breakpoints = {}
+
+	def calculate_tax(self, annual_taxable_earning, eval_globals=None, eval_locals=None) -> float:
+		applicable_slabs = self.get_applicable_slabs(annual_taxable_earning, eval_globals, eval_locals)
+		points, slopes, intercepts = self.get_breakpoints(applicable_slabs)
+
+		index = bisect_right(points, annual_taxable_earning) - 1
+		tax_amount = 0 if index < 0 else slopes[index] * annual_taxable_earning + intercepts[index]
+
+		return self.apply_other_taxes_and_charges(annual_taxable_earning, tax_amount)
+
+	def calculate_tax_for_incomes(
+		self, annual_taxable_earnings: list[float], eval_globals=None, eval_locals=None
+	) -> list[float]:
+		incomes_by_slabs = defaultdict(list)
+		for index, annual_taxable_earning in enumerate(annual_taxable_earnings):
+			local_values = eval_locals[index] if isinstance(eval_locals, list) else eval_locals
+			if self.has_conditions:
+				local_values = {**(local_values or {}), "annual_taxable_earning": annual_taxable_earning}
+
+			applicable_slabs = self.get_applicable_slabs(annual_taxable_earning, eval_globals, local_values)
+			incomes_by_slabs[applicable_slabs].append(index)
+
+		tax_amounts = [0.0] * len(annual_taxable_earnings)
+		for applicable_slabs, indices in incomes_by_slabs.items():
+			points, slopes, intercepts = self.get_breakpoints(applicable_slabs)
+
+			# walk the sorted incomes and breakpoints together
+			segment = -1
+			for index in sorted(indices, key=lambda i: annual_taxable_earnings[i]):
+				annual_taxable_earning = annual_taxable_earnings[index]
+				while segment + 1 < len(points) and points[segment + 1] <= annual_taxable_earning:
+					segment += 1
+
+				tax_amount = (
+					0 if segment < 0 else slopes[segment] * annual_taxable_earning + intercepts[segment]
+				)
+				tax_amounts[index] = self.apply_other_taxes_and_charges(annual_taxable_earning, tax_amount)
+
+		return tax_amounts
+
+	def get_applicable_slabs(self, annual_taxable_earning, eval_globals=None, eval_locals=None) -> tuple:
+		if not self.has_conditions:
+			return tuple(range(len(self.slabs)))
+
+		return tuple(
+			index
+			for index, slab in enumerate(self.slabs)
+			if not slab.condition or eval_tax_slab_condition(slab.condition, eval_globals, eval_locals)
+		)
+
+	def get_breakpoints(self, applicable_slabs: tuple) -> tuple[list, list, list]:
+		"""Returns sorted amounts at which the tax formula changes, with the slope and intercept
+		of the tax from each amount up to the next one"""
+		if applicable_slabs not in self._breakpoints:
+			changes = defaultdict(lambda: [0.0, 0.0])
+
+			for index in applicable_slabs:
+				slab = self.slabs[index]
+
+				if slab.to_amount and slab.to_amount < slab.from_amount:
+					# the full slab amount applies from the lower limit
+					changes[slab.from_amount][1] += (slab.to_amount - slab.from_amount + 1) * slab.rate
+					continue
+
+				# (income - from amount + 1) * rate from the lower limit
+				changes[slab.from_amount][0] += slab.rate
+				changes[slab.from_amount][1] += (1 - slab.from_amount) * slab.rate
+
+				if slab.to_amount:
+					# (to amount - from amount + 1) * rate from the upper limit
+					changes[slab.to_amount][0] -= slab.rate
+					changes[slab.to_amount][1] += slab.to_amount * slab.rate
+
+			points, slopes, intercepts = sorted(changes), [], []
+			slope = intercept = 0.0
+			for point in points:
+				slope += changes[point][0]
+				intercept += changes[point][1]
+				slopes.append(slope)
+				intercepts.append(intercept)
+
+			self._breakpoints[applicable_slabs] = (points, slopes, intercepts)
+
+		return self._breakpoints[applicable_slabs]
+
+	def apply_other_taxes_and_charges(self, annual_taxable_earning, tax_amount) -> float:
+		for min_taxable_income, max_taxable_income, percent in self.other_taxes_and_charges:
+			if min_taxable_income and min_taxable_income > annual_taxable_earning:
+				continue
+
+			if max_taxable_income and max_taxable_income < annual_taxable_earning:
+				continue
+
+			tax_amount += tax_amount * percent / 100
+
+		return tax_amount
+
+
+def compile_tax_slab_condition(condition: str) -> CodeType:
+	try:
+		return _get_compiled_code(condition)
+	except SyntaxError as err:
+		frappe.throw(_("Syntax error in condition: {0} in Income Tax Slab").format(err))
 
 
 def eval_tax_slab_condition(condition, eval_globals=None, eval_locals=None):
@@ -2105,7 +2378,7 @@ def eval_tax_slab_condition(condition, eval_globals=None, eval_locals=None):
 	try:
 		condition = condition.strip()
 		if condition:
-			return frappe.safe_eval(condition, eval_globals, eval_locals)
+			return _safe_eval(condition, eval_globals, eval_locals)
 	except NameError as err:
 		frappe.throw(
 			_("{0} <br> This error can be due to missing or deleted field.").format(err),
@@ -2146,6 +2419,11 @@ def get_lwp_or_ppl_for_date_range(employee, start_date, end_date):
 		)
 	).run(as_dict=True)
 
+	return get_leave_date_mapper(leaves)
+
+
+def get_leave_date_mapper(leaves: list[dict]) -> frappe._dict:
+	"""Returns leave applications mapped by each date they cover"""
 	leave_date_mapper = frappe._dict()
 	for leave in leaves:
 		if leave.from_date == leave.to_date:
@@ -2214,9 +2492,7 @@ def _safe_eval(code: str, eval_globals: dict | None = None, eval_locals: dict |
 
 	WARNING: DO NOT use this function anywhere else outside of this file.
 	"""
-	code = unicodedata.normalize("NFKC", code)
-
-	_check_attributes(code)
+	compiled_code = _get_compiled_code(code)
 
 	whitelisted_globals = {"int": int, "float": float, "long": int, "round": round}
 	if not eval_globals:
@@ -2224,7 +2500,30 @@ def _safe_eval(code: str, eval_globals: dict | None = None, eval_locals: dict |
 
 	eval_globals["__builtins__"] = {}
 	eval_globals.update(whitelisted_globals)
-	return eval(code, eval_globals, eval_locals)  # nosemgrep
+	return eval(compiled_code, eval_globals, eval_locals)  # nosemgrep
+
+
+def _get_compiled_code(code: str) -> CodeType:
+	"""Returns the validated and compiled code object for a formula or condition.
+
+	Code objects are cached per process, keyed by the expression text, so each formula is
+	parsed and checked only once per payroll run instead of once per component per slip.
+	Since the key is the expression itself, an edited formula never hits a stale entry."""
+	compiled_code = _compiled_code_cache.get(code)
+	if compiled_code is None:
+		normalized_code = unicodedata.normalize("NFKC", code)
+		_check_attributes(normalized_code)
+		compiled_code = compile(normalized_code, "<string>", "eval")
+
+		if len(_compiled_code_cache) >= MAX_COMPILED_CODE_CACHE_SIZE:
+			_compiled_code_cache.clear()
+		_compiled_code_cache[code] = compiled_code
+
+	return compiled_code
+
+
+def clear_compiled_code_cache() -> None:
+	_compiled_code_cache.clear()
 
 
 def _check_attributes(code: str) -> None:
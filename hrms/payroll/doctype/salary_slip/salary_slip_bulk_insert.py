@@ -0,0 +1,62 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Bulk persistence for salary slips created via Payroll Entry.
+
+Each salary slip goes through the same steps as `Document.insert` (defaults, naming, link
+validation, `validate`, post save hooks), but the parent and child rows of a batch are written
+with one multi-row INSERT per table instead of one INSERT per row.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import create_batch
+
+from hrms.utils.bulk_insert import prepare_document, run_post_insert_methods, write_documents
+
+BULK_INSERT_BATCH_SIZE = 100
+
+
+def bulk_insert_salary_slips(
+	employees: list[str],
+	args: dict,
+	payroll_context=None,
+	batch_size: int = BULK_INSERT_BATCH_SIZE,
+	publish_progress: bool = False,
+) -> list[str]:
+	"""Creates salary slips for employees in batches and returns the names of the created slips"""
+	if not employees:
+		return []
+
+	# permissions are the same for every slip, check once instead of per document
+	frappe.new_doc("Salary Slip").check_permission("create")
+
+	created = []
+	for batch in create_batch(employees, batch_size):
+		salary_slips = [
+			prepare_salary_slip({**args, "employee": employee}, payroll_context) for employee in batch
+		]
+		write_documents(salary_slips)
+
+		for salary_slip in salary_slips:
+			run_post_insert_methods(salary_slip)
+
+		created.extend(salary_slip.name for salary_slip in salary_slips)
+
+		if publish_progress:
+			frappe.publish_progress(
+				len(created) * 100 / len(employees),
+				title=_("Creating Salary Slips..."),
+			)
+
+	return created
+
+
+def prepare_salary_slip(args: dict, payroll_context=None):
+	"""Runs everything `Document.insert` does before writing to the database"""
+	salary_slip = frappe.get_doc({**args, "doctype": "Salary Slip"})
+	salary_slip._payroll_context = payroll_context
+	salary_slip.flags.ignore_permissions = True
+	prepare_document(salary_slip)
+
+	return salary_slip
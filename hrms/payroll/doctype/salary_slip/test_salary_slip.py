@@ -149,6 +149,54 @@ class TestSalarySlip(FrappeTestCase):
 
 		self.assertEqual(rounded(ss.gross_pay), rounded(gross_pay))
 
+	@change_settings(
+		"Payroll Settings",
+		{"payroll_based_on": "Attendance", "consider_unmarked_attendance_as": "Absent"},
+	)
+	def test_salary_slip_with_payroll_context(self):
+		from hrms.payroll.doctype.salary_slip.payroll_context import PayrollContext
+
+		emp_id = make_employee("test_payroll_context@salary.com")
+		frappe.db.set_value("Employee", emp_id, {"relieving_date": None, "status": "Active"})
+
+		first_sunday = get_first_sunday()
+		mark_attendance(emp_id, add_days(first_sunday, 1), "Absent", ignore_validate=True)
+		mark_attendance(
+			emp_id,
+			add_days(first_sunday, 2),
+			"Half Day",
+			leave_type="Leave Without Pay",
+			ignore_validate=True,
+		)
+
+		ss = make_employee_salary_slip(emp_id, "Monthly", "Test Payroll Context")
+		fields = ["total_working_days", "payment_days", "leave_without_pay", "absent_days", "net_pay"]
+		expected = {field: ss.get(field) for field in fields}
+		frappe.delete_doc("Salary Slip", ss.name, force=True)
+
+		# slip computed from prefetched data should match the one computed via point queries
+		context = PayrollContext([emp_id], ss.company, ss.start_date, ss.end_date)
+		self.assertTrue(context.covers(emp_id, ss.start_date, ss.end_date))
+
+		salary_slip = frappe.get_doc(
+			{
+				"doctype": "Salary Slip",
+				"employee": emp_id,
+				"company": ss.company,
+				"currency": ss.currency,
+				"exchange_rate": 1,
+				"payroll_frequency": "Monthly",
+				"posting_date": ss.posting_date,
+				"start_date": ss.start_date,
+				"end_date": ss.end_date,
+			}
+		)
+		salary_slip._payroll_context = context
+		salary_slip.insert()
+
+		for field, value in expected.items():
+			self.assertEqual(salary_slip.get(field), value, field)
+
 	@change_settings(
 		"Payroll Settings",
 		{
@@ -839,7 +887,7 @@ class TestSalarySlip(FrappeTestCase):
 		)
 
 		# clear salary slip for this employee
-		frappe.db.sql("DELETE FROM `tabSalary Slip` where employee_name = 'test_ytd@salary.com'")
+		delete_salary_slips({"employee_name": "test_ytd@salary.com"})
 
 		create_salary_slips_for_payroll_period(
 			applicant, salary_structure.name, payroll_period, deduct_random=False, num=6
@@ -883,7 +931,7 @@ class TestSalarySlip(FrappeTestCase):
 		)
 
 		# clear salary slip for this employee
-		frappe.db.sql("DELETE FROM `tabSalary Slip` where employee_name = '%s'" % employee_name)
+		delete_salary_slips({"employee_name": employee_name})
 
 		create_salary_slips_for_payroll_period(
 			applicant, salary_structure.name, payroll_period, deduct_random=False, num=3
@@ -919,8 +967,8 @@ class TestSalarySlip(FrappeTestCase):
 		create_tax_slab(payroll_period, allow_tax_exemption=True)
 
 		employee = make_employee("test_tax@salary.slip")
+		delete_salary_slips({"employee": employee})
 		delete_docs = [
-			"Salary Slip",
 			"Additional Salary",
 			"Employee Tax Exemption Declaration",
 			"Employee Tax Exemption Proof Submission",
@@ -955,7 +1003,7 @@ class TestSalarySlip(FrappeTestCase):
 		except AssertionError:
 			print("\nSalary Slip - Annual tax calculation failed\n")
 			raise
-		frappe.db.sql("""delete from `tabSalary Slip` where employee=%s""", (employee))
+		delete_salary_slips({"employee": employee})
 
 		# create exemption declaration so the tax amount varies
 		create_exemption_declaration(employee, payroll_period.name)
@@ -982,7 +1030,7 @@ class TestSalarySlip(FrappeTestCase):
 			employee, payroll_period, 35000, "Leave Travel Allowance"
 		)
 
-		frappe.db.sql("""delete from `tabSalary Slip` where employee=%s""", (employee))
+		delete_salary_slips({"employee": employee})
 		data["deducted_dates"] = create_salary_slips_for_payroll_period(
 			employee, salary_structure.name, payroll_period
 		)
@@ -996,7 +1044,7 @@ class TestSalarySlip(FrappeTestCase):
 			raise
 
 		# create additional salary of 150000
-		frappe.db.sql("""delete from `tabSalary Slip` where employee=%s""", (employee))
+		delete_salary_slips({"employee": employee})
 		data["additional-1"] = create_additional_salary(employee, payroll_period, 150000)
 		data["deducted_dates"] = create_salary_slips_for_payroll_period(
 			employee, salary_structure.name, payroll_period
@@ -1058,8 +1106,8 @@ class TestSalarySlip(FrappeTestCase):
 		create_tax_slab(payroll_period, allow_tax_exemption=True)
 
 		employee = make_employee("test_tax@salary.slip")
+		delete_salary_slips({"employee": employee})
 		delete_docs = [
-			"Salary Slip",
 			"Additional Salary",
 			"Employee Tax Exemption Declaration",
 			"Employee Tax Exemption Proof Submission",
@@ -1090,7 +1138,7 @@ class TestSalarySlip(FrappeTestCase):
 		annual_tax = 23196.0
 		self.assertEqual(tax_paid, annual_tax)
 
-		frappe.db.sql("""delete from `tabSalary Slip` where employee=%s""", (employee))
+		delete_salary_slips({"employee": employee})
 
 		# ------------------------------------
 		# Recurring additional salary
@@ -1098,7 +1146,7 @@ class TestSalarySlip(FrappeTestCase):
 		end_date = add_months(payroll_period.start_date, 5)
 		create_recurring_additional_salary(employee, "Performance Bonus", 20000, start_date, end_date)
 
-		frappe.db.sql("""delete from `tabSalary Slip` where employee=%s""", (employee))
+		delete_salary_slips({"employee": employee})
 
 		create_salary_slips_for_payroll_period(
 			employee, salary_structure.name, payroll_period, deduct_random=False, num=4
@@ -1534,6 +1582,27 @@ class TestSalarySlipSafeEval(FrappeTestCase):
 		self.assertTrue(_safe_eval("'x' != 'Information Techonology'"))
 		self.assertRaises(SyntaxError, _safe_eval, "'blah'.format(1)")
 
+	def test_compiled_code_cache(self):
+		from hrms.payroll.doctype.salary_slip.salary_slip import (
+			_compiled_code_cache,
+			clear_compiled_code_cache,
+		)
+
+		clear_compiled_code_cache()
+		self.assertEqual(_safe_eval("base * 0.5", eval_locals={"base": 100}), 50)
+		compiled_code = _compiled_code_cache["base * 0.5"]
+
+		# same expression is evaluated with different data without recompiling
+		self.assertEqual(_safe_eval("base * 0.5", eval_locals={"base": 300}), 150)
+		self.assertIs(_compiled_code_cache["base * 0.5"], compiled_code)
+
+		# invalid expressions are never cached
+		self.assertRaises(SyntaxError, _safe_eval, "(x := (40+2))")
+		self.assertNotIn("(x := (40+2))", _compiled_code_cache)
+
+		clear_compiled_code_cache()
+		self.assertFalse(_compiled_code_cache)
+
 
 def make_income_tax_components():
 	tax_components = [
@@ -2004,6 +2073,20 @@ def make_leave_application(
 	return leave_application
 
 
+def delete_salary_slips(filters: dict) -> None:
+	"""Deletes salary slips without cancelling them, along with the Salary Slip Aggregates
+	of their employees, so that year to date totals are not read from deleted salary slips"""
+	employees = frappe.get_all("Salary Slip", filters=filters, pluck="employee", distinct=True)
+	aggregates = employees and frappe.get_all(
+		"Salary Slip Aggregate", filters={"employee": ("in", employees)}, pluck="name"
+	)
+	if aggregates:
+		frappe.db.delete("Salary Slip Aggregate Component", {"parent": ("in", aggregates)})
+		frappe.db.delete("Salary Slip Aggregate", {"name": ("in", aggregates)})
+
+	frappe.db.delete("Salary Slip", filters)
+
+
 def setup_test():
 	make_earning_salary_component(setup=True, company_list=["_Test Company"])
 	make_deduction_salary_component(setup=True, company_list=["_Test Company"])
@@ -2012,6 +2095,8 @@ def setup_test():
 		"Leave Application",
 		"Leave Allocation",
 		"Salary Slip",
+		"Salary Slip Aggregate",
+		"Salary Slip Aggregate Component",
 		"Attendance",
 		"Additional Salary",
 		"Employee Tax Exemption Declaration",
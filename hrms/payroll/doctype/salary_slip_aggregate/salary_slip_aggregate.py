@@ -0,0 +1,238 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Count, Max, Sum
+from frappe.utils import flt, getdate
+
+COMPONENT_FLAGS = (
+	"is_tax_applicable",
+	"is_flexible_benefit",
+	"exempted_from_income_tax",
+	"variable_based_on_taxable_salary",
+)
+
+
+class SalarySlipAggregate(Document):
+	"""Running totals of the submitted salary slips of an employee that start and end within a period.
+
+	Salary Slip reads year to date values and previous period tax figures from here instead of summing
+	all previous salary slips of the employee every time.
+	"""
+
+	def autoname(self):
+		self.name = get_aggregate_name(self.employee, self.period_start_date, self.period_end_date)
+
+	def includes_all_slips_till(self, date) -> bool:
+		"""Returns True if none of the aggregated salary slips end after the date"""
+		return not self.last_end_date or getdate(self.last_end_date) <= getdate(date)
+
+	def get_total(
+		self,
+		component_type=None,
+		salary_component=None,
+		is_tax_applicable=None,
+		is_flexible_benefit=None,
+		exempted_from_income_tax=0,
+		variable_based_on_taxable_salary=0,
+		field_to_select="amount",
+	) -> float:
+		"""Returns the total of the components matching the filters,
+		filters work like the ones in `SalarySlip.get_salary_slip_details`"""
+		total = 0.0
+
+		if self.flags.components_not_loaded:
+			self.load_components()
+
+		for row in self.components:
+			if component_type and row.component_type != component_type:
+				continue
+			if salary_component and row.salary_component != salary_component:
+				continue
+			if is_tax_applicable is not None and row.is_tax_applicable != is_tax_applicable:
+				continue
+			if is_flexible_benefit is not None and row.is_flexible_benefit != is_flexible_benefit:
+				continue
+			if exempted_from_income_tax and row.exempted_from_income_tax != exempted_from_income_tax:
+				continue
+			if (
+				variable_based_on_taxable_salary
+				and row.variable_based_on_taxable_salary != variable_based_on_taxable_salary
+			):
+				continue
+
+			total += flt(row.get(field_to_select))
+
+		return total
+
+	def load_components(self) -> None:
+		self.set(
+			"components",
+			frappe.get_all(
+				"Salary Slip Aggregate Component",
+				filters={"parent": self.name, "parenttype": self.doctype},
+				fields=[
+					"component_type",
+					"salary_component",
+					*COMPONENT_FLAGS,
+					"amount",
+					"additional_amount",
+				],
+			),
+		)
+		self.flags.components_not_loaded = False
+
+
+def get_aggregate_name(employee: str, period_start_date, period_end_date) -> str:
+	return f"{employee}-{getdate(period_start_date)}-{getdate(period_end_date)}"
+
+
+def get_salary_slip_aggregate(
+	employee: str, period_start_date, period_end_date
+) -> SalarySlipAggregate | None:
+	"""Returns the aggregate for the employee and period, or None if no salary slip has been submitted
+	since aggregates were introduced. Components are loaded only when a component total is needed"""
+	values = frappe.db.get_value(
+		"Salary Slip Aggregate",
+		get_aggregate_name(employee, period_start_date, period_end_date),
+		[
+			"name",
+			"employee",
+			"period_start_date",
+			"period_end_date",
+			"salary_slip_count",
+			"last_end_date",
+			"gross_pay",
+			"net_pay",
+		],
+		as_dict=True,
+	)
+	if not values:
+		return None
+
+	aggregate = frappe.get_doc({"doctype": "Salary Slip Aggregate", **values})
+	aggregate.flags.components_not_loaded = True
+
+	return aggregate
+
+
+def update_salary_slip_aggregate(salary_slip, period_start_date, period_end_date, cancel=False) -> None:
+	"""Adds the salary slip to the employee's aggregate for the period, or removes it on cancellation"""
+	if getdate(salary_slip.start_date) < getdate(period_start_date) or getdate(
+		salary_slip.end_date
+	) > getdate(period_end_date):
+		return
+
+	name = get_aggregate_name(salary_slip.employee, period_start_date, period_end_date)
+	# not locked here, a locking read of a missing row would make concurrent creations deadlock
+	if not frappe.db.exists("Salary Slip Aggregate", name):
+		savepoint = "salary_slip_aggregate_creation"
+		frappe.db.savepoint(savepoint)
+		try:
+			# built from submitted salary slips, so it already reflects this salary slip
+			build_salary_slip_aggregate(salary_slip.employee, period_start_date, period_end_date)
+			return
+		except frappe.DuplicateEntryError:
+			# created concurrently by another salary slip's transaction, which could not see this one.
+			# The insert waits for that transaction on the primary key, so the row is committed now
+			frappe.db.rollback(save_point=savepoint)
+
+	aggregate = frappe.get_doc("Salary Slip Aggregate", name, for_update=True)
+	factor = -1 if cancel else 1
+
+	aggregate.salary_slip_count += factor
+	aggregate.gross_pay = flt(aggregate.gross_pay) + factor * flt(salary_slip.gross_pay)
+	aggregate.net_pay = flt(aggregate.net_pay) + factor * flt(salary_slip.net_pay)
+
+	# not reset on cancellation, a later last end date only makes readers fall back to queries
+	if not cancel and aggregate.includes_all_slips_till(salary_slip.end_date):
+		aggregate.last_end_date = salary_slip.end_date
+
+	rows = {get_component_key(row): row for row in aggregate.components}
+	for component_type in ("earnings", "deductions"):
+		for detail in salary_slip.get(component_type):
+			key = get_component_key(detail, component_type)
+			row = rows.get(key)
+			if not row:
+				row = rows[key] = aggregate.append(
+					"components",
+					{
+						"component_type": component_type,
+						"salary_component": detail.salary_component,
+						**{flag: key[index + 2] for index, flag in enumerate(COMPONENT_FLAGS)},
+					},
+				)
+
+			row.amount = flt(row.amount) + factor * flt(detail.amount)
+			row.additional_amount = flt(row.additional_amount) + factor * flt(detail.additional_amount)
+
+	aggregate.flags.ignore_permissions = True
+	aggregate.save()
+
+
+def build_salary_slip_aggregate(
+	employee: str, period_start_date, period_end_date
+) -> SalarySlipAggregate:
+	"""Creates the aggregate from the submitted salary slips with two set based queries.
+	Raises `frappe.DuplicateEntryError` if it already exists"""
+	SalarySlip = frappe.qb.DocType("Salary Slip")
+	SalaryDetail = frappe.qb.DocType("Salary Detail")
+	conditions = (
+		(SalarySlip.employee == employee)
+		& (SalarySlip.docstatus == 1)
+		& (SalarySlip.start_date >= period_start_date)
+		& (SalarySlip.end_date <= period_end_date)
+	)
+
+	totals = (
+		frappe.qb.from_(SalarySlip)
+		.select(
+			Count(SalarySlip.name).as_("salary_slip_count"),
+			Sum(SalarySlip.gross_pay).as_("gross_pay"),
+			Sum(SalarySlip.net_pay).as_("net_pay"),
+			Max(SalarySlip.end_date).as_("last_end_date"),
+		)
+		.where(conditions)
+	).run(as_dict=True)[0]
+
+	flags = [SalaryDetail[flag] for flag in COMPONENT_FLAGS]
+	components = (
+		frappe.qb.from_(SalaryDetail)
+		.inner_join(SalarySlip)
+		.on(SalaryDetail.parent == SalarySlip.name)
+		.select(
+			SalaryDetail.parentfield.as_("component_type"),
+			SalaryDetail.salary_component,
+			*flags,
+			Sum(SalaryDetail.amount).as_("amount"),
+			Sum(SalaryDetail.additional_amount).as_("additional_amount"),
+		)
+		.where(conditions & (SalaryDetail.parenttype == "Salary Slip"))
+		.groupby(SalaryDetail.parentfield, SalaryDetail.salary_component, *flags)
+	).run(as_dict=True)
+
+	aggregate = frappe.get_doc(
+		{
+			"doctype": "Salary Slip Aggregate",
+			"employee": employee,
+			"period_start_date": period_start_date,
+			"period_end_date": period_end_date,
+			"salary_slip_count": totals.salary_slip_count or 0,
+			"gross_pay": flt(totals.gross_pay),
+			"net_pay": flt(totals.net_pay),
+			"last_end_date": totals.last_end_date,
+			"components": components,
+		}
+	)
+	aggregate.insert(ignore_permissions=True)
+
+	return aggregate
+
+
+def get_component_key(row, component_type=None) -> tuple:
+	return (
+		component_type or row.component_type,
+		row.salary_component,
+		*(int(row.get(flag) or 0) for flag in COMPONENT_FLAGS),
+	)
@@ -0,0 +1,112 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+
+from hrms.payroll.doctype.employee_tax_exemption_declaration.test_employee_tax_exemption_declaration import (
+	create_payroll_period,
+)
+from hrms.payroll.doctype.salary_slip.test_salary_slip import (
+	create_salary_slips_for_payroll_period,
+	create_tax_slab,
+	setup_test,
+)
+from hrms.payroll.doctype.salary_slip_aggregate.salary_slip_aggregate import (
+	get_aggregate_name,
+	get_salary_slip_aggregate,
+)
+from hrms.payroll.doctype.salary_structure.test_salary_structure import make_salary_structure
+
+
+class TestSalarySlipAggregate(FrappeTestCase):
+	def setUp(self):
+		setup_test()
+
+		self.employee = make_employee("test_salary_slip_aggregate@salary.com", company="_Test Company")
+		self.payroll_period = create_payroll_period(name="_Test Payroll Period", company="_Test Company")
+		create_tax_slab(
+			self.payroll_period,
+			allow_tax_exemption=True,
+			currency="INR",
+			effective_date=self.payroll_period.start_date,
+			company="_Test Company",
+		)
+		salary_structure = make_salary_structure(
+			"Monthly Salary Structure Test for Salary Slip Aggregate",
+			"Monthly",
+			employee=self.employee,
+			company="_Test Company",
+			currency="INR",
+			payroll_period=self.payroll_period,
+		)
+		create_salary_slips_for_payroll_period(
+			self.employee, salary_structure.name, self.payroll_period, deduct_random=False, num=3
+		)
+
+	def test_aggregate_updated_on_submit_and_cancel(self):
+		aggregate = self.get_aggregate()
+		self.assertEqual(aggregate.salary_slip_count, 3)
+		self.assert_aggregate_matches_salary_slips(aggregate)
+
+		salary_slip = frappe.get_last_doc("Salary Slip", filters={"employee": self.employee})
+		salary_slip.cancel()
+
+		aggregate = self.get_aggregate()
+		self.assertEqual(aggregate.salary_slip_count, 2)
+		self.assert_aggregate_matches_salary_slips(aggregate)
+
+	def test_aggregate_built_on_submit_and_not_on_read(self):
+		name = get_aggregate_name(
+			self.employee, self.payroll_period.start_date, self.payroll_period.end_date
+		)
+		frappe.db.delete("Salary Slip Aggregate Component", {"parent": name})
+		frappe.db.delete("Salary Slip Aggregate", {"name": name})
+
+		# readers fall back to queries instead of building the aggregate
+		self.assertIsNone(
+			get_salary_slip_aggregate(
+				self.employee, self.payroll_period.start_date, self.payroll_period.end_date
+			)
+		)
+		salary_slip = frappe.get_last_doc("Salary Slip", filters={"employee": self.employee})
+		draft = frappe.copy_doc(salary_slip)
+		draft.validate()
+		self.assertFalse(frappe.db.exists("Salary Slip Aggregate", name))
+
+		# cancellation builds it from the remaining submitted salary slips
+		salary_slip.cancel()
+		aggregate = self.get_aggregate()
+		self.assertEqual(aggregate.salary_slip_count, 2)
+		self.assert_aggregate_matches_salary_slips(aggregate)
+
+	def get_aggregate(self):
+		return frappe.get_doc(
+			"Salary Slip Aggregate",
+			get_aggregate_name(self.employee, self.payroll_period.start_date, self.payroll_period.end_date),
+		)
+
+	def assert_aggregate_matches_salary_slips(self, aggregate):
+		salary_slips = frappe.get_all(
+			"Salary Slip",
+			filters={"employee": self.employee, "docstatus": 1},
+			pluck="name",
+		)
+		self.assertEqual(
+			flt(aggregate.net_pay, 2),
+			flt(sum(frappe.db.get_value("Salary Slip", name, "net_pay") for name in salary_slips), 2),
+		)
+
+		for component in frappe.get_all(
+			"Salary Detail",
+			filters={"parent": ("in", salary_slips), "parenttype": "Salary Slip"},
+			fields=["salary_component", "sum(amount) as amount"],
+			group_by="salary_component",
+		):
+			self.assertEqual(
+				flt(aggregate.get_total(salary_component=component.salary_component), 2),
+				flt(component.amount, 2),
+			)
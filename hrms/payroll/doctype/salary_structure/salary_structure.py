@@ -23,6 +23,12 @@ class SalaryStructure(Document):
 		self.validate_timesheet_component()
 		self.validate_formula_setup()
 
+	def on_update(self):
+		from hrms.payroll.doctype.salary_slip.salary_slip import clear_compiled_code_cache
+
+		# drop compiled formulas of the previous version of this structure
+		clear_compiled_code_cache()
+
 	def validate_formula_setup(self):
 		for table in ["earnings", "deductions"]:
 			for row in self.get(table):
@@ -3,11 +3,15 @@
 
 import frappe
 from frappe import _, scrub
-from frappe.query_builder.functions import Sum
-from frappe.utils import add_days, flt, getdate, rounded
+from frappe.query_builder.functions import Count, Max, Sum
+from frappe.utils import add_days, date_diff, flt, getdate, rounded
 
 from hrms.payroll.doctype.payroll_entry.payroll_entry import get_start_end_dates
-from hrms.payroll.doctype.salary_slip.salary_slip import calculate_tax_by_tax_slab
+from hrms.payroll.doctype.salary_slip.salary_slip import get_compiled_tax_slab
+
+FUTURE_SALARY_SLIPS_CACHE_KEY = "income_tax_computation_future_salary_slips"
+# bounds the staleness of projections for changes the fingerprint does not track, like loans
+FUTURE_SALARY_SLIPS_CACHE_EXPIRY = 24 * 60 * 60
 
 
 def execute(filters=None):
@@ -114,29 +118,225 @@ class IncomeTaxComputationReport(object):
 		return employee_ss_assignments
 
 	def get_future_salary_slips(self):
+		"""Projects salary slips for the rest of the payroll period after each employee's last slip.
+
+		Projections are cached per payroll period and only recomputed for employees whose salary slips,
+		assignments, leaves, additional salaries, attendance, benefits, other incomes, tax exemptions
+		or employee details changed since they were cached, and for everyone after a change to the
+		payroll period, tax slabs or shared masters. Loan repayments of the Lending app are not tracked,
+		cached projections expire after a day instead."""
 		self.future_salary_slips = frappe._dict()
-		for employee in list(self.employees.keys()):
-			last_ss = self.get_last_salary_slip(employee)
-			if last_ss and last_ss.end_date == self.payroll_period_end_date:
-				continue
 
-			relieving_date = self.employees[employee].get("relieving_date", "")
-			if last_ss:
-				ss_start_date = add_days(last_ss.end_date, 1)
-			else:
-				ss_start_date = self.payroll_period_start_date
-				last_ss = frappe._dict(
-					{
-						"payroll_frequency": "Monthly",
-						"salary_structure": self.employees[employee].get("salary_structure"),
-					}
+		cache_key = "|".join(
+			[FUTURE_SALARY_SLIPS_CACHE_KEY, self.filters.company, self.filters.payroll_period]
+		)
+		cached_projections = frappe.cache().hgetall(cache_key) or {}
+		fingerprints = self.get_salary_fingerprints()
+
+		projections = {}
+		for employee in self.employees:
+			cached = cached_projections.get(employee)
+			if cached and cached["fingerprint"] == fingerprints[employee]:
+				projections[employee] = cached["salary_slips"]
+
+		if stale_employees := [employee for employee in self.employees if employee not in projections]:
+			self.load_salary_slip_details(stale_employees)
+
+			for employee in stale_employees:
+				projections[employee], complete = self.project_salary_slips(employee)
+				# projections cut short by an error are computed again on the next run
+				if complete:
+					frappe.cache().hset(
+						cache_key,
+						employee,
+						{"fingerprint": fingerprints[employee], "salary_slips": projections[employee]},
+					)
+
+			frappe.cache().expire(frappe.cache().make_key(cache_key), FUTURE_SALARY_SLIPS_CACHE_EXPIRY)
+
+		for employee, salary_slips in projections.items():
+			if salary_slips:
+				self.future_salary_slips[employee] = salary_slips
+
+	def get_salary_fingerprints(self):
+		"""Returns a value per employee that changes whenever their projected salary slips could change"""
+		employees = list(self.employees)
+		start_date, end_date = self.payroll_period_start_date, self.payroll_period_end_date
+
+		ss = frappe.qb.DocType("Salary Slip")
+		ssa = frappe.qb.DocType("Salary Structure Assignment")
+		leave = frappe.qb.DocType("Leave Application")
+		additional_salary = frappe.qb.DocType("Additional Salary")
+		benefit_claim = frappe.qb.DocType("Employee Benefit Claim")
+		employee = frappe.qb.DocType("Employee")
+
+		changes = [
+			self.get_changes_by_employee(
+				ss, employees, (ss.start_date >= start_date) & (ss.start_date <= end_date)
+			),
+			self.get_changes_by_employee(ssa, employees),
+			self.get_changes_by_employee(
+				leave, employees, (leave.to_date >= start_date) & (leave.from_date <= end_date)
+			),
+			self.get_changes_by_employee(
+				additional_salary,
+				employees,
+				(additional_salary.payroll_date >= start_date)
+				| (additional_salary.to_date >= start_date),
+			),
+			self.get_changes_by_employee(
+				benefit_claim,
+				employees,
+				(benefit_claim.claim_date >= start_date) & (benefit_claim.claim_date <= end_date),
+			),
+			*[
+				self.get_changes_by_employee(
+					doctype, employees, doctype.payroll_period == self.filters.payroll_period
+				)
+				for doctype in (
+					frappe.qb.DocType("Employee Benefit Application"),
+					frappe.qb.DocType("Employee Other Income"),
+					frappe.qb.DocType("Employee Tax Exemption Declaration"),
+					frappe.qb.DocType("Employee Tax Exemption Proof Submission"),
 				)
+			],
+			frappe._dict(
+				(
+					frappe.qb.from_(employee)
+					.select(employee.name, employee.modified)
+					.where(employee.name.isin(employees))
+				).run()
+			),
+		]
 
-			while getdate(ss_start_date) < getdate(self.payroll_period_end_date) and (
-				not relieving_date or getdate(ss_start_date) < relieving_date
-			):
-				ss_end_date = get_start_end_dates(last_ss.payroll_frequency, ss_start_date).end_date
+		# payment days of every period are computed from attendance
+		if frappe.db.get_single_value("Payroll Settings", "payroll_based_on") == "Attendance":
+			attendance = frappe.qb.DocType("Attendance")
+			changes.append(
+				self.get_changes_by_employee(
+					attendance,
+					employees,
+					(attendance.attendance_date >= start_date) & (attendance.attendance_date <= end_date),
+				)
+			)
+
+		# salary structures, components, tax slabs, holidays and settings apply to all employees
+		global_changes = [
+			(frappe.qb.from_(doctype).select(Max(doctype.modified))).run()[0][0]
+			for doctype in (
+				frappe.qb.DocType("Salary Structure"),
+				frappe.qb.DocType("Salary Component"),
+				frappe.qb.DocType("Income Tax Slab"),
+				frappe.qb.DocType("Holiday List"),
+			)
+		]
+		global_changes.append(
+			frappe.db.get_value("Payroll Period", self.filters.payroll_period, "modified")
+		)
+		global_changes.append(frappe.db.get_value("Payroll Settings", None, "modified"))
+
+		return {
+			employee: "|".join(str(d.get(employee)) for d in changes)
+			+ "|"
+			+ "|".join(str(d) for d in global_changes)
+			for employee in employees
+		}
+
+	def get_changes_by_employee(self, doctype, employees, condition=None):
+		query = (
+			frappe.qb.from_(doctype)
+			.select(doctype.employee, Count(doctype.name), Max(doctype.modified))
+			.where((doctype.employee.isin(employees)) & (doctype.docstatus == 1))
+			.groupby(doctype.employee)
+		)
+		if condition:
+			query = query.where(condition)
+
+		return {employee: f"{count}:{modified}" for employee, count, modified in query.run()}
+
+	def load_salary_slip_details(self, employees):
+		"""Loads last salary slips, assignments, leaves and additional salaries of the employees"""
+		self.payroll_based_on = frappe.db.get_single_value("Payroll Settings", "payroll_based_on")
+
+		self.last_salary_slips = {}
+		for d in frappe.get_all(
+			"Salary Slip",
+			filters={
+				"employee": ("in", employees),
+				"docstatus": 1,
+				"start_date": ["between", [self.payroll_period_start_date, self.payroll_period_end_date]],
+			},
+			fields=["employee", "start_date", "end_date", "salary_structure", "payroll_frequency"],
+			order_by="start_date desc",
+		):
+			self.last_salary_slips.setdefault(d.employee, d)
 
+		self.assignment_dates = {}
+		for d in frappe.get_all(
+			"Salary Structure Assignment",
+			filters={"employee": ("in", employees), "docstatus": 1},
+			fields=["employee", "name", "from_date"],
+			order_by="from_date asc",
+		):
+			self.assignment_dates.setdefault(d.employee, []).append((d.name, getdate(d.from_date)))
+
+		# periods with leaves or additional salaries are computed separately
+		self.irregular_periods = {}
+		for d in frappe.get_all(
+			"Leave Application",
+			filters={
+				"employee": ("in", employees),
+				"docstatus": 1,
+				"to_date": (">=", self.payroll_period_start_date),
+				"from_date": ("<=", self.payroll_period_end_date),
+			},
+			fields=["employee", "from_date", "to_date"],
+		):
+			self.irregular_periods.setdefault(d.employee, []).append(
+				(getdate(d.from_date), getdate(d.to_date))
+			)
+
+		for d in frappe.get_all(
+			"Additional Salary",
+			filters={"employee": ("in", employees), "docstatus": 1},
+			fields=["employee", "payroll_date", "is_recurring", "from_date", "to_date"],
+		):
+			if d.is_recurring:
+				period = (getdate(d.from_date), getdate(d.to_date))
+			else:
+				period = (getdate(d.payroll_date), getdate(d.payroll_date))
+			self.irregular_periods.setdefault(d.employee, []).append(period)
+
+	def project_salary_slips(self, employee):
+		"""Returns projected salary slips after the employee's last salary slip, slips of identical
+		periods are computed once. Also returns False if the projection was cut short by an error"""
+		salary_slips = []
+		last_ss = self.last_salary_slips.get(employee)
+		if last_ss and last_ss.end_date == self.payroll_period_end_date:
+			return salary_slips, True
+
+		relieving_date = self.employees[employee].get("relieving_date", "")
+		if last_ss:
+			ss_start_date = add_days(last_ss.end_date, 1)
+		else:
+			ss_start_date = self.payroll_period_start_date
+			last_ss = frappe._dict(
+				{
+					"payroll_frequency": "Monthly",
+					"salary_structure": self.employees[employee].get("salary_structure"),
+				}
+			)
+
+		previous_key = previous_slip = None
+		while getdate(ss_start_date) < getdate(self.payroll_period_end_date) and (
+			not relieving_date or getdate(ss_start_date) < relieving_date
+		):
+			ss_end_date = get_start_end_dates(last_ss.payroll_frequency, ss_start_date).end_date
+			key = self.get_salary_slip_key(employee, ss_start_date, ss_end_date)
+
+			if key and key == previous_key:
+				salary_slips.append(previous_slip)
+			else:
 				ss = frappe.new_doc("Salary Slip")
 				ss.employee = employee
 				ss.start_date = ss_start_date
@@ -146,26 +346,48 @@ class IncomeTaxComputationReport(object):
 				ss.company = self.filters.company
 				try:
 					ss.process_salary_structure(for_preview=1)
-					self.future_salary_slips.setdefault(employee, []).append(ss.as_dict())
 				except Exception:
-					break
+					return salary_slips, False
 
-				ss_start_date = add_days(ss_end_date, 1)
+				previous_key, previous_slip = key, get_salary_slip_projection(ss)
+				salary_slips.append(previous_slip)
 
-	def get_last_salary_slip(self, employee):
-		last_salary_slip = frappe.db.get_value(
-			"Salary Slip",
-			{
-				"employee": employee,
-				"docstatus": 1,
-				"start_date": ["between", [self.payroll_period_start_date, self.payroll_period_end_date]],
-			},
-			["start_date", "end_date", "salary_structure", "payroll_frequency"],
-			order_by="start_date desc",
-			as_dict=1,
-		)
+			ss_start_date = add_days(ss_end_date, 1)
+
+		return salary_slips, True
+
+	def get_salary_slip_key(self, employee, start_date, end_date):
+		"""Returns a key that is the same for periods with identical salary slips,
+		None if the salary slip of the period depends on anything other than the assignment"""
+		if self.payroll_based_on == "Attendance":
+			return None
+
+		start_date, end_date = getdate(start_date), getdate(end_date)
+		details = self.employees[employee]
+
+		# partial periods are prorated
+		if details.date_of_joining and getdate(details.date_of_joining) > start_date:
+			return None
+		if details.relieving_date and getdate(details.relieving_date) < end_date:
+			return None
+
+		for from_date, to_date in self.irregular_periods.get(employee, []):
+			if from_date <= end_date and to_date >= start_date:
+				return None
 
-		return last_salary_slip
+		assignment = None
+		for name, from_date in self.assignment_dates.get(employee, []):
+			if from_date > end_date:
+				break
+			if from_date > start_date:
+				# assignment changes within the period
+				return None
+			assignment = name
+
+		# preview salary slips take the days of the period as total working days and payment days,
+		# so formulas based on them differ between periods of different lengths
+		working_days = date_diff(end_date, start_date) + 1
+		return (assignment, working_days) if assignment else None
 
 	def get_ctc(self):
 		# Get total earnings from existing salary slip
@@ -419,20 +641,31 @@ class IncomeTaxComputationReport(object):
 			"round_to_the_nearest_integer",
 		)
 
+		employees_by_tax_slab = {}
 		for emp, emp_details in self.employees.items():
-			tax_slab = emp_details.get("income_tax_slab")
-			if tax_slab:
-				tax_slab = frappe.get_cached_doc("Income Tax Slab", tax_slab)
-				employee_dict = frappe.get_doc("Employee", emp).as_dict()
-				tax_amount = calculate_tax_by_tax_slab(
-					emp_details["total_taxable_amount"], tax_slab, eval_globals=None, eval_locals=employee_dict
-				)
-			else:
-				tax_amount = 0.0
+			emp_details["applicable_tax"] = 0.0
+			if emp_details.get("income_tax_slab"):
+				employees_by_tax_slab.setdefault(emp_details["income_tax_slab"], []).append(emp)
+
+		# compute tax for all employees of a slab in one pass
+		for tax_slab, employees in employees_by_tax_slab.items():
+			compiled_tax_slab = get_compiled_tax_slab(frappe.get_cached_doc("Income Tax Slab", tax_slab))
+
+			eval_locals = None
+			if compiled_tax_slab.has_conditions:
+				employee_details = {
+					d.name: d
+					for d in frappe.get_all("Employee", filters={"name": ("in", employees)}, fields=["*"])
+				}
+				eval_locals = [employee_details[emp] for emp in employees]
+
+			tax_amounts = compiled_tax_slab.calculate_tax_for_incomes(
+				[self.employees[emp]["total_taxable_amount"] for emp in employees],
+				eval_locals=eval_locals,
+			)
 
-			if is_tax_rounded:
-				tax_amount = rounded(tax_amount)
-			emp_details["applicable_tax"] = tax_amount
+			for emp, tax_amount in zip(employees, tax_amounts):
+				self.employees[emp]["applicable_tax"] = rounded(tax_amount) if is_tax_rounded else tax_amount
 
 	def get_total_deducted_tax(self):
 		self.add_column("Total Tax Deducted")
@@ -514,3 +747,26 @@ class IncomeTaxComputationReport(object):
 			},
 			{"label": _("CTC"), "fieldname": "ctc", "fieldtype": "Currency", "width": "140px"},
 		]
+
+
+def get_salary_slip_projection(salary_slip):
+	"""Returns the amounts of the salary slip used by the report"""
+	return frappe._dict(
+		base_gross_pay=salary_slip.base_gross_pay,
+		earnings=[
+			frappe._dict(
+				salary_component=d.salary_component,
+				is_tax_applicable=d.is_tax_applicable,
+				amount=d.amount,
+			)
+			for d in salary_slip.earnings
+		],
+		deductions=[
+			frappe._dict(
+				salary_component=d.salary_component,
+				exempted_from_income_tax=d.exempted_from_income_tax,
+				amount=d.amount,
+			)
+			for d in salary_slip.deductions
+		],
+	)
@@ -1,9 +1,12 @@
+from unittest.mock import patch
+
 import frappe
-from frappe.tests.utils import FrappeTestCase
-from frappe.utils import getdate
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, getdate, now_datetime
 
 from erpnext.setup.doctype.employee.test_employee import make_employee
 
+from hrms.hr.doctype.attendance.attendance import mark_attendance
 from hrms.payroll.doctype.employee_tax_exemption_declaration.test_employee_tax_exemption_declaration import (
 	create_payroll_period,
 )
@@ -13,7 +16,11 @@ from hrms.payroll.doctype.salary_slip.test_salary_slip import (
 	create_tax_slab,
 )
 from hrms.payroll.doctype.salary_structure.test_salary_structure import make_salary_structure
-from hrms.payroll.report.income_tax_computation.income_tax_computation import execute
+from hrms.payroll.report.income_tax_computation.income_tax_computation import (
+	FUTURE_SALARY_SLIPS_CACHE_KEY,
+	IncomeTaxComputationReport,
+	execute,
+)
 
 
 class TestIncomeTaxComputation(FrappeTestCase):
@@ -33,6 +40,8 @@ class TestIncomeTaxComputation(FrappeTestCase):
 		frappe.db.sql("delete from `tabEmployee Benefit Claim`")
 		frappe.db.sql("delete from `tabEmployee` where company='_Test Company'")
 		frappe.db.sql("delete from `tabSalary Slip`")
+		frappe.db.sql("delete from `tabSalary Slip Aggregate`")
+		frappe.db.sql("delete from `tabSalary Slip Aggregate Component`")
 
 	def create_records(self):
 		self.employee = make_employee(
@@ -113,3 +122,89 @@ class TestIncomeTaxComputation(FrappeTestCase):
 
 		for key, val in expected_data.items():
 			self.assertEqual(result[1][0].get(key), val)
+
+	def test_future_salary_slips_projected_from_cache(self):
+		filters = frappe._dict(
+			{
+				"company": "_Test Company",
+				"payroll_period": self.payroll_period.name,
+				"employee": self.employee,
+			}
+		)
+		cache_key = "|".join([FUTURE_SALARY_SLIPS_CACHE_KEY, "_Test Company", self.payroll_period.name])
+
+		result = execute(filters)
+		self.assertEqual(result[1][0].get("ctc"), 936000.0)
+		self.assertEqual(len(frappe.cache().hget(cache_key, self.employee)["salary_slips"]), 9)
+
+		# reads the projection from cache
+		self.assertEqual(execute(filters)[1][0].get("ctc"), 936000.0)
+
+		# projection is recomputed once the last salary slip is cancelled
+		last_salary_slip = frappe.get_all(
+			"Salary Slip",
+			filters={"employee": self.employee, "docstatus": 1},
+			order_by="start_date desc",
+			limit=1,
+			pluck="name",
+		)[0]
+		frappe.get_doc("Salary Slip", last_salary_slip).cancel()
+
+		self.assertEqual(execute(filters)[1][0].get("ctc"), 936000.0)
+		self.assertEqual(len(frappe.cache().hget(cache_key, self.employee)["salary_slips"]), 10)
+
+	def test_failed_projection_not_cached(self):
+		filters = frappe._dict(
+			{
+				"company": "_Test Company",
+				"payroll_period": self.payroll_period.name,
+				"employee": self.employee,
+			}
+		)
+		cache_key = "|".join([FUTURE_SALARY_SLIPS_CACHE_KEY, "_Test Company", self.payroll_period.name])
+		frappe.cache().delete_value(cache_key)
+
+		with patch(
+			"hrms.payroll.doctype.salary_slip.salary_slip.SalarySlip.process_salary_structure",
+			side_effect=frappe.ValidationError,
+		):
+			execute(filters)
+		self.assertIsNone(frappe.cache().hget(cache_key, self.employee))
+
+		self.assertEqual(execute(filters)[1][0].get("ctc"), 936000.0)
+		self.assertEqual(len(frappe.cache().hget(cache_key, self.employee)["salary_slips"]), 9)
+
+	@change_settings("Payroll Settings", {"payroll_based_on": "Attendance"})
+	def test_future_salary_slips_fingerprint(self):
+		report = IncomeTaxComputationReport(
+			{
+				"company": "_Test Company",
+				"payroll_period": self.payroll_period.name,
+				"employee": self.employee,
+			}
+		)
+		report.get_employee_details()
+
+		def assert_fingerprint_changes(change):
+			fingerprint = report.get_salary_fingerprints()[self.employee]
+			change()
+			self.assertNotEqual(report.get_salary_fingerprints()[self.employee], fingerprint)
+
+		tax_slab = report.employees[self.employee].income_tax_slab
+		assert_fingerprint_changes(
+			lambda: frappe.db.set_value(
+				"Income Tax Slab", tax_slab, "modified", add_days(now_datetime(), 1), update_modified=False
+			)
+		)
+		assert_fingerprint_changes(
+			lambda: frappe.db.set_value(
+				"Payroll Period",
+				self.payroll_period.name,
+				"modified",
+				add_days(now_datetime(), 1),
+				update_modified=False,
+			)
+		)
+		assert_fingerprint_changes(
+			lambda: mark_attendance(self.employee, self.payroll_period.start_date, "Present")
+		)
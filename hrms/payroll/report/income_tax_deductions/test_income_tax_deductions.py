@@ -20,6 +20,8 @@ class TestIncomeTaxDeductions(FrappeTestCase):
 		super().setUpClass()
 		frappe.db.delete("Payroll Period")
 		frappe.db.delete("Salary Slip")
+		frappe.db.delete("Salary Slip Aggregate")
+		frappe.db.delete("Salary Slip Aggregate Component")
 
 		cls.create_records()
 
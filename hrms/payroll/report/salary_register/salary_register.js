@@ -51,5 +51,18 @@ frappe.query_reports["Salary Register"] = {
 			"default": "Submitted",
 			"width": "100px"
 		}
-	]
+	],
+
+	onload: (report) => {
+		// exports are written on the server chunk by chunk, without loading the report in the browser
+		["CSV", "Excel"].forEach((file_format) => {
+			report.page.add_inner_button(__("Export as {0}", [__(file_format)]), () => {
+				open_url_post(frappe.request.url, {
+					cmd: "hrms.payroll.report.salary_register.salary_register.export_salary_register",
+					filters: JSON.stringify(report.get_filter_values()),
+					file_format: file_format,
+				});
+			}, __("Export"));
+		});
+	}
 }
@@ -2,6 +2,9 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import csv
+import tempfile
+
 import frappe
 from frappe import _
 from frappe.utils import flt
@@ -11,6 +14,9 @@ import erpnext
 salary_slip = frappe.qb.DocType("Salary Slip")
 salary_detail = frappe.qb.DocType("Salary Detail")
 salary_component = frappe.qb.DocType("Salary Component")
+employee = frappe.qb.DocType("Employee")
+
+SALARY_SLIP_CHUNK_SIZE = 1000
 
 
 def execute(filters=None):
@@ -22,25 +28,32 @@ def execute(filters=None):
 		currency = filters.get("currency")
 	company_currency = erpnext.get_company_currency(filters.get("company"))
 
-	salary_slips = get_salary_slips(filters, company_currency)
-	if not salary_slips:
+	earning_types, ded_types = get_earning_and_deduction_types(filters, company_currency)
+	if not (earning_types or ded_types) and not has_salary_slips(filters, company_currency):
 		return [], []
 
-	earning_types, ded_types = get_earning_and_deduction_types(salary_slips)
 	columns = get_columns(earning_types, ded_types)
 
-	ss_earning_map = get_salary_slip_details(salary_slips, currency, company_currency, "earnings")
-	ss_ded_map = get_salary_slip_details(salary_slips, currency, company_currency, "deductions")
+	data = []
+	for salary_slips in get_salary_slip_chunks(filters, company_currency):
+		update_column_width(salary_slips, columns)
+		data.extend(get_rows(salary_slips, currency, company_currency, earning_types, ded_types))
+
+	return columns, data
 
-	doj_map = get_employee_doj_map()
 
-	data = []
-	for ss in salary_slips:
+def get_rows(salary_slips, currency, company_currency, earning_types, ded_types):
+	"""Returns report rows of a chunk of salary slips"""
+	ss_earnings = get_salary_slip_details(salary_slips, currency, company_currency, "earnings")
+	ss_deductions = get_salary_slip_details(salary_slips, currency, company_currency, "deductions")
+
+	rows = []
+	for idx, ss in enumerate(salary_slips):
 		row = {
 			"salary_slip_id": ss.name,
 			"employee": ss.employee,
 			"employee_name": ss.employee_name,
-			"data_of_joining": doj_map.get(ss.employee),
+			"data_of_joining": ss.date_of_joining,
 			"branch": ss.branch,
 			"department": ss.department,
 			"designation": ss.designation,
@@ -53,13 +66,11 @@ def execute(filters=None):
 			"total_loan_repayment": ss.total_loan_repayment,
 		}
 
-		update_column_width(ss, columns)
-
 		for e in earning_types:
-			row.update({frappe.scrub(e): ss_earning_map.get(ss.name, {}).get(e)})
+			row[frappe.scrub(e)] = ss_earnings[e][idx] if e in ss_earnings else None
 
 		for d in ded_types:
-			row.update({frappe.scrub(d): ss_ded_map.get(ss.name, {}).get(d)})
+			row[frappe.scrub(d)] = ss_deductions[d][idx] if d in ss_deductions else None
 
 		if currency == company_currency:
 			row.update(
@@ -75,16 +86,28 @@ def execute(filters=None):
 				{"gross_pay": ss.gross_pay, "total_deduction": ss.total_deduction, "net_pay": ss.net_pay}
 			)
 
-		data.append(row)
+		rows.append(row)
 
-	return columns, data
+	return rows
 
 
-def get_earning_and_deduction_types(salary_slips):
+def get_earning_and_deduction_types(filters, company_currency):
 	salary_component_and_type = {_("Earning"): [], _("Deduction"): []}
 
-	for salary_compoent in get_salary_components(salary_slips):
-		component_type = get_salary_component_type(salary_compoent)
+	salary_components = get_salary_components(filters, company_currency)
+	component_types = dict(
+		frappe.get_all(
+			"Salary Component",
+			filters={"name": ("in", salary_components)},
+			fields=["name", "type"],
+			as_list=True,
+		)
+		if salary_components
+		else []
+	)
+
+	for salary_compoent in salary_components:
+		component_type = component_types.get(salary_compoent)
 		salary_component_and_type[_(component_type)].append(salary_compoent)
 
 	return sorted(salary_component_and_type[_("Earning")]), sorted(
@@ -92,14 +115,14 @@ def get_earning_and_deduction_types(salary_slips):
 	)
 
 
-def update_column_width(ss, columns):
-	if ss.branch is not None:
+def update_column_width(salary_slips, columns):
+	if any(ss.branch is not None for ss in salary_slips):
 		columns[3].update({"width": 120})
-	if ss.department is not None:
+	if any(ss.department is not None for ss in salary_slips):
 		columns[4].update({"width": 120})
-	if ss.designation is not None:
+	if any(ss.designation is not None for ss in salary_slips):
 		columns[5].update({"width": 120})
-	if ss.leave_without_pay is not None:
+	if any(ss.leave_without_pay is not None for ss in salary_slips):
 		columns[9].update({"width": 120})
 
 
@@ -252,23 +275,21 @@ def get_columns(earning_types, ded_types):
 	return columns
 
 
-def get_salary_components(salary_slips):
+def get_salary_components(filters, company_currency):
 	return (
-		frappe.qb.from_(salary_detail)
-		.where((salary_detail.amount != 0) & (salary_detail.parent.isin([d.name for d in salary_slips])))
+		get_salary_slip_query(filters, company_currency)
+		.join(salary_detail)
+		.on(salary_slip.name == salary_detail.parent)
+		.where(salary_detail.amount != 0)
 		.select(salary_detail.salary_component)
 		.distinct()
 	).run(pluck=True)
 
 
-def get_salary_component_type(salary_component):
-	return frappe.db.get_value("Salary Component", salary_component, "type", cache=True)
-
-
-def get_salary_slips(filters, company_currency):
+def get_salary_slip_query(filters, company_currency):
 	doc_status = {"Draft": 0, "Submitted": 1, "Cancelled": 2}
 
-	query = frappe.qb.from_(salary_slip).select(salary_slip.star)
+	query = frappe.qb.from_(salary_slip)
 
 	if filters.get("docstatus"):
 		query = query.where(salary_slip.docstatus == doc_status[filters.get("docstatus")])
@@ -288,44 +309,140 @@ def get_salary_slips(filters, company_currency):
 	if filters.get("currency") and filters.get("currency") != company_currency:
 		query = query.where(salary_slip.currency == filters.get("currency"))
 
-	salary_slips = query.run(as_dict=1)
-
-	return salary_slips or []
-
-
-def get_employee_doj_map():
-	employee = frappe.qb.DocType("Employee")
+	return query
+
+
+def has_salary_slips(filters, company_currency):
+	query = get_salary_slip_query(filters, company_currency).select(salary_slip.name).limit(1)
+	return bool(query.run())
+
+
+def get_salary_slip_chunks(filters, company_currency, chunk_size=SALARY_SLIP_CHUNK_SIZE):
+	"""Yields salary slips ordered by name in chunks, with only the columns used in the report"""
+	last_name = None
+	while True:
+		query = (
+			get_salary_slip_query(filters, company_currency)
+			.left_join(employee)
+			.on(salary_slip.employee == employee.name)
+			.select(
+				salary_slip.name,
+				salary_slip.employee,
+				salary_slip.employee_name,
+				employee.date_of_joining,
+				salary_slip.branch,
+				salary_slip.department,
+				salary_slip.designation,
+				salary_slip.company,
+				salary_slip.start_date,
+				salary_slip.end_date,
+				salary_slip.leave_without_pay,
+				salary_slip.payment_days,
+				salary_slip.total_loan_repayment,
+				salary_slip.gross_pay,
+				salary_slip.total_deduction,
+				salary_slip.net_pay,
+				salary_slip.exchange_rate,
+			)
+			.orderby(salary_slip.name)
+			.limit(chunk_size)
+		)
+		if last_name:
+			query = query.where(salary_slip.name > last_name)
 
-	result = (frappe.qb.from_(employee).select(employee.name, employee.date_of_joining)).run()
+		salary_slips = query.run(as_dict=1)
+		if not salary_slips:
+			return
 
-	return frappe._dict(result)
+		yield salary_slips
+		last_name = salary_slips[-1].name
 
 
 def get_salary_slip_details(salary_slips, currency, company_currency, component_type):
-	salary_slips = [ss.name for ss in salary_slips]
+	"""Returns amounts of each salary component as a list aligned with the salary slips"""
+	slip_index = {ss.name: idx for idx, ss in enumerate(salary_slips)}
 
 	result = (
-		frappe.qb.from_(salary_slip)
-		.join(salary_detail)
-		.on(salary_slip.name == salary_detail.parent)
-		.where((salary_detail.parent.isin(salary_slips)) & (salary_detail.parentfield == component_type))
-		.select(
-			salary_detail.parent,
-			salary_detail.salary_component,
-			salary_detail.amount,
-			salary_slip.exchange_rate,
+		frappe.qb.from_(salary_detail)
+		.where(
+			(salary_detail.parent.isin(list(slip_index))) & (salary_detail.parentfield == component_type)
 		)
-	).run(as_dict=1)
+		.select(salary_detail.parent, salary_detail.salary_component, salary_detail.amount)
+	).run()
+
+	amounts = {}
 
-	ss_map = {}
+	for parent, component, amount in result:
+		idx = slip_index[parent]
+		component_amounts = amounts.setdefault(component, [None] * len(salary_slips))
+		if component_amounts[idx] is None:
+			component_amounts[idx] = 0.0
 
-	for d in result:
-		ss_map.setdefault(d.parent, frappe._dict()).setdefault(d.salary_component, 0.0)
 		if currency == company_currency:
-			ss_map[d.parent][d.salary_component] += flt(d.amount) * flt(
-				d.exchange_rate if d.exchange_rate else 1
-			)
+			exchange_rate = salary_slips[idx].exchange_rate
+			component_amounts[idx] += flt(amount) * flt(exchange_rate if exchange_rate else 1)
 		else:
-			ss_map[d.parent][d.salary_component] += flt(d.amount)
+			component_amounts[idx] += flt(amount)
+
+	return amounts
+
+
+@frappe.whitelist()
+def export_salary_register(filters, file_format="CSV"):
+	"""Writes the report to a CSV or XLSX file chunk by chunk and returns it as a download"""
+	from frappe.desk.query_report import get_report_doc
+
+	# checks report permission
+	get_report_doc("Salary Register")
+
+	filters = frappe._dict(frappe.parse_json(filters) or {})
+	currency = filters.get("currency")
+	company_currency = erpnext.get_company_currency(filters.get("company"))
+
+	earning_types, ded_types = get_earning_and_deduction_types(filters, company_currency)
+	columns = [
+		column for column in get_columns(earning_types, ded_types) if not column.get("hidden")
+	]
+	fieldnames = [column["fieldname"] for column in columns]
+
+	def get_export_rows():
+		yield [column["label"] for column in columns]
+		for salary_slips in get_salary_slip_chunks(filters, company_currency):
+			for row in get_rows(salary_slips, currency, company_currency, earning_types, ded_types):
+				yield [row.get(fieldname) for fieldname in fieldnames]
+
+	if file_format == "Excel":
+		filecontent = write_xlsx(get_export_rows())
+		extension = "xlsx"
+	else:
+		filecontent = write_csv(get_export_rows())
+		extension = "csv"
+
+	frappe.response["filename"] = f"{_('Salary Register')}.{extension}"
+	frappe.response["filecontent"] = filecontent
+	frappe.response["type"] = "binary"
+
+
+def write_csv(rows) -> bytes:
+	with tempfile.TemporaryFile("w+", newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		for row in rows:
+			writer.writerow(["" if value is None else value for value in row])
+
+		f.seek(0)
+		return f.read().encode("utf-8")
+
+
+def write_xlsx(rows) -> bytes:
+	from openpyxl import Workbook
+
+	# write-only workbooks flush rows to a temporary file as they are appended
+	workbook = Workbook(write_only=True)
+	sheet = workbook.create_sheet(_("Salary Register"))
+	for row in rows:
+		sheet.append(row)
 
-	return ss_map
+	with tempfile.TemporaryFile() as f:
+		workbook.save(f)
+		f.seek(0)
+		return f.read()
@@ -0,0 +1,99 @@
+import csv
+import io
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+
+from hrms.payroll.doctype.employee_tax_exemption_declaration.test_employee_tax_exemption_declaration import (
+	create_payroll_period,
+)
+from hrms.payroll.doctype.salary_slip.test_salary_slip import (
+	create_salary_slips_for_payroll_period,
+)
+from hrms.payroll.doctype.salary_structure.test_salary_structure import make_salary_structure
+from hrms.payroll.report.salary_register.salary_register import (
+	execute,
+	export_salary_register,
+	get_earning_and_deduction_types,
+	get_rows,
+	get_salary_slip_chunks,
+)
+
+
+class TestSalaryRegister(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		frappe.db.delete("Payroll Period")
+		frappe.db.delete("Salary Slip")
+		frappe.db.delete("Salary Slip Aggregate")
+		frappe.db.delete("Salary Slip Aggregate Component")
+
+		cls.create_records()
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.rollback()
+
+	@classmethod
+	def create_records(cls):
+		cls.employee = make_employee(
+			"test_salary_register@example.com",
+			company="_Test Company",
+			date_of_joining=getdate("01-10-2021"),
+		)
+
+		cls.payroll_period = create_payroll_period(
+			name="_Test Payroll Period 1", company="_Test Company"
+		)
+		salary_structure = make_salary_structure(
+			"Monthly Salary Structure Test Salary Register",
+			"Monthly",
+			employee=cls.employee,
+			company="_Test Company",
+			currency="INR",
+			payroll_period=cls.payroll_period,
+			test_tax=True,
+		)
+
+		create_salary_slips_for_payroll_period(
+			cls.employee, salary_structure.name, cls.payroll_period, deduct_random=False, num=3
+		)
+
+		cls.filters = frappe._dict(
+			{
+				"company": "_Test Company",
+				"from_date": cls.payroll_period.start_date,
+				"to_date": cls.payroll_period.end_date,
+				"currency": "INR",
+				"docstatus": "Submitted",
+			}
+		)
+
+	def test_report(self):
+		columns, data = execute(self.filters)
+
+		self.assertEqual(len(data), 3)
+		for row in data:
+			self.assertEqual(row["employee"], self.employee)
+			self.assertEqual(row["data_of_joining"], getdate("01-10-2021"))
+			self.assertEqual(row["gross_pay"], 78000.0)
+
+		# rows are the same when salary slips are read in smaller chunks
+		earning_types, ded_types = get_earning_and_deduction_types(self.filters, "INR")
+		rows = []
+		for salary_slips in get_salary_slip_chunks(self.filters, "INR", chunk_size=1):
+			rows.extend(get_rows(salary_slips, "INR", "INR", earning_types, ded_types))
+
+		self.assertEqual(rows, data)
+
+	def test_export_as_csv(self):
+		export_salary_register(frappe.as_json(self.filters), "CSV")
+
+		rows = list(csv.reader(io.StringIO(frappe.response["filecontent"].decode("utf-8"))))
+		self.assertEqual(rows[0][:2], ["Salary Slip ID", "Employee"])
+		self.assertEqual(len(rows), 4)
+		self.assertEqual({row[1] for row in rows[1:]}, {self.employee})
@@ -6,10 +6,14 @@ hrms.HierarchyChart = class {
 		- method:
 			- to get the data for each node
 			- this method should return id, name, title, image, and connections for each node
+		- all_nodes_method (optional):
+			- to get the children of all nodes in a single call
+			- defaults to calling the method for each node via hrms.utils.hierarchy_chart.get_all_nodes
 	*/
-	constructor(doctype, wrapper, method) {
+	constructor(doctype, wrapper, method, all_nodes_method) {
 		this.page = wrapper.page;
 		this.method = method;
+		this.all_nodes_method = all_nodes_method;
 		this.doctype = doctype;
 
 		this.setup_page_style();
@@ -357,12 +361,14 @@ hrms.HierarchyChart = class {
 	get_all_nodes() {
 		let me = this;
 		return new Promise(resolve => {
+			let args = { company: me.company };
+			if (!me.all_nodes_method) {
+				args.method = me.method;
+			}
+
 			frappe.call({
-				method: 'hrms.utils.hierarchy_chart.get_all_nodes',
-				args: {
-					method: me.method,
-					company: me.company
-				},
+				method: me.all_nodes_method || 'hrms.utils.hierarchy_chart.get_all_nodes',
+				args: args,
 				callback: (r) => {
 					resolve(r.message);
 				}
@@ -0,0 +1,94 @@
+"""Compares per-document and bulk salary slip creation on synthetic employees.
+
+Both paths read from the same prefetched PayrollContext, so the difference is only in how slips
+are persisted: the bulk path writes each batch with multi-row INSERTs and checks permissions once,
+while validations and post insert hooks still run for every slip in both.
+
+Run on a test site (all changes are rolled back at the end):
+
+    bench --site test_site execute hrms.tests.benchmark_salary_slip_insert.execute --kwargs "{'employee_count': 5000}"
+"""
+
+import time
+
+import frappe
+from frappe.utils import nowdate
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+
+from hrms.payroll.doctype.payroll_entry.payroll_entry import get_start_end_dates
+from hrms.payroll.doctype.salary_slip.payroll_context import PayrollContext
+from hrms.payroll.doctype.salary_slip.salary_slip_bulk_insert import bulk_insert_salary_slips
+from hrms.payroll.doctype.salary_structure.test_salary_structure import (
+	create_salary_structure_assignment,
+	make_salary_structure,
+)
+
+COMPANY = "_Test Company"
+
+
+def execute(employee_count: int = 5000):
+	frappe.flags.mute_emails = True
+
+	try:
+		employees = setup_employees(employee_count)
+		dates = get_start_end_dates("Monthly", nowdate())
+		args = frappe._dict(
+			{
+				"doctype": "Salary Slip",
+				"payroll_frequency": "Monthly",
+				"start_date": dates.start_date,
+				"end_date": dates.end_date,
+				"company": COMPANY,
+				"posting_date": nowdate(),
+				"currency": frappe.get_cached_value("Company", COMPANY, "default_currency"),
+				"exchange_rate": 1,
+			}
+		)
+
+		frappe.db.savepoint("benchmark_salary_slip_insert")
+		per_document = timed(insert_per_document, employees, args)
+		frappe.db.rollback(save_point="benchmark_salary_slip_insert")
+
+		bulk = timed(insert_in_bulk, employees, args)
+
+		print(f"Employees: {len(employees)}")
+		print(f"Per document insert: {per_document:.2f}s")
+		print(f"Bulk insert: {bulk:.2f}s ({per_document / bulk:.2f}x)")
+	finally:
+		frappe.db.rollback()
+		frappe.flags.mute_emails = False
+
+
+def setup_employees(employee_count: int) -> list[str]:
+	employees = [
+		make_employee(f"benchmark_salary_slip_{i}@example.com", company=COMPANY)
+		for i in range(employee_count)
+	]
+	salary_structure = make_salary_structure(
+		"_Test Benchmark Salary Structure", "Monthly", company=COMPANY
+	)
+
+	for employee in employees:
+		create_salary_structure_assignment(employee, salary_structure.name, company=COMPANY)
+
+	return employees
+
+
+def insert_per_document(employees: list[str], args: frappe._dict):
+	payroll_context = PayrollContext(employees, COMPANY, args.start_date, args.end_date)
+	for employee in employees:
+		salary_slip = frappe.get_doc({**args, "employee": employee})
+		salary_slip._payroll_context = payroll_context
+		salary_slip.insert()
+
+
+def insert_in_bulk(employees: list[str], args: frappe._dict):
+	payroll_context = PayrollContext(employees, COMPANY, args.start_date, args.end_date)
+	bulk_insert_salary_slips(employees, args, payroll_context=payroll_context)
+
+
+def timed(fn, *args) -> float:
+	start = time.perf_counter()
+	fn(*args)
+	return time.perf_counter() - start
@@ -0,0 +1,112 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from erpnext.setup.doctype.holiday_list.test_holiday_list import set_holiday_list
+
+from hrms.api import get_home_data, get_home_data_cache_key
+from hrms.hr.doctype.expense_claim.test_expense_claim import (
+	get_payable_account,
+	make_expense_claim,
+)
+from hrms.hr.doctype.leave_application.test_leave_application import make_allocation_record
+from hrms.payroll.doctype.salary_slip.test_salary_slip import (
+	make_holiday_list,
+	make_leave_application,
+)
+
+test_dependencies = ["Leave Type"]
+
+
+class TestHomeData(FrappeTestCase):
+	def setUp(self):
+		for dt in ["Leave Application", "Leave Allocation", "Leave Ledger Entry", "PWA Notification"]:
+			frappe.db.delete(dt)
+
+		make_holiday_list()
+		self.user = "test_home_data@example.com"
+		self.employee = make_employee(self.user, company="_Test Company")
+		self.cache_key = get_home_data_cache_key(self.user)
+		frappe.cache().delete_value(self.cache_key)
+
+		frappe.set_user(self.user)
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+
+	def test_cached_home_data(self):
+		data = get_home_data()
+		self.assertEqual(data["employee"].name, self.employee)
+		self.assertEqual(frappe.cache().get_value(self.cache_key).data, data)
+
+		with patch("hrms.api.get_home_data_for_user") as get_home_data_for_user:
+			self.assertEqual(get_home_data(), data)
+			get_home_data_for_user.assert_not_called()
+
+	def test_home_data_rebuilt_on_a_new_day(self):
+		get_home_data()
+		cached = frappe.cache().get_value(self.cache_key)
+		cached.date = add_days(getdate(), -1)
+		frappe.cache().set_value(self.cache_key, cached)
+
+		with patch("hrms.api.get_home_data_for_user", return_value={"employee": None}):
+			self.assertEqual(get_home_data(), {"employee": None})
+
+		self.assertEqual(frappe.cache().get_value(self.cache_key).date, getdate())
+
+	@set_holiday_list("Salary Slip Test Holiday List", "_Test Company")
+	def test_home_data_cleared_on_leave_application(self):
+		frappe.set_user("Administrator")
+		make_allocation_record(
+			employee=self.employee, from_date=add_days(getdate(), -30), to_date=add_days(getdate(), 30)
+		)
+		approver_cache_key = get_home_data_cache_key("test@example.com")
+		self.cache_home_data(approver_cache_key)
+
+		# spans a week so that it has working days
+		make_leave_application(
+			self.employee,
+			getdate(),
+			add_days(getdate(), 6),
+			"_Test Leave Type",
+			"_Test Company",
+			submit=False,
+		)
+		self.assertIsNone(frappe.cache().get_value(self.cache_key))
+		self.assertIsNone(frappe.cache().get_value(approver_cache_key))
+
+	def test_home_data_cleared_on_expense_claim(self):
+		frappe.set_user("Administrator")
+		self.cache_home_data()
+
+		make_expense_claim(
+			get_payable_account("_Test Company"),
+			300,
+			200,
+			"_Test Company",
+			"Travel Expenses - _TC",
+			do_not_submit=True,
+			employee=self.employee,
+		)
+		self.assertIsNone(frappe.cache().get_value(self.cache_key))
+
+	def test_home_data_cleared_on_notification(self):
+		frappe.set_user("Administrator")
+		self.cache_home_data()
+
+		frappe.get_doc(
+			{
+				"doctype": "PWA Notification",
+				"from_user": "Administrator",
+				"to_user": self.user,
+				"message": "Test Notification",
+			}
+		).insert(ignore_permissions=True)
+		self.assertIsNone(frappe.cache().get_value(self.cache_key))
+
+	def cache_home_data(self, *cache_keys):
+		for cache_key in (self.cache_key, *cache_keys):
+			frappe.cache().set_value(cache_key, frappe._dict(date=getdate(), data={}))
@@ -0,0 +1,87 @@
+"""Helpers to persist many prepared documents with one multi-row INSERT per table.
+
+Documents are prepared with `prepare_document` (or the equivalent steps of `Document.insert`),
+written with `write_documents` and finished with `run_post_insert_methods`.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.desk.form.document_follow import follow_document
+from frappe.model import optional_fields
+from frappe.model.naming import set_new_name
+
+
+def prepare_document(doc) -> None:
+	"""Runs everything `Document.insert` does before writing to the database:
+	defaults, naming, link validation, `before_insert`, `validate` and `before_submit` hooks"""
+	doc.flags.in_insert = True
+	doc.set("__islocal", True)
+	doc._set_defaults()
+	doc.set_user_and_timestamp()
+	doc.set_docstatus()
+	# sets `_action`, which decides the hooks run before and after saving
+	doc.check_if_latest()
+	doc._validate_links()
+	doc.run_method("before_insert")
+	doc.set_new_name()
+	doc.set_parent_in_children()
+	doc.run_before_save_methods()
+	doc._validate()
+	doc.set_docstatus()
+	doc.flags.in_insert = False
+
+
+def write_documents(docs: list) -> None:
+	"""Inserts parents and child rows of all docs with one multi-row INSERT per doctype"""
+	rows_by_doctype = defaultdict(list)
+
+	for doc in docs:
+		rows_by_doctype[doc.doctype].append(get_insert_values(doc))
+		for child in doc.get_all_children():
+			rows_by_doctype[child.doctype].append(get_insert_values(child, parent=doc))
+
+	for doctype, rows in rows_by_doctype.items():
+		fields = list(dict.fromkeys(field for row in rows for field in row))
+		frappe.db.bulk_insert(doctype, fields, [tuple(row.get(field) for field in fields) for row in rows])
+
+	for doc in docs:
+		doc.set("__islocal", False)
+		for child in doc.get_all_children():
+			child.set("__islocal", False)
+
+
+def get_insert_values(doc, parent=None) -> dict:
+	# rows added to child tables during validate are named and timestamped here, like in `db_insert`
+	if not doc.name:
+		set_new_name(doc)
+
+	if not doc.creation:
+		source = parent or doc
+		doc.creation = doc.modified = source.modified
+		doc.owner = source.owner
+		doc.modified_by = source.modified_by
+
+	values = doc.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+
+	# e.g. `_comments`, when comments are written along with the document
+	for fieldname in optional_fields:
+		if doc.get(fieldname):
+			values[fieldname] = doc.get(fieldname)
+
+	return values
+
+
+def run_post_insert_methods(doc) -> None:
+	"""Runs everything `Document.insert` does after writing to the database"""
+	doc.run_method("after_insert")
+	doc.flags.in_insert = True
+	doc.run_post_save_methods()
+	doc.flags.in_insert = False
+
+	for attr in ("__islocal", "__unsaved"):
+		if hasattr(doc, attr):
+			delattr(doc, attr)
+
+	if frappe.get_cached_value("User", frappe.session.user, "follow_created_documents"):
+		follow_document(doc.doctype, doc.name, frappe.session.user)
@@ -1,4 +1,124 @@
+from bisect import bisect_left, bisect_right
+
 import frappe
+from frappe.utils import date_diff, getdate
+
+from erpnext.setup.doctype.employee.employee import get_holiday_list_for_employee
+
+HOLIDAY_CALENDAR_CACHE_KEY = "holiday_calendar"
+
+
+class HolidayCalendar:
+	"""Holidays of a Holiday List as sorted date arrays, to look up holidays and count holidays
+	or working days over any range without querying the database"""
+
+	def __init__(self, holiday_list: str | None, holidays: list[tuple]):
+		self.holiday_list = holiday_list
+		# (holiday_date, weekly_off, description) sorted by date
+		self.holidays = holidays
+		self.holiday_dates = [holiday[0] for holiday in holidays]
+
+		self.dates = sorted(set(self.holiday_dates))
+		self.non_weekly_dates = sorted({holiday[0] for holiday in holidays if not holiday[1]})
+
+	def get_holidays(self, start_date, end_date, skip_weekly_offs: bool = False) -> list[dict]:
+		"""Returns holidays between the dates as dicts with `holiday_date` and `description`"""
+		start = bisect_left(self.holiday_dates, getdate(start_date))
+		end = bisect_right(self.holiday_dates, getdate(end_date))
+
+		return [
+			frappe._dict(holiday_date=holiday_date, description=description)
+			for holiday_date, weekly_off, description in self.holidays[start:end]
+			if not (skip_weekly_offs and weekly_off)
+		]
+
+	def get_holiday_dates(self, start_date, end_date, skip_weekly_offs: bool = False) -> list:
+		dates = self.non_weekly_dates if skip_weekly_offs else self.dates
+		return dates[bisect_left(dates, getdate(start_date)) : bisect_right(dates, getdate(end_date))]
+
+	def count_holidays(self, start_date, end_date, skip_weekly_offs: bool = False) -> int:
+		dates = self.non_weekly_dates if skip_weekly_offs else self.dates
+		return bisect_right(dates, getdate(end_date)) - bisect_left(dates, getdate(start_date))
+
+	def count_working_days(self, start_date, end_date) -> int:
+		return date_diff(end_date, start_date) + 1 - self.count_holidays(start_date, end_date)
+
+	def is_holiday(self, date) -> bool:
+		return self.count_holidays(date, date) > 0
+
+
+def get_holiday_calendar(holiday_list: str | None) -> HolidayCalendar:
+	if not holiday_list:
+		return HolidayCalendar(holiday_list, [])
+
+	holidays = frappe.cache().hget(HOLIDAY_CALENDAR_CACHE_KEY, holiday_list)
+	if holidays is None:
+		Holiday = frappe.qb.DocType("Holiday")
+		holidays = (
+			frappe.qb.from_(Holiday)
+			.select(Holiday.holiday_date, Holiday.weekly_off, Holiday.description)
+			.where((Holiday.parenttype == "Holiday List") & (Holiday.parent == holiday_list))
+			.orderby(Holiday.holiday_date)
+			.orderby(Holiday.idx)
+		).run()
+		holidays = [tuple(holiday) for holiday in holidays]
+		frappe.cache().hset(HOLIDAY_CALENDAR_CACHE_KEY, holiday_list, holidays)
+
+	return HolidayCalendar(holiday_list, holidays)
+
+
+def get_holiday_lists_for_employees(employees: list[str], raise_exception: bool = True) -> dict:
+	"""Returns holiday lists mapped by employee, the same as `get_holiday_list_for_employee`
+	with one query for all employees"""
+	Employee = frappe.qb.DocType("Employee")
+	Company = frappe.qb.DocType("Company")
+
+	employees = list(set(employees))
+	if not employees:
+		return {}
+
+	holiday_lists = {
+		employee: holiday_list or default_holiday_list
+		for employee, holiday_list, default_holiday_list in (
+			frappe.qb.from_(Employee)
+			.left_join(Company)
+			.on(Employee.company == Company.name)
+			.select(Employee.name, Employee.holiday_list, Company.default_holiday_list)
+			.where(Employee.name.isin(employees))
+		).run()
+	}
+
+	if raise_exception:
+		for employee in employees:
+			if not holiday_lists.get(employee):
+				# raises the missing holiday list error
+				get_holiday_list_for_employee(employee)
+
+	return holiday_lists
+
+
+def get_holiday_counts(
+	ranges: list[tuple], skip_weekly_offs: bool = False, raise_exception: bool = True
+) -> list[dict]:
+	"""Returns holidays and working days in each of the (employee, from_date, to_date) ranges,
+	in the same order, using the employees' holiday lists"""
+	holiday_lists = get_holiday_lists_for_employees(
+		[employee for employee, _from_date, _to_date in ranges], raise_exception=raise_exception
+	)
+	calendars = {}
+
+	counts = []
+	for employee, from_date, to_date in ranges:
+		holiday_list = holiday_lists.get(employee)
+		if holiday_list not in calendars:
+			calendars[holiday_list] = get_holiday_calendar(holiday_list)
+
+		holidays = calendars[holiday_list].count_holidays(from_date, to_date, skip_weekly_offs)
+		counts.append(
+			frappe._dict(holidays=holidays, working_days=date_diff(to_date, from_date) + 1 - holidays)
+		)
+
+	return counts
 
 
 def get_holiday_dates_between(
@@ -7,21 +127,24 @@ def get_holiday_dates_between(
 	end_date: str,
 	skip_weekly_offs: bool = False,
 ) -> list:
-	Holiday = frappe.qb.DocType("Holiday")
-	query = (
-		frappe.qb.from_(Holiday)
-		.select(Holiday.holiday_date)
-		.where((Holiday.parent == holiday_list) & (Holiday.holiday_date.between(start_date, end_date)))
-		.orderby(Holiday.holiday_date)
+	return get_holiday_calendar(holiday_list).get_holiday_dates(
+		start_date, end_date, skip_weekly_offs=skip_weekly_offs
 	)
 
-	if skip_weekly_offs:
-		query = query.where(Holiday.weekly_off == 0)
 
-	return query.run(pluck=True)
+def clear_holiday_calendar_cache(holiday_list: str | None = None) -> None:
+	if holiday_list:
+		frappe.cache().hdel(HOLIDAY_CALENDAR_CACHE_KEY, holiday_list)
+	else:
+		frappe.cache().delete_value(HOLIDAY_CALENDAR_CACHE_KEY)
 
 
 def invalidate_cache(doc, method=None):
 	from hrms.payroll.doctype.salary_slip.salary_slip import HOLIDAYS_BETWEEN_DATES
 
 	frappe.cache().delete_value(HOLIDAYS_BETWEEN_DATES)
+
+	clear_holiday_calendar_cache(doc.name)
+	# calendars cached by other workers before this transaction ends, or with changes that get rolled back
+	frappe.db.after_commit.add(lambda: clear_holiday_calendar_cache(doc.name))
+	frappe.db.after_rollback.add(lambda: clear_holiday_calendar_cache(doc.name))